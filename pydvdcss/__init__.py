@@ -1,3 +1,9 @@
+from pydvdcss.aio import AsyncDvdCss
+from pydvdcss.buffers import BufferPoolStats, SectorBufferPool, aligned_buffer
+from pydvdcss.cache import SectorCache, SectorCacheStats
+from pydvdcss.checkpoint import Checkpoint, resumable_copy
+from pydvdcss.cracking import CrackingReport, CrackingStrategy, MethodAttempt
+from pydvdcss.discovery import discover_keys
 from pydvdcss.dvdcss import DvdCss
 from pydvdcss.exceptions import (
     AlreadyInUseError,
@@ -7,21 +13,77 @@ from pydvdcss.exceptions import (
     OpenFailureError,
     PyDvdCssError,
     ReadError,
+    ScrambledSectorError,
     SeekError,
 )
+from pydvdcss.farm import DriveStats, RipFarm, RipJob, RipResult
+from pydvdcss.file import DvdCssFile
+from pydvdcss.index import DiscIndex
+from pydvdcss.keycache import CachedDisc, CacheReport, KeyCache
+from pydvdcss.keys import TitleKeyResult
+from pydvdcss.metrics import CallEvent, Histogram, Instrumentation
+from pydvdcss.planner import ReadPlan, ReadPlanner, ReadStep
+from pydvdcss.pool import DvdCssPool, DvdCssPoolStats
+from pydvdcss.readv import ReadvPlan
+from pydvdcss.recovery import RescueResult, SectorMap, rescue
+from pydvdcss.scrambling import scrambled_sectors
+from pydvdcss.sources import FileStreamSource, MmapStreamSource, StreamSource
+from pydvdcss.streaming import AdaptiveChunkSize, CopyResult, Digests
 from pydvdcss.structs import DvdCssStreamCb, ReadFlag, SeekFlag
 
 __all__ = (
+    "AdaptiveChunkSize",
     "AlreadyInUseError",
+    "AsyncDvdCss",
+    "BufferPoolStats",
+    "CacheReport",
+    "CachedDisc",
+    "CallEvent",
+    "Checkpoint",
     "CloseError",
+    "CopyResult",
+    "CrackingReport",
+    "CrackingStrategy",
+    "Digests",
+    "DiscIndex",
+    "DriveStats",
     "DvdCss",
+    "DvdCssFile",
+    "DvdCssPool",
+    "DvdCssPoolStats",
     "DvdCssStreamCb",
+    "FileStreamSource",
+    "Histogram",
+    "Instrumentation",
+    "KeyCache",
     "LibraryNotFoundError",
+    "MethodAttempt",
+    "MmapStreamSource",
     "NoDeviceError",
     "OpenFailureError",
     "PyDvdCssError",
     "ReadError",
     "ReadFlag",
+    "ReadPlan",
+    "ReadPlanner",
+    "ReadStep",
+    "ReadvPlan",
+    "RescueResult",
+    "RipFarm",
+    "RipJob",
+    "RipResult",
+    "ScrambledSectorError",
+    "SectorBufferPool",
+    "SectorCache",
+    "SectorCacheStats",
+    "SectorMap",
     "SeekError",
     "SeekFlag",
+    "StreamSource",
+    "TitleKeyResult",
+    "aligned_buffer",
+    "discover_keys",
+    "rescue",
+    "resumable_copy",
+    "scrambled_sectors",
 )
@@ -1,8 +1,13 @@
-from typing import Literal
+from ctypes import Array, c_char
+from mmap import mmap
+from typing import Literal, Union
 
 from pydvdcss.structs import ReadFlag, SeekFlag
 
 SeekFlag_T = SeekFlag | Literal[0, 1, 2]
 ReadFlag_T = ReadFlag | Literal[0, 1]
+# Any writable, C-contiguous buffer-protocol object is accepted at runtime (e.g. a
+# numpy array), these are just the ones the standard library provides.
+WritableBuffer_T = Union[bytearray, memoryview, mmap, "Array[c_char]"]
 
-__all__ = ("ReadFlag_T", "SeekFlag_T")
+__all__ = ("ReadFlag_T", "SeekFlag_T", "WritableBuffer_T")
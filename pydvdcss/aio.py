@@ -0,0 +1,193 @@
+from __future__ import annotations
+
+import asyncio
+import os
+from collections import deque
+from collections.abc import AsyncIterator, Callable
+from concurrent.futures import ThreadPoolExecutor
+from ctypes import Array, c_char
+from functools import partial
+from typing import Any, TypeVar
+
+from pydvdcss._types import ReadFlag_T, SeekFlag_T, WritableBuffer_T
+from pydvdcss.dvdcss import DvdCss
+from pydvdcss.structs import ReadFlag, SeekFlag
+
+T = TypeVar("T")
+
+
+class AsyncDvdCss:
+    """
+    An asyncio front end to DvdCss.
+
+    Every call that may block on the drive, like opening, seeking, or reading, is run on
+    a dedicated single-thread executor for this handle so the event loop is never
+    blocked. As there's only one thread per handle, calls made on the same handle run
+    in the order they were made, and never at the same time.
+
+        async with AsyncDvdCss() as dvd:
+            await dvd.open("/dev/sr0")
+            async for data in dvd.stream(0, 1024, flag=ReadFlag.READ_DECRYPT):
+                ...
+
+    See DvdCss for documentation on each of the methods.
+    """
+
+    def __init__(self, dvdcss: DvdCss | None = None) -> None:
+        """
+        Parameters:
+            dvdcss: The DvdCss to run calls on, a new one is created if not given.
+        """
+        self.dvdcss = dvdcss or DvdCss()
+        self._executor: ThreadPoolExecutor | None = None
+
+    async def __aenter__(self) -> AsyncDvdCss:
+        return self
+
+    async def __aexit__(self, *_: Any, **__: Any) -> None:
+        try:
+            await self.close()
+        finally:
+            self.shutdown()
+
+    @property
+    def handle(self) -> int | None:
+        """The handle of the open DVD device or directory, if any."""
+        return self.dvdcss.handle
+
+    @property
+    def error(self) -> str | None:
+        """See DvdCss.error, this does not go through the executor."""
+        return self.dvdcss.error
+
+    @property
+    def is_scrambled(self) -> bool:
+        """See DvdCss.is_scrambled, this does not go through the executor."""
+        return self.dvdcss.is_scrambled
+
+    async def open(
+        self,
+        target: str | os.PathLike[str],
+        cache_dir: str | os.PathLike[str] | None = None,
+    ) -> int:
+        """Awaitable DvdCss.open()."""
+        return await self._run(self.dvdcss.open, target, cache_dir)
+
+    async def seek(self, sector: int, flag: SeekFlag_T = SeekFlag.Unset) -> int:
+        """Awaitable DvdCss.seek()."""
+        return await self._run(self.dvdcss.seek, sector, flag)
+
+    async def read(
+        self, sectors: int, flag: ReadFlag_T = ReadFlag.Unset, verify: bool = False
+    ) -> bytes:
+        """Awaitable DvdCss.read()."""
+        return await self._run(self.dvdcss.read, sectors, flag, verify)
+
+    async def read_into(
+        self,
+        buffer: WritableBuffer_T,
+        flag: ReadFlag_T = ReadFlag.Unset,
+        verify: bool = False,
+    ) -> int:
+        """Awaitable DvdCss.read_into()."""
+        return await self._run(self.dvdcss.read_into, buffer, flag, verify)
+
+    async def readv(
+        self,
+        *buffers: Array[c_char],
+        flag: ReadFlag_T = ReadFlag.Unset,
+        verify: bool = False,
+    ) -> int:
+        """Awaitable DvdCss.readv()."""
+        return await self._run(
+            partial(self.dvdcss.readv, *buffers, flag=flag, verify=verify)
+        )
+
+    async def close(self) -> bool:
+        """Awaitable DvdCss.close()."""
+        return await self._run(self.dvdcss.close)
+
+    async def stream(
+        self,
+        start: int,
+        count: int,
+        chunk: int = 512,
+        flag: ReadFlag_T = ReadFlag.Unset,
+        seek_flag: SeekFlag_T = SeekFlag.Unset,
+        prefetch: int = 2,
+    ) -> AsyncIterator[bytes]:
+        """
+        Stream a range of sectors in chunks, reading ahead of the consumer.
+
+        Up to `prefetch` chunks are queued to be read at once, counting the one the
+        consumer waits on next, keeping the drive busy while the consumer processes
+        data. No more is read until the consumer catches up, so however slow the
+        consumer is, at most `prefetch` chunks are buffered. Leaving the loop early
+        cancels any reads that have not started yet.
+
+        Seeking and reading is done as in DvdCss.iter_sectors(): one seek to `start`
+        with `seek_flag`, then every chunk is read with `flag`.
+
+        Parameters:
+            start: Sector to start reading from.
+            count: Number of sectors to read.
+            chunk: Number of sectors to read at once.
+            flag: Reading Flag, used for every chunk. See DvdCss.read().
+            seek_flag: Seeking Flag, used for the seek to `start`. See DvdCss.seek().
+            prefetch: Number of chunks to queue reads of at once, at least 1.
+
+        Raises:
+            ValueError: Invalid count, chunk, or prefetch.
+            SeekError: Failure seeking to the start sector.
+            ReadError: Failure reading sectors, or returned data is less than expected.
+
+        Yields the sectors read for each chunk as bytes, in order.
+        """
+        if not isinstance(count, int) or count < 0:
+            raise ValueError(f"Expected count to be a non-negative int, not {count!r}")
+        if not isinstance(chunk, int) or chunk <= 0:
+            raise ValueError(f"Expected chunk to be a positive int, not {chunk!r}")
+        if not isinstance(prefetch, int) or prefetch <= 0:
+            raise ValueError(
+                f"Expected prefetch to be a positive int, not {prefetch!r}"
+            )
+
+        await self.seek(start, seek_flag)
+
+        # The executor runs one call at a time in order, so queued reads continue on
+        # from each other without needing to seek in between.
+        pending: deque[asyncio.Future[bytes]] = deque()
+        remaining = count
+        try:
+            while remaining or pending:
+                while remaining and len(pending) < prefetch:
+                    sectors = min(chunk, remaining)
+                    pending.append(self._submit(self.dvdcss.read, sectors, flag))
+                    remaining -= sectors
+                yield await pending.popleft()
+        finally:
+            for future in pending:
+                future.cancel()
+
+    def shutdown(self) -> None:
+        """
+        Shut down the executor thread once all queued calls have finished.
+
+        This does not close the DVD. A new executor is started if this is used again.
+        """
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+            self._executor = None
+
+    def _submit(self, func: Callable[..., T], *args: Any) -> asyncio.Future[T]:
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=1, thread_name_prefix="pydvdcss"
+            )
+        return asyncio.get_running_loop().run_in_executor(self._executor, func, *args)
+
+    async def _run(self, func: Callable[..., T], *args: Any) -> T:
+        return await self._submit(func, *args)
+
+
+__all__ = ("AsyncDvdCss",)
@@ -0,0 +1,217 @@
+from __future__ import annotations
+
+import time
+from collections import deque
+from collections.abc import Iterator
+from contextlib import contextmanager
+from ctypes import Array, addressof, c_char, create_string_buffer
+from dataclasses import dataclass
+from threading import Lock
+
+from pydvdcss import constants
+
+
+def aligned_buffer(size: int, alignment: int = constants.SECTOR_SIZE) -> Array[c_char]:
+    """
+    Create a zero-filled ctypes char buffer whose address is aligned in memory.
+
+    ctypes makes no promise on the alignment of create_string_buffer(), which isn't
+    enough when libdvdcss is reading from a raw device (DVDCSS_RAW_DEVICE) as it then
+    requires buffers aligned to the size of a sector on most operating systems.
+
+    The buffer can be used anywhere a create_string_buffer() buffer can, e.g. with
+    DvdCss.readv() or DvdCss.read_into().
+
+    Parameters:
+        size: Size of the buffer in bytes.
+        alignment: Alignment of the buffer's address in bytes, a power of two.
+
+    Raises:
+        ValueError: The size is not positive or alignment is not a power of two.
+
+    Returns a c_char array of exactly `size` bytes starting at an aligned address.
+    """
+    if size <= 0:
+        raise ValueError(f"Expected size to be a positive int, not {size!r}")
+    if alignment <= 0 or alignment & (alignment - 1):
+        raise ValueError(f"Expected alignment to be a power of two, not {alignment!r}")
+
+    # Over-allocate by up to one alignment and map the array at the first aligned
+    # offset. The array keeps a reference to the backing buffer, keeping it alive.
+    backing = create_string_buffer(size + alignment - 1)
+    offset = -addressof(backing) % alignment
+    return (c_char * size).from_buffer(backing, offset)
+
+
+@dataclass(frozen=True)
+class BufferPoolStats:
+    """A snapshot of a SectorBufferPool's counters."""
+
+    allocated: int
+    """Number of buffers that were created by the pool."""
+    reused: int
+    """Number of acquisitions that were served by an idle buffer."""
+    evicted: int
+    """Number of buffers dropped for being over capacity or idle for too long."""
+    idle: int
+    """Number of buffers currently held idle by the pool."""
+    in_use: int
+    """Number of buffers currently acquired and not yet released."""
+    buffer_size: int
+    """Size of each buffer in bytes."""
+
+    @property
+    def idle_bytes(self) -> int:
+        """Memory currently held idle by the pool, in bytes."""
+        return self.idle * self.buffer_size
+
+
+class SectorBufferPool:
+    """
+    A thread-safe pool of reusable, sector-aligned, fixed-size read buffers.
+
+    Every buffer holds the same number of sectors and is aligned to a sector, so it is
+    safe for DVDCSS_RAW_DEVICE. Released buffers are kept idle for reuse instead of
+    allocating a new buffer on every read, keeping memory use flat over long runs.
+
+    At most `capacity` buffers are kept idle, extras are dropped on release. Buffers
+    idle for longer than `idle_timeout` seconds are evicted on the next acquire,
+    release, or trim().
+
+    Pass a pool to DvdCss(buffer_pool=...) to have read() use it, and acquire buffers
+    from it yourself for readv() or read_into():
+
+        pool = SectorBufferPool(sectors=16)
+        with pool.buffer() as buffer:
+            dvd.readv(buffer, flag=ReadFlag.READ_DECRYPT)
+    """
+
+    def __init__(
+        self,
+        sectors: int = 512,
+        capacity: int = 8,
+        idle_timeout: float | None = 60.0,
+        alignment: int = constants.SECTOR_SIZE,
+    ) -> None:
+        """
+        Parameters:
+            sectors: Number of sectors each buffer holds.
+            capacity: Maximum number of idle buffers to keep for reuse.
+            idle_timeout: Seconds a buffer may stay idle before it's evicted. Use None
+                to keep idle buffers until trim() or clear() is called.
+            alignment: Alignment of each buffer's address in bytes, a power of two.
+        """
+        if not isinstance(sectors, int) or sectors <= 0:
+            raise ValueError(f"Expected sectors to be a positive int, not {sectors!r}")
+        if not isinstance(capacity, int) or capacity < 0:
+            raise ValueError(
+                f"Expected capacity to be a non-negative int, not {capacity!r}"
+            )
+
+        self.sectors = sectors
+        self.capacity = capacity
+        self.idle_timeout = idle_timeout
+        self.alignment = alignment
+
+        self._lock = Lock()
+        self._idle: deque[tuple[Array[c_char], float]] = deque()
+        self._in_use: set[int] = set()
+        self._allocated = 0
+        self._reused = 0
+        self._evicted = 0
+
+    @property
+    def buffer_size(self) -> int:
+        """Size of each buffer in bytes."""
+        return self.sectors * constants.SECTOR_SIZE
+
+    def acquire(self) -> Array[c_char]:
+        """
+        Take a buffer from the pool, creating a new one if none are idle.
+
+        The buffer's contents are whatever was last read into it, it is not cleared.
+        Hand it back with release() once you are finished with it.
+        """
+        with self._lock:
+            self._evict_expired(time.monotonic())
+            if self._idle:
+                buffer, _ = self._idle.pop()
+                self._reused += 1
+            else:
+                buffer = aligned_buffer(self.buffer_size, self.alignment)
+                self._allocated += 1
+            self._in_use.add(id(buffer))
+        return buffer
+
+    def release(self, buffer: Array[c_char]) -> None:
+        """
+        Return a buffer previously taken with acquire() to the pool.
+
+        Raises:
+            ValueError: The buffer was not acquired from this pool or was already
+                released.
+        """
+        with self._lock:
+            if id(buffer) not in self._in_use:
+                raise ValueError("The buffer was not acquired from this pool.")
+            self._in_use.discard(id(buffer))
+            now = time.monotonic()
+            self._evict_expired(now)
+            if len(self._idle) < self.capacity:
+                self._idle.append((buffer, now))
+            else:
+                self._evicted += 1
+
+    @contextmanager
+    def buffer(self) -> Iterator[Array[c_char]]:
+        """Acquire a buffer for the duration of a with block, then release it."""
+        buffer = self.acquire()
+        try:
+            yield buffer
+        finally:
+            self.release(buffer)
+
+    def trim(self, idle_timeout: float | None = None) -> int:
+        """
+        Evict idle buffers that have been idle for too long.
+
+        Parameters:
+            idle_timeout: Seconds a buffer may have been idle for. Defaults to the
+                pool's idle_timeout. Use 0 to evict every idle buffer.
+
+        Returns the number of buffers evicted.
+        """
+        with self._lock:
+            before = len(self._idle)
+            self._evict_expired(time.monotonic(), idle_timeout)
+            return before - len(self._idle)
+
+    def clear(self) -> int:
+        """Evict every idle buffer. Returns the number of buffers evicted."""
+        return self.trim(0)
+
+    @property
+    def stats(self) -> BufferPoolStats:
+        """A snapshot of the pool's counters."""
+        with self._lock:
+            return BufferPoolStats(
+                allocated=self._allocated,
+                reused=self._reused,
+                evicted=self._evicted,
+                idle=len(self._idle),
+                in_use=len(self._in_use),
+                buffer_size=self.buffer_size,
+            )
+
+    def _evict_expired(self, now: float, idle_timeout: float | None = None) -> None:
+        if idle_timeout is None:
+            idle_timeout = self.idle_timeout
+        if idle_timeout is None:
+            return
+        # Buffers are appended as they're released, so the oldest are on the left.
+        while self._idle and now - self._idle[0][1] >= idle_timeout:
+            self._idle.popleft()
+            self._evicted += 1
+
+
+__all__ = ("BufferPoolStats", "SectorBufferPool", "aligned_buffer")
@@ -0,0 +1,368 @@
+from __future__ import annotations
+
+import queue
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import TYPE_CHECKING
+
+from pydvdcss import constants, exceptions
+from pydvdcss._types import ReadFlag_T, SeekFlag_T
+from pydvdcss.structs import ReadFlag, SeekFlag
+
+if TYPE_CHECKING:
+    from pydvdcss.dvdcss import DvdCss
+
+
+@dataclass(frozen=True)
+class SectorCacheStats:
+    """A snapshot of a SectorCache's counters."""
+
+    hits: int
+    """Number of blocks served from the cache, including prefetched ones."""
+    misses: int
+    """Number of blocks read from the disc because they were not cached."""
+    prefetched: int
+    """Number of blocks read ahead on the background thread."""
+    prefetch_hits: int
+    """Number of prefetched blocks that were then read."""
+    prefetch_wasted: int
+    """Number of prefetched blocks evicted or cleared without ever being read."""
+    evictions: int
+    """Number of blocks evicted to stay within the byte budget."""
+    blocks: int
+    """Number of blocks currently cached."""
+    size: int
+    """Bytes currently cached."""
+
+    @property
+    def hit_ratio(self) -> float:
+        """Fraction of blocks served from the cache."""
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+
+@dataclass
+class _Block:
+    data: bytes
+    prefetched: bool = False
+    used: bool = False
+
+
+class SectorCache:
+    """
+    A least-recently-used cache of sector blocks read from a DvdCss, with readahead.
+
+    Sectors are read and cached in blocks of `block` sectors, up to `max_bytes` in
+    total, evicting the least recently used blocks first. When reads move forward
+    through the disc, e.g. a player streaming a VOB, the next `readahead` blocks are
+    read on a background thread so they're cached before they're asked for. Random
+    reads are not followed by any readahead, so seeking around does not waste reads.
+
+    Blocks are cached by Reading Flag as well as position, so sectors read with
+    ReadFlag.READ_DECRYPT and sectors read as-is are never mixed up.
+
+    The cache uses the DvdCss from its own thread for readahead, so do not use the
+    DvdCss directly while the cache is in use. The cache is safe to use across threads.
+    Blocks read with ReadFlag.READ_DECRYPT are seeked to with SeekFlag.SEEK_MPEG, so
+    libdvdcss switches to the title key of the block's title as the cache jumps between
+    titles. Obtaining the title keys first, e.g. with DvdCss.prewarm_keys(), saves
+    deriving them mid-read.
+    """
+
+    def __init__(
+        self,
+        dvdcss: DvdCss,
+        max_bytes: int = 64 * 1024 * 1024,
+        block: int = 32,
+        readahead: int = 8,
+        sequential_after: int = 2,
+        sectors: int | None = None,
+        seek_flag: SeekFlag_T | None = None,
+    ) -> None:
+        """
+        Parameters:
+            dvdcss: The DvdCss with the disc open.
+            max_bytes: Most bytes of sectors to keep cached.
+            block: Number of sectors read and cached together.
+            readahead: Number of blocks to read ahead on sequential access, 0 to never
+                read ahead.
+            sequential_after: Number of reads in a row that each carry on from the last
+                before access is taken as sequential.
+            sectors: Number of sectors of the disc, so blocks are not read past its end.
+                Without it, a block past the end is read only up to what was asked for,
+                and not cached.
+            seek_flag: Seeking Flag, used for every seek. See DvdCss.seek(). Defaults
+                to SeekFlag.SEEK_MPEG for blocks read with ReadFlag.READ_DECRYPT, and
+                SeekFlag.Unset for the rest.
+        """
+        if not isinstance(block, int) or block <= 0:
+            raise ValueError(f"Expected block to be a positive int, not {block!r}")
+        if not isinstance(readahead, int) or readahead < 0:
+            raise ValueError(
+                f"Expected readahead to be a non-negative int, not {readahead!r}"
+            )
+        if max_bytes < block * constants.SECTOR_SIZE:
+            raise ValueError(
+                f"Expected max_bytes to hold at least one block, not {max_bytes!r}"
+            )
+
+        self.dvdcss = dvdcss
+        self.max_bytes = max_bytes
+        self.block = block
+        self.readahead = readahead
+        self.sequential_after = sequential_after
+        self.sectors = sectors
+        self.seek_flag = (
+            SeekFlag(seek_flag) if isinstance(seek_flag, int) else seek_flag
+        )
+
+        self._lock = threading.Lock()
+        self._io_lock = threading.Lock()
+        self._blocks: OrderedDict[tuple[int, int], _Block] = OrderedDict()
+        self._pending: dict[tuple[int, int], threading.Event] = {}
+        self._size = 0
+        self._position: int | None = None  # Where the drive is, if known.
+        self._next: int | None = None  # The sector a sequential read would start at.
+        self._streak = 0
+        self._queue: queue.Queue[tuple[int, int] | None] = queue.Queue()
+        self._thread: threading.Thread | None = None
+
+        self._hits = 0
+        self._misses = 0
+        self._prefetched = 0
+        self._prefetch_hits = 0
+        self._prefetch_wasted = 0
+        self._evictions = 0
+
+    def read(self, sector: int, count: int, flag: ReadFlag_T = ReadFlag.Unset) -> bytes:
+        """
+        Read sectors, from the cache where possible.
+
+        Parameters:
+            sector: First sector to read.
+            count: Number of sectors to read.
+            flag: Reading Flag. See DvdCss.read().
+
+        Raises:
+            ValueError: Invalid sector or count.
+            SeekError: Failure seeking to a block.
+            ReadError: Failure reading a block, or the sectors go past the end of the
+                disc.
+
+        Returns the sectors read.
+        """
+        if not isinstance(sector, int) or sector < 0:
+            raise ValueError(
+                f"Expected sector to be a non-negative int, not {sector!r}"
+            )
+        if not isinstance(count, int) or count <= 0:
+            raise ValueError(f"Expected count to be a positive int, not {count!r}")
+        if self.sectors is not None and sector + count > self.sectors:
+            raise exceptions.ReadError(
+                f"Sectors {sector}-{sector + count - 1} go past the end of the disc "
+                f"({self.sectors})."
+            )
+        flag_value = flag.value if isinstance(flag, ReadFlag) else ReadFlag(flag).value
+
+        first = sector // self.block
+        last = (sector + count - 1) // self.block
+        parts = []
+        for index in range(first, last + 1):
+            needed = min(sector + count, (index + 1) * self.block) - index * self.block
+            parts.append(self._get((flag_value, index), needed))
+        self._track(flag_value, sector, count)
+
+        data = b"".join(parts) if len(parts) > 1 else parts[0]
+        offset = (sector - first * self.block) * constants.SECTOR_SIZE
+        return data[offset : offset + count * constants.SECTOR_SIZE]
+
+    @property
+    def stats(self) -> SectorCacheStats:
+        """A snapshot of the cache's counters."""
+        with self._lock:
+            return SectorCacheStats(
+                hits=self._hits,
+                misses=self._misses,
+                prefetched=self._prefetched,
+                prefetch_hits=self._prefetch_hits,
+                prefetch_wasted=self._prefetch_wasted,
+                evictions=self._evictions,
+                blocks=len(self._blocks),
+                size=self._size,
+            )
+
+    def clear(self) -> None:
+        """Drop every cached block."""
+        with self._lock:
+            self._prefetch_wasted += sum(
+                entry.prefetched and not entry.used for entry in self._blocks.values()
+            )
+            self._blocks.clear()
+            self._size = 0
+
+    def close(self) -> None:
+        """Stop the readahead thread and drop every cached block."""
+        thread = self._thread
+        if thread:
+            self._queue.put(None)
+            thread.join()
+            self._thread = None
+        self.clear()
+
+    def __enter__(self) -> SectorCache:
+        return self
+
+    def __exit__(self, *_: object) -> None:
+        self.close()
+
+    def _get(self, key: tuple[int, int], needed: int) -> bytes:
+        while True:
+            with self._lock:
+                entry = self._blocks.get(key)
+                if entry is not None:
+                    self._blocks.move_to_end(key)
+                    self._hits += 1
+                    if entry.prefetched and not entry.used:
+                        self._prefetch_hits += 1
+                    entry.used = True
+                    return entry.data
+                pending = self._pending.get(key)
+                if pending is None:
+                    pending = self._pending[key] = threading.Event()
+                    self._misses += 1
+                    break
+            # The block is being read ahead, wait for it rather than read it twice.
+            pending.wait()
+            with self._lock:
+                if key not in self._blocks:
+                    # The readahead failed, read it here and count it as a miss.
+                    if key in self._pending:
+                        continue
+                    self._pending[key] = pending = threading.Event()
+                    self._misses += 1
+                    break
+
+        try:
+            data = self._load(key)
+            if data is None:
+                # Past the end of the disc, read only what's needed and don't cache it.
+                flag, index = key
+                return self._read(index * self.block, needed, flag)
+            self._store(key, _Block(data, used=True))
+            return data
+        finally:
+            with self._lock:
+                del self._pending[key]
+            pending.set()
+
+    def _load(self, key: tuple[int, int]) -> bytes | None:
+        # Read a whole block, or None if it goes past the end of the disc.
+        flag, index = key
+        start = index * self.block
+        count = self.block
+        if self.sectors is not None:
+            count = min(count, self.sectors - start)
+            if count <= 0:
+                raise exceptions.ReadError(
+                    f"Sector {start} is past the end of the disc ({self.sectors})."
+                )
+            return self._read(start, count, flag)
+        try:
+            return self._read(start, count, flag)
+        except exceptions.ReadError:
+            return None
+
+    def _read(self, start: int, count: int, flag: int) -> bytes:
+        with self._io_lock:
+            try:
+                if self._position != start:
+                    self.dvdcss.seek(start, self._seek_flag(flag))
+                data = self.dvdcss.read(count, ReadFlag(flag))
+            except (exceptions.SeekError, exceptions.ReadError):
+                self._position = None
+                raise
+            self._position = start + count
+            return data
+
+    def _seek_flag(self, flag: int) -> SeekFlag:
+        if self.seek_flag is not None:
+            return self.seek_flag
+        if flag == ReadFlag.READ_DECRYPT.value:
+            return SeekFlag.SEEK_MPEG
+        return SeekFlag.Unset
+
+    def _store(self, key: tuple[int, int], entry: _Block) -> None:
+        with self._lock:
+            self._blocks[key] = entry
+            self._size += len(entry.data)
+            while self._size > self.max_bytes:
+                _, evicted = self._blocks.popitem(last=False)
+                self._size -= len(evicted.data)
+                self._evictions += 1
+                if evicted.prefetched and not evicted.used:
+                    self._prefetch_wasted += 1
+
+    def _track(self, flag: int, sector: int, count: int) -> None:
+        # Read ahead once enough reads in a row carried on from the previous one,
+        # allowing for a gap of less than a block, e.g. skipping a navigation pack.
+        with self._lock:
+            if self._next is not None and 0 <= sector - self._next < self.block:
+                self._streak += 1
+            else:
+                self._streak = 0
+                self._drop_readahead()
+            self._next = sector + count
+            last = (sector + count - 1) // self.block
+            if not self.readahead or self._streak < self.sequential_after:
+                return
+            keys = [
+                (flag, index)
+                for index in range(last + 1, last + 1 + self.readahead)
+                if (flag, index) not in self._blocks
+                and (flag, index) not in self._pending
+                and (self.sectors is None or index * self.block < self.sectors)
+            ]
+            if keys and self._thread is None:
+                self._thread = threading.Thread(
+                    target=self._prefetch, name="pydvdcss-readahead", daemon=True
+                )
+                self._thread.start()
+        for key in keys:
+            self._queue.put(key)
+
+    def _drop_readahead(self) -> None:
+        # Forget the readahead queued for where the reads were before jumping away.
+        try:
+            while True:
+                if self._queue.get_nowait() is None:
+                    self._queue.put(None)
+                    return
+        except queue.Empty:
+            pass
+
+    def _prefetch(self) -> None:
+        while True:
+            key = self._queue.get()
+            if key is None:
+                return
+            with self._lock:
+                if key in self._blocks or key in self._pending:
+                    continue
+                pending = self._pending[key] = threading.Event()
+            try:
+                data = self._load(key)
+            except (exceptions.SeekError, exceptions.ReadError):
+                data = None
+            try:
+                if data is not None:
+                    self._store(key, _Block(data, prefetched=True))
+                    with self._lock:
+                        self._prefetched += 1
+            finally:
+                with self._lock:
+                    del self._pending[key]
+                pending.set()
+
+
+__all__ = ("SectorCache", "SectorCacheStats")
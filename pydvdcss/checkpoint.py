@@ -0,0 +1,257 @@
+from __future__ import annotations
+
+import json
+import os
+import threading
+import time
+from collections.abc import Callable, Iterable
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+from pydvdcss import constants, exceptions
+from pydvdcss._types import ReadFlag_T, SeekFlag_T
+from pydvdcss.index import disc_fingerprint
+from pydvdcss.streaming import CopyResult, Digests
+from pydvdcss.structs import ReadFlag, SeekFlag
+
+if TYPE_CHECKING:
+    from pydvdcss.dvdcss import DvdCss
+
+
+@dataclass
+class Checkpoint:
+    """The progress of a resumable_copy(), as saved to its checkpoint file."""
+
+    fingerprint: str | None
+    """The disc's fingerprint, see disc_fingerprint(), if it has a UDF file system."""
+    output: str
+    """Absolute path of the output file."""
+    start: int
+    """First sector of the range being copied."""
+    count: int
+    """Number of sectors in the range being copied."""
+    flag: int
+    """Reading Flag value used for every read."""
+    seek_flag: int
+    """Seeking Flag value used for every seek."""
+    method: str | None
+    """The DVDCSS_METHOD in use when the copy started, if set."""
+    completed: list[list[int]] = field(default_factory=list)
+    """Ranges of sectors, as [start, count], known to be durably written to the output.
+    Output byte `(sector - start) * 2048` holds each sector."""
+
+    @property
+    def done(self) -> int:
+        """Number of sectors durably copied from the start of the range."""
+        for start, count in self.completed:
+            if start == self.start:
+                return count
+        return 0
+
+    @classmethod
+    def load(cls, path: str | os.PathLike[str]) -> Checkpoint:
+        """Load a checkpoint saved with save()."""
+        return cls(**json.loads(Path(path).read_text(encoding="utf8")))
+
+    def save(self, path: str | os.PathLike[str]) -> None:
+        """Save the checkpoint durably, replacing the file at once."""
+        path = Path(path)
+        temp = path.with_name(path.name + ".tmp")
+        with temp.open("w", encoding="utf8") as f:
+            json.dump(asdict(self), f)
+            f.flush()
+            os.fsync(f.fileno())
+        temp.replace(path)
+
+
+def resumable_copy(
+    dvdcss: DvdCss,
+    output: str | os.PathLike[str],
+    checkpoint: str | os.PathLike[str],
+    start: int = 0,
+    count: int | None = None,
+    chunk: int = 512,
+    flag: ReadFlag_T = ReadFlag.Unset,
+    seek_flag: SeekFlag_T = SeekFlag.Unset,
+    checkpoint_sectors: int = 16384,
+    checkpoint_seconds: float = 10.0,
+    verify_sectors: int = 16,
+    cancel: threading.Event | None = None,
+    progress: Callable[[int], object] | None = None,
+    verify: bool = False,
+    hashes: Iterable[str] = (),
+) -> CopyResult:
+    """
+    Copy a range of sectors to a file, resuming from a checkpoint after a restart.
+
+    The copy is done with DvdCss.copy_range(). The output is fsync'd and the checkpoint
+    saved every `checkpoint_sectors` sectors or `checkpoint_seconds` seconds, whichever
+    comes first, rather than after every chunk, so checkpoints cost next to nothing.
+    It is also saved when the copy fails or is cancelled. The checkpoint records the
+    disc's fingerprint, the output path, the range and flags, the DVDCSS_METHOD, and
+    the sectors durably written.
+
+    When a checkpoint exists it must be for the same disc, output, range, and flags.
+    The last `verify_sectors` sectors it says were written are read again and compared
+    with the output, stepping further back while they differ, then the copy carries on
+    from there. Use a DVDCSS_CACHE (see KeyCache) so title keys are not cracked again.
+
+    Parameters:
+        dvdcss: The DvdCss with the disc open.
+        output: Path of the file to copy to. It is created, or resumed if the
+            checkpoint exists.
+        checkpoint: Path of the checkpoint file.
+        start: Sector to start copying from.
+        count: Number of sectors to copy. Required unless resuming.
+        chunk: Number of sectors to read at once.
+        flag: Reading Flag, used for every read. See DvdCss.read().
+        seek_flag: Seeking Flag, used for the seek when starting or resuming. See
+            DvdCss.seek().
+        checkpoint_sectors: Most sectors to copy between checkpoints.
+        checkpoint_seconds: Most seconds between checkpoints.
+        verify_sectors: Number of sectors at the end of the output to verify against
+            the disc when resuming. 0 to trust the checkpoint.
+        cancel: An event that stops the copy once set, see DvdCss.copy_range(). The
+            checkpoint is saved, so the copy can be resumed later.
+        progress: Called with the total number of sectors copied so far, including
+            those copied before resuming, after each chunk is written.
+        verify: Check that no sector read is still scrambled, see DvdCss.copy_range().
+        hashes: Hash algorithms to digest the whole output with while copying, see
+            Digests. When resuming, the part already written is hashed from the output.
+
+    Raises:
+        NoDeviceError: No DVD device or directory is open yet.
+        ValueError: No count for a new copy, the checkpoint is for another copy, or an
+            unsupported hash.
+        SeekError: Failure seeking to the start sector.
+        ReadError: Failure reading sectors, or returned data is less than expected.
+        ScrambledSectorError: With verify, sectors were read still scrambled.
+        OSError: Failure writing to the output or the checkpoint.
+
+    Returns a CopyResult with the number of sectors copied by this call, not counting
+    those copied before resuming, and the digests of the whole output.
+    """
+    if dvdcss.handle is None:
+        raise exceptions.NoDeviceError(
+            "No DVD device or directory is open yet, use open() first."
+        )
+    flag = ReadFlag(flag) if isinstance(flag, int) else flag
+    seek_flag = SeekFlag(seek_flag) if isinstance(seek_flag, int) else seek_flag
+
+    try:
+        fingerprint: str | None = disc_fingerprint(dvdcss.read_sectors)
+    except (ValueError, exceptions.PyDvdCssError):
+        fingerprint = None
+
+    output = Path(output).absolute()
+    if Path(checkpoint).exists():
+        state = Checkpoint.load(checkpoint)
+        expected = (fingerprint, str(output), start, flag.value, seek_flag.value)
+        actual = (state.fingerprint, state.output, state.start, state.flag)
+        if (*actual, state.seek_flag) != expected or count not in (None, state.count):
+            raise ValueError(
+                f"The checkpoint {checkpoint} is for a different disc, output, range, "
+                f"or flags."
+            )
+        resume = _verify_tail(dvdcss, state, verify_sectors)
+    else:
+        if count is None:
+            raise ValueError("A count is required to start a new copy.")
+        state = Checkpoint(
+            fingerprint=fingerprint,
+            output=str(output),
+            start=start,
+            count=count,
+            flag=flag.value,
+            seek_flag=seek_flag.value,
+            method=os.environ.get("DVDCSS_METHOD"),
+        )
+        resume = 0
+
+    digests = Digests(hashes)
+    if digests and resume:
+        _hash_output(output, resume, chunk, digests)
+
+    durable = resume
+    written = 0
+    saved = time.perf_counter()
+
+    def commit() -> None:
+        nonlocal durable, saved
+        f.flush()
+        os.fsync(f.fileno())
+        durable = resume + written
+        state.completed = [[state.start, durable]]
+        state.save(checkpoint)
+        saved = time.perf_counter()
+
+    def on_progress(copied: int) -> None:
+        nonlocal written
+        written = copied
+        if (
+            resume + written - durable >= checkpoint_sectors
+            or time.perf_counter() - saved >= checkpoint_seconds
+        ):
+            commit()
+        if progress:
+            progress(resume + written)
+
+    with output.open("r+b" if output.exists() else "wb") as f:
+        f.truncate(resume * constants.SECTOR_SIZE)
+        f.seek(resume * constants.SECTOR_SIZE)
+        try:
+            result = dvdcss.copy_range(
+                state.start + resume,
+                state.count - resume,
+                f,
+                chunk=chunk,
+                flag=flag,
+                seek_flag=seek_flag,
+                cancel=cancel,
+                progress=on_progress,
+                verify=verify,
+                hashes=digests,
+            )
+        finally:
+            commit()
+
+    return result
+
+
+def _hash_output(path: Path, sectors: int, chunk: int, digests: Digests) -> None:
+    # Hash the start of the output, the part written before resuming.
+    buffer = memoryview(bytearray(chunk * constants.SECTOR_SIZE))
+    remaining = sectors * constants.SECTOR_SIZE
+    with path.open("rb", buffering=0) as f:
+        while remaining:
+            read = f.readinto(buffer[: min(len(buffer), remaining)])
+            if not read:
+                raise OSError(f"The output {path} is shorter than expected.")
+            digests.update(buffer[:read])
+            remaining -= read
+
+
+def _verify_tail(dvdcss: DvdCss, state: Checkpoint, sectors: int) -> int:
+    # The number of sectors from the start of the range to resume after: the last the
+    # checkpoint says were written, stepping back past any that differ from the disc.
+    size = Path(state.output).stat().st_size if Path(state.output).exists() else 0
+    done = min(state.done, size // constants.SECTOR_SIZE)
+    if sectors <= 0 or done == 0:
+        # Nothing to check, e.g. the output was removed, so it starts over.
+        return done
+
+    flag = ReadFlag(state.flag)
+    with open(state.output, "rb") as f:
+        while done > 0:
+            begin = max(0, done - sectors)
+            f.seek(begin * constants.SECTOR_SIZE)
+            written = f.read((done - begin) * constants.SECTOR_SIZE)
+            dvdcss.seek(state.start + begin, SeekFlag(state.seek_flag))
+            if dvdcss.read(done - begin, flag) == written:
+                return done
+            done = begin
+    return 0
+
+
+__all__ = ("Checkpoint", "resumable_copy")
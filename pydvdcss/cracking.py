@@ -0,0 +1,288 @@
+from __future__ import annotations
+
+import json
+import os
+import threading
+import time
+from collections.abc import Iterable
+from dataclasses import dataclass
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Literal
+
+from pydvdcss import exceptions
+from pydvdcss.index import disc_fingerprint, file_reader
+from pydvdcss.library import cache_dir
+from pydvdcss.scrambling import scrambled_sectors
+from pydvdcss.structs import ReadFlag, SeekFlag
+from pydvdcss.utilities import environ_override, message_with_error
+
+if TYPE_CHECKING:
+    from pydvdcss.dvdcss import DvdCss
+
+Method = Literal["key", "disc", "title"]
+
+METHODS: tuple[Method, ...] = ("key", "disc", "title")
+"""libdvdcss's cracking methods, in the order CrackingStrategy tries them by default."""
+
+
+@dataclass(frozen=True)
+class MethodAttempt:
+    """One cracking method CrackingStrategy.open() tried."""
+
+    method: str
+    """The DVDCSS_METHOD it was tried with."""
+    seconds: float
+    """Time opening the disc and the trial reads took in seconds."""
+    ok: bool
+    """Whether the trial reads were descrambled."""
+    error: str | None = None
+    """Why the method failed, if it did."""
+
+
+@dataclass(frozen=True)
+class CrackingReport:
+    """The outcome of CrackingStrategy.open()."""
+
+    fingerprint: str | None
+    """The disc's fingerprint, see disc_fingerprint(), if it could be taken."""
+    method: str
+    """The method the disc is now open with."""
+    known: bool
+    """Whether the store had timings for the disc, so the fastest was tried first."""
+    attempts: tuple[MethodAttempt, ...]
+    """Every method tried, in order. The last is the one that worked."""
+
+    @property
+    def seconds(self) -> float:
+        """Total time of every attempt in seconds."""
+        return sum(attempt.seconds for attempt in self.attempts)
+
+
+class CrackingStrategy:
+    """
+    Open discs with the cracking method that works, and remember the fastest per disc.
+
+    DVDCSS_METHOD picks one way of obtaining keys for every disc, see
+    DvdCss.set_cracking_mode(), but none is best for all of them: "key" fails without
+    the drive's cooperation, "disc" takes a lot of CPU and 64 MiB of memory, and
+    "title" can be slow or wrong. This tries the methods in order until one works,
+    within a time budget.
+
+    A method works if, once the disc is open with it, a few sectors at the start of
+    each title set's title VOBs are descrambled by a ReadFlag.READ_DECRYPT read, see
+    scrambled_sectors(). libdvdcss leaves sectors it has no title key for scrambled.
+    An unscrambled disc works with any method.
+
+    How long each method took, and whether it worked, is kept in a JSON file by the
+    disc's fingerprint, see disc_fingerprint(). A disc seen before starts with the
+    method that was fastest for it, then the others that worked, then those never
+    tried, and those that failed last.
+
+        strategy = CrackingStrategy(budget=120)
+        report = strategy.open(dvd, "/dev/sr0")
+        print(report.method, report.seconds)
+    """
+
+    def __init__(
+        self,
+        methods: Iterable[Method] = METHODS,
+        budget: float | None = None,
+        path: str | os.PathLike[str] | None = None,
+        trial_sectors: int = 8,
+    ) -> None:
+        """
+        Parameters:
+            methods: The methods to try, in order, for a disc not seen before.
+            budget: Seconds to spend on every attempt of one open. No method is
+                tried once it's spent, and a method still going is stopped between
+                trial reads. A libdvdcss call is never interrupted, so it may
+                overrun by one. None to try every method.
+            path: The JSON file of timings. Defaults to `pydvdcss/methods.json` in
+                your user cache directory, next to the library path cache.
+            trial_sectors: Number of sectors to read at each title set's title VOBs.
+
+        Raises:
+            ValueError: No methods, or an unknown one, are given.
+        """
+        self.methods: tuple[str, ...] = tuple(methods)
+        if not self.methods or any(method not in METHODS for method in self.methods):
+            raise ValueError(
+                f"Expected methods to be some of {METHODS}, not {self.methods!r}"
+            )
+        self.budget = budget
+        self.path = Path(path) if path is not None else cache_dir() / "methods.json"
+        self.trial_sectors = trial_sectors
+        self._lock = threading.Lock()
+
+    def order(self, fingerprint: str | None) -> list[str]:
+        """The order methods are tried in for a disc, by its fingerprint."""
+        timings = self._load_records().get(fingerprint, {}) if fingerprint else {}
+        worked = sorted(
+            (method for method in self.methods if timings.get(method, {}).get("ok")),
+            key=lambda method: timings[method]["seconds"],
+        )
+        untried = [method for method in self.methods if method not in timings]
+        failed = [
+            method
+            for method in self.methods
+            if method in timings and method not in worked
+        ]
+        return worked + untried + failed
+
+    def forget(self, fingerprint: str) -> None:
+        """Drop the timings kept for a disc, by its fingerprint."""
+        with self._lock:
+            records = self._load_records()
+            if records.pop(fingerprint, None) is not None:
+                self._save_records(records)
+
+    def open(
+        self,
+        dvdcss: DvdCss,
+        target: str | os.PathLike[str],
+        cache_dir: str | os.PathLike[str] | None = None,
+    ) -> CrackingReport:
+        """
+        Open a disc with the first method that works, and record how each did.
+
+        The disc is fingerprinted first, from the file of an ISO image, otherwise by
+        opening it with the "title" method, which obtains no keys when opening. That
+        open is kept if "title" is the first method to try.
+
+        Parameters:
+            dvdcss: The DvdCss to open the disc with, see DvdCss.open().
+            target: The disc to open, see DvdCss.open().
+            cache_dir: Directory to cache title keys in, see DvdCss.open().
+
+        Raises:
+            OpenFailureError: No method worked within the budget. The disc is closed.
+            AlreadyInUseError: The DvdCss already has a disc open.
+
+        Returns a CrackingReport of the open, with the disc open with the method
+        that worked.
+        """
+        if dvdcss.handle is not None:
+            raise exceptions.AlreadyInUseError(
+                "A DVD is already opened, you cannot open another."
+            )
+        target = os.fspath(target)
+        deadline = None if self.budget is None else time.monotonic() + self.budget
+
+        began = time.perf_counter()
+        fingerprint = self._fingerprint(dvdcss, target, cache_dir)
+        order = self.order(fingerprint)
+        if dvdcss.handle is not None and order[0] != "title":
+            dvdcss.close()
+        # The fingerprinting open counts towards the "title" attempt it's kept for.
+        probe = time.perf_counter() - began if dvdcss.handle is not None else 0.0
+
+        attempts: list[MethodAttempt] = []
+        for method in order:
+            if attempts and deadline is not None and time.monotonic() >= deadline:
+                break
+            began = time.perf_counter()
+            try:
+                if dvdcss.handle is None:
+                    with environ_override({"DVDCSS_METHOD": method}):
+                        dvdcss.open(target, cache_dir)
+                error = self._trial(dvdcss, deadline)
+            except exceptions.PyDvdCssError as e:
+                error = str(e)
+            attempts.append(
+                MethodAttempt(
+                    method=method,
+                    seconds=time.perf_counter() - began + probe,
+                    ok=error is None,
+                    error=error,
+                )
+            )
+            probe = 0.0
+            if error is None:
+                break
+            if dvdcss.handle is not None:
+                dvdcss.close()
+
+        known = fingerprint is not None and fingerprint in self._load_records()
+        if fingerprint is not None:
+            self._record(fingerprint, attempts)
+
+        if not attempts or not attempts[-1].ok:
+            raise exceptions.OpenFailureError(
+                message_with_error(
+                    f"No cracking method could open '{target}'",
+                    "; ".join(f"{a.method}: {a.error}" for a in attempts),
+                )
+            )
+
+        return CrackingReport(
+            fingerprint=fingerprint,
+            method=attempts[-1].method,
+            known=known,
+            attempts=tuple(attempts),
+        )
+
+    def _fingerprint(
+        self,
+        dvdcss: DvdCss,
+        target: str,
+        cache_dir: str | os.PathLike[str] | None,
+    ) -> str | None:
+        # Leaves the disc open with the "title" method if it had to be opened.
+        try:
+            if os.path.isfile(target):
+                with open(target, "rb") as f:
+                    return disc_fingerprint(file_reader(f))
+            with environ_override({"DVDCSS_METHOD": "title"}):
+                dvdcss.open(target, cache_dir)
+            return disc_fingerprint(dvdcss.read_sectors)
+        except (ValueError, OSError, exceptions.PyDvdCssError):
+            return None
+
+    def _trial(self, dvdcss: DvdCss, deadline: float | None) -> str | None:
+        # Why the disc's title keys couldn't be used, or None if they could.
+        if not dvdcss.is_scrambled:
+            return None
+        try:
+            key_sectors = dvdcss.get_index().key_sectors
+        except (ValueError, FileNotFoundError):
+            # Not DVD-Video, so there are no titles to try and opening has to do.
+            return None
+
+        for name, sector in key_sectors.items():
+            if not name.endswith("_1.VOB"):
+                continue
+            if deadline is not None and time.monotonic() >= deadline:
+                return "Ran out of time"
+            dvdcss.seek(sector, SeekFlag.SEEK_KEY)
+            data = dvdcss.read(self.trial_sectors, ReadFlag.READ_DECRYPT)
+            scrambled = scrambled_sectors(data)
+            if scrambled:
+                return f"{len(scrambled)} sectors of {name} were not descrambled"
+        return None
+
+    def _record(self, fingerprint: str, attempts: list[MethodAttempt]) -> None:
+        with self._lock:
+            records = self._load_records()
+            timings = records.setdefault(fingerprint, {})
+            for attempt in attempts:
+                timings[attempt.method] = {
+                    "seconds": attempt.seconds,
+                    "ok": attempt.ok,
+                }
+            self._save_records(records)
+
+    def _load_records(self) -> dict[str, Any]:
+        try:
+            records = json.loads(self.path.read_text("utf8"))
+        except (OSError, ValueError):
+            return {}
+        return records if isinstance(records, dict) else {}
+
+    def _save_records(self, records: dict[str, Any]) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        temp = self.path.with_suffix(f".{os.getpid()}.tmp")
+        temp.write_text(json.dumps(records, separators=(",", ":")), encoding="utf8")
+        temp.replace(self.path)
+
+
+__all__ = ("METHODS", "CrackingReport", "CrackingStrategy", "MethodAttempt")
@@ -0,0 +1,144 @@
+from __future__ import annotations
+
+import multiprocessing
+import os
+import time
+from collections.abc import Iterable
+from concurrent.futures import Future, ProcessPoolExecutor
+from contextlib import suppress
+from typing import Literal
+
+from pydvdcss import exceptions
+from pydvdcss.dvdcss import DvdCss
+from pydvdcss.keys import TitleKeyResult
+from pydvdcss.structs import SeekFlag
+from pydvdcss.utilities import dvdcss_env, init_worker
+
+
+def discover_keys(
+    target: str | os.PathLike[str],
+    cache_dir: str | os.PathLike[str] | None = None,
+    workers: int | None = None,
+    method: Literal["title", "disc", "key"] | None = None,
+    sectors: Iterable[int] | None = None,
+) -> list[TitleKeyResult]:
+    """
+    Obtain the CSS title keys of a disc in parallel, across worker processes.
+
+    libdvdcss obtains title keys one at a time in a handle, and cracking them, e.g.
+    with the "title" method or when the disc key can't be obtained, is CPU-bound.
+    This spreads the titles over `workers` processes instead. Each opens its own
+    handle and seeks with SeekFlag.SEEK_KEY to the titles it's given, one at a time as
+    it finishes the last, and libdvdcss saves every key it obtains in the shared key
+    cache. A handle opened afterwards with the same cache loads the keys from it:
+
+        discover_keys("movie.iso", cache_dir, workers=32, method="title")
+        dvd.open("movie.iso", cache_dir)
+        dvd.prewarm_keys()  # Every key is loaded from the cache.
+
+    The workers only speed up cracking. With a device, a key obtained from the
+    drive is no faster in parallel, as the drive serves one request at a time.
+
+    Parameters:
+        target: An ISO image file or VOB/IFO structure directory. A block device
+            may be given, see above.
+        cache_dir: Directory of libdvdcss's key cache, shared by the workers.
+            Defaults to the DVDCSS_CACHE environment variable or libdvdcss's default.
+        workers: Most worker processes, defaults to the number of CPUs. No more are
+            started than there are titles.
+        method: DVDCSS_METHOD for the workers, see DvdCss.set_cracking_mode().
+        sectors: Sectors to obtain a title key at, instead of taking them from the
+            disc's index. See DvdCss.prewarm_keys().
+
+    Raises:
+        ValueError: The key cache is off, so keys can't be shared, or without
+            sectors, the disc has no valid UDF file system.
+        FileNotFoundError: Without sectors, the disc has no VIDEO_TS IFOs.
+        OpenFailureError: Failure opening the disc to read its index.
+
+    Returns a TitleKeyResult for each sector, in sector order, with how long it took
+    its worker and whether the key was found.
+    """
+    workers = workers if workers is not None else os.cpu_count() or 4
+    if not isinstance(workers, int) or workers <= 0:
+        raise ValueError(f"Expected workers to be a positive int, not {workers!r}")
+    if cache_dir is None and os.environ.get("DVDCSS_CACHE") == "off":
+        raise ValueError(
+            "The key cache is off (DVDCSS_CACHE=off), keys can't be shared."
+        )
+
+    target = os.fspath(target)
+    if sectors is None:
+        dvdcss = DvdCss()
+        try:
+            dvdcss.open(target, cache_dir)
+            names = dvdcss.get_index().key_sectors
+        finally:
+            dvdcss.close()
+    else:
+        names = {str(sector): sector for sector in sectors}
+    if not names:
+        return []
+
+    env = dvdcss_env(method, cache_dir=cache_dir)
+    with ProcessPoolExecutor(
+        max_workers=min(workers, len(names)),
+        # Spawn rather than fork, see RipFarm.
+        mp_context=multiprocessing.get_context("spawn"),
+        initializer=init_worker,
+        initargs=(env,),
+    ) as executor:
+        futures = [
+            (name, sector, executor.submit(_find_key, target, name, sector))
+            for name, sector in sorted(names.items(), key=lambda item: item[1])
+        ]
+        return [_result(name, sector, future) for name, sector, future in futures]
+
+
+def _result(name: str, sector: int, future: Future[TitleKeyResult]) -> TitleKeyResult:
+    exception = future.exception()
+    if exception is not None:
+        # The worker process itself died, e.g. it crashed inside libdvdcss.
+        return TitleKeyResult(
+            name=name, sector=sector, seconds=0.0, found=False, error=repr(exception)
+        )
+    return future.result()
+
+
+# State of a worker process. Each worker only ever reads from one target.
+_worker_dvdcss: DvdCss | None = None
+
+
+def _find_key(target: str, name: str, sector: int) -> TitleKeyResult:
+    global _worker_dvdcss
+
+    began = time.perf_counter()
+    try:
+        if _worker_dvdcss is None or _worker_dvdcss.handle is None:
+            _worker_dvdcss = DvdCss()
+            _worker_dvdcss.open(target)
+        dvdcss = _worker_dvdcss
+        try:
+            dvdcss.seek(sector, SeekFlag.SEEK_KEY)
+        except exceptions.SeekError:
+            found, error = False, dvdcss.error
+        else:
+            found, error = True, None
+    except Exception as e:
+        # Start afresh for the next title, the handle may be in a bad state.
+        if _worker_dvdcss is not None:
+            with suppress(Exception):
+                _worker_dvdcss.close()
+            _worker_dvdcss = None
+        found, error = False, repr(e)
+
+    return TitleKeyResult(
+        name=name,
+        sector=sector,
+        seconds=time.perf_counter() - began,
+        found=found,
+        error=error,
+    )
+
+
+__all__ = ("discover_keys",)
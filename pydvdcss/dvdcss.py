@@ -1,32 +1,39 @@
 from __future__ import annotations
 
 import os
+import queue
 import re
+import socket
+import threading
+import time
+from collections.abc import Callable, Iterable, Iterator
 from ctypes import (
-    CDLL,
-    POINTER,
     Array,
-    byref,
     c_char,
-    c_char_p,
-    c_int,
-    c_void_p,
     create_string_buffer,
+    sizeof,
 )
-from ctypes.util import find_library
-from pathlib import Path
-from typing import Any, Literal
+from functools import partial
+from typing import Any, BinaryIO, Literal
 
 from pydvdcss import constants, exceptions
-from pydvdcss._types import ReadFlag_T, SeekFlag_T
+from pydvdcss._types import ReadFlag_T, SeekFlag_T, WritableBuffer_T
+from pydvdcss.buffers import SectorBufferPool, aligned_buffer
+from pydvdcss.index import DiscIndex
+from pydvdcss.keys import TitleKeyResult
+from pydvdcss.library import load_library
+from pydvdcss.metrics import Instrumentation
+from pydvdcss.readv import ReadvPlan
+from pydvdcss.scrambling import scrambled_sectors
+from pydvdcss.sources import StreamSource
+from pydvdcss.streaming import AdaptiveChunkSize, CopyResult, Digests
 from pydvdcss.structs import (
     DvdCssStreamCb,
-    Iovec,
     ReadFlag,
     SeekFlag,
     iovecs,
 )
-from pydvdcss.utilities import message_with_error
+from pydvdcss.utilities import environ_override, message_with_error, write_all
 
 
 class DvdCss:
@@ -74,9 +81,32 @@ class DvdCss:
         special value "off" disables caching.
     """
 
-    def __init__(self) -> None:
+    def __init__(
+        self,
+        buffer_pool: SectorBufferPool | None = None,
+        instrumentation: Instrumentation | None = None,
+        backend: str | None = None,
+    ) -> None:
+        """
+        Parameters:
+            buffer_pool: A pool of sector-aligned buffers for read() to read into
+                instead of allocating a new buffer on every call. Reads larger than the
+                pool's buffers still allocate.
+            instrumentation: Record counters and latency histograms of this instance's
+                calls, see Instrumentation. Without it, calls are not timed at all.
+            backend: The binding to call libdvdcss with, "ctypes" or "cffi". Defaults
+                to the PYDVDCSS_BACKEND environment variable, or "ctypes". See
+                library.load_library().
+        """
         self.handle: int | None = None
-        self._library = self._load_library()
+        self.buffer_pool = buffer_pool
+        self._index: DiscIndex | None = None
+        # libdvdcss keeps a pointer to the stream callbacks, keep them for the handle.
+        self._stream_cb: DvdCssStreamCb | None = None
+        self._source: StreamSource | None = None
+        self._library = self._load_library(backend)
+        if instrumentation is not None:
+            instrumentation.attach(self)
 
     def __enter__(self) -> DvdCss:
         return self
@@ -84,7 +114,11 @@ class DvdCss:
     def __exit__(self, *_: Any, **__: Any) -> None:
         self.close()
 
-    def open(self, target: str | os.PathLike[str]) -> int:
+    def open(
+        self,
+        target: str | os.PathLike[str],
+        cache_dir: str | os.PathLike[str] | None = None,
+    ) -> int:
         """
         Open a DVD device or directory.
 
@@ -100,6 +134,9 @@ class DvdCss:
                 VOB/IFO structure directory. May be a string or any os.PathLike object,
                 such as a pathlib.Path. On Windows a drive may be given as "G:", "G:\\",
                 or "G:/"; the latter is normalised for you as libdvdcss rejects it.
+            cache_dir: Directory to cache title keys in for this disc, overriding the
+                DVDCSS_CACHE environment variable for this open only. See KeyCache to
+                manage the directory.
 
         Raises:
             OpenFailureError: Failure opening the disc or during post-initialization.
@@ -119,7 +156,11 @@ class DvdCss:
             # colon), so normalise it to "G:" to spare users a confusing open failure.
             target = target[:2]
 
-        self.handle = self._library.dvdcss_open(target.encode())
+        if cache_dir is None:
+            self.handle = self._library.dvdcss_open(target.encode())
+        else:
+            with environ_override({"DVDCSS_CACHE": os.fspath(cache_dir)}):
+                self.handle = self._library.dvdcss_open(target.encode())
         if self.handle is None:
             raise exceptions.OpenFailureError(
                 message_with_error(f"Failed to open '{target}'", self.error)
@@ -160,14 +201,43 @@ class DvdCss:
         if p_stream == 0:
             raise ValueError("p_stream must be a non-zero value, libdvdcss rejects 0.")
 
-        self.handle = self._library.dvdcss_open_stream(p_stream, byref(p_stream_cb))
+        self.handle = self._library.dvdcss_open_stream(p_stream, p_stream_cb)
         if self.handle is None:
             raise exceptions.OpenFailureError(
                 message_with_error(f"Failed to open '{p_stream_cb}'", self.error)
             )
 
+        self._stream_cb = p_stream_cb
         return self.handle
 
+    def open_source(self, source: StreamSource) -> int:
+        """
+        Open a DVD from a StreamSource, e.g. an ISO image read through a file object.
+
+        This is open_stream() with the callbacks already made, see FileStreamSource
+        and MmapStreamSource. The source is kept alive while the disc is open, and
+        closed when the disc is closed.
+
+        Parameters:
+            source: The source to read the disc from.
+
+        Raises:
+            OpenFailureError: Failure opening the disc or during post-initialization.
+            AlreadyInUseError: If you try to open a 2nd disc without first closing.
+
+        Returns a handle to be used for all subsequent libdvdcss calls.
+        """
+        try:
+            handle = self.open_stream(id(source), source.callbacks)
+        except exceptions.OpenFailureError as e:
+            if source.error is None:
+                raise
+            raise exceptions.OpenFailureError(
+                message_with_error(str(e), source.error)
+            ) from source.error
+        self._source = source
+        return handle
+
     def seek(self, sector: int, flag: SeekFlag_T = SeekFlag.Unset) -> int:
         """
         Seeks to a position in the DVD device or directory.
@@ -224,10 +294,15 @@ class DvdCss:
 
         return new_position
 
-    def read(self, sectors: int, flag: ReadFlag_T = ReadFlag.Unset) -> bytes:
+    def read(
+        self, sectors: int, flag: ReadFlag_T = ReadFlag.Unset, verify: bool = False
+    ) -> bytes:
         """
         Read from the DVD device or directory.
 
+        If the DvdCss was created with a buffer_pool, the read is done in one of its
+        aligned buffers when it's large enough.
+
         The flag is used to indicate when the library should decrypt VOB data with it's
         CSS title key.
 
@@ -238,15 +313,18 @@ class DvdCss:
         get the title keys necessary to descramble/decrypt CSS. This will NOT error
         if you read a scrambled VOB sector with no title key to descramble with.
         Generally, you should seek through the disc first to get the keys, then seek
-        back to the start and then begin reading.
+        back to the start and then begin reading. Use `verify` to check for that.
 
         Parameters:
             sectors: Number of logical blocks (2048*n) to read.
             flag: Reading Flag, used as described above.
+            verify: Check that no sector read is still scrambled, see
+                scrambled_sectors(). Use it with ReadFlag.READ_DECRYPT.
 
         Raises:
             NoDeviceError: No DVD device or directory is open yet.
             ReadError: Failure reading sectors, or returned data is less than expected.
+            ScrambledSectorError: With verify, sectors were read still scrambled.
 
         Returns the read logical blocks.
         """
@@ -265,20 +343,32 @@ class DvdCss:
                 f"Expected flag to be an int or ReadFlag enum, not {flag!r}"
             )
 
-        buffer = create_string_buffer(b"", sectors * constants.SECTOR_SIZE)
+        pool = self.buffer_pool
+        if pool is not None and sectors <= pool.sectors:
+            buffer = pool.acquire()
+        else:
+            pool = None
+            buffer = create_string_buffer(b"", sectors * constants.SECTOR_SIZE)
 
-        read_sectors = self._library.dvdcss_read(
-            self.handle, buffer, sectors, flag.value
-        )
-        if read_sectors < 0:
-            raise exceptions.ReadError(
-                message_with_error(
-                    f"Failed reading {sectors * constants.SECTOR_SIZE} bytes",
-                    self.error,
-                )
+        try:
+            read_sectors = self._library.dvdcss_read(
+                self.handle, buffer, sectors, flag.value
             )
+            if read_sectors < 0:
+                raise exceptions.ReadError(
+                    message_with_error(
+                        f"Failed reading {sectors * constants.SECTOR_SIZE} bytes",
+                        self.error,
+                    )
+                )
+
+            # Only copy out what was read, a pooled buffer may be larger and hold
+            # stale data past that point.
+            data = bytes(memoryview(buffer)[: read_sectors * constants.SECTOR_SIZE])
+        finally:
+            if pool is not None:
+                pool.release(buffer)
 
-        data = buffer.raw[: read_sectors * constants.SECTOR_SIZE]
         expected_size = sectors * constants.SECTOR_SIZE
         read_size = len(data)
         if read_size != expected_size:
@@ -286,9 +376,103 @@ class DvdCss:
                 f"Read {read_size} bytes, expected {expected_size}"
             )
 
+        if verify:
+            _raise_if_scrambled(scrambled_sectors(data))
+
         return data
 
-    def readv(self, *buffers: Array[c_char], flag: ReadFlag_T = ReadFlag.Unset) -> int:
+    def read_into(
+        self,
+        buffer: WritableBuffer_T,
+        flag: ReadFlag_T = ReadFlag.Unset,
+        verify: bool = False,
+    ) -> int:
+        """
+        Read from the DVD device or directory directly into a caller-owned buffer.
+
+        This is a zero-copy variant of read(). libdvdcss reads (and decrypts, if asked)
+        straight into the memory of `buffer`, no intermediate buffer or bytes object
+        is created. Reuse the same buffer across calls to avoid any allocations.
+
+        The number of sectors read is taken from the size of the buffer, so pass a
+        memoryview slice to read fewer sectors into a larger buffer.
+
+        You must seek to the start of each title and/or through VOB data sectors to
+        get the title keys necessary to descramble/decrypt CSS. This will NOT error
+        if you read a scrambled VOB sector with no title key to descramble with.
+
+        Parameters:
+            buffer: Any writable, C-contiguous buffer-protocol object, e.g. a bytearray,
+                memoryview, mmap, ctypes array, or numpy array. Its size in bytes must
+                be a non-zero multiple of a sector (2048 bytes).
+            flag: Reading Flag. Use ReadFlag.READ_DECRYPT to decrypt scrambled VOB data
+                sectors as they are read. Otherwise, use ReadFlag.Unset.
+            verify: Check that no sector read is still scrambled, see
+                scrambled_sectors(). Use it with ReadFlag.READ_DECRYPT.
+
+        Raises:
+            NoDeviceError: No DVD device or directory is open yet.
+            TypeError: The buffer is read-only or not a buffer-protocol object.
+            ValueError: The buffer is not contiguous or not a non-zero sector multiple.
+            ReadError: Failure reading sectors, or fewer sectors were read than fit
+                in the buffer.
+            ScrambledSectorError: With verify, sectors were read still scrambled.
+
+        Returns the number of logical blocks (sectors) read into the buffer.
+        """
+        if self.handle is None:
+            raise exceptions.NoDeviceError(
+                "No DVD device or directory is open yet, use open() first."
+            )
+
+        view = memoryview(buffer)
+        if view.readonly:
+            raise TypeError(f"Expected a writable buffer, not {type(buffer)!r}")
+        if not view.c_contiguous:
+            raise ValueError("Expected a C-contiguous buffer.")
+
+        size = view.nbytes
+        if size == 0 or size % constants.SECTOR_SIZE != 0:
+            raise ValueError(
+                f"The buffer must be a non-zero multiple of a sector "
+                f"({constants.SECTOR_SIZE} bytes), got one of {size} bytes"
+            )
+
+        if isinstance(flag, int):
+            flag = ReadFlag(flag)
+        elif not isinstance(flag, ReadFlag):
+            raise TypeError(
+                f"Expected flag to be an int or ReadFlag enum, not {flag!r}"
+            )
+
+        sectors = size // constants.SECTOR_SIZE
+        # Map a c_char array over the caller's memory so dvdcss_read writes into it.
+        target = (c_char * size).from_buffer(view.cast("B"))
+
+        read_sectors = self._library.dvdcss_read(
+            self.handle, target, sectors, flag.value
+        )
+        if read_sectors < 0:
+            raise exceptions.ReadError(
+                message_with_error(f"Failed reading {size} bytes", self.error)
+            )
+
+        if read_sectors != sectors:
+            raise exceptions.ReadError(
+                f"Read {read_sectors * constants.SECTOR_SIZE} bytes, expected {size}"
+            )
+
+        if verify:
+            _raise_if_scrambled(scrambled_sectors(view))
+
+        return read_sectors
+
+    def readv(
+        self,
+        *buffers: Array[c_char],
+        flag: ReadFlag_T = ReadFlag.Unset,
+        verify: bool = False,
+    ) -> int:
         """
         Read from the DVD device or directory into multiple buffers (vectored read).
 
@@ -301,10 +485,14 @@ class DvdCss:
         Parameters:
             buffers: One or more buffers to read into. Each buffer's length must be a
                 non-zero multiple of a sector (2048 bytes); create them with e.g.
-                create_string_buffer(b"", 2048). On success each buffer is filled with
-                consecutive sectors, readable from its `raw` property.
+                create_string_buffer(b"", 2048), or take sector-aligned ones from a
+                SectorBufferPool. On success each buffer is filled with consecutive
+                sectors, readable from its `raw` property.
             flag: Reading Flag. Use ReadFlag.READ_DECRYPT to decrypt scrambled VOB data
                 sectors as they are read. Otherwise, use ReadFlag.Unset.
+            verify: Check that no sector read is still scrambled, see
+                scrambled_sectors(). Sectors are counted across the buffers in order.
+                Use it with ReadFlag.READ_DECRYPT.
 
         Note: The returned count is libdvdcss's own return value. On Windows libdvdcss
         reports only the first buffer's block count rather than the total, so do not
@@ -315,6 +503,7 @@ class DvdCss:
             NoDeviceError: No DVD device or directory is open yet.
             ValueError: No buffers given, or a buffer is not a non-zero sector multiple.
             ReadError: libdvdcss reported a read failure.
+            ScrambledSectorError: With verify, sectors were read still scrambled.
 
         Returns the number of logical blocks (sectors) libdvdcss reported reading.
         """
@@ -360,8 +549,438 @@ class DvdCss:
                 message_with_error("Failed reading sectors", self.error)
             )
 
+        if verify:
+            scrambled = []
+            first = 0
+            for buffer in buffers:
+                scrambled += [first + index for index in scrambled_sectors(buffer)]
+                first += len(buffer) // constants.SECTOR_SIZE
+            _raise_if_scrambled(scrambled)
+
         return read_sectors
 
+    def read_plan(self, plan: ReadvPlan, verify: bool = False) -> int:
+        """
+        Read into the buffers of a ReadvPlan (vectored read), without checking them.
+
+        Like readv(), but the buffers were already validated and the iovec array built
+        when the plan was made, so each call only crosses into libdvdcss. Use it for
+        many small vectored reads into the same buffers.
+
+        Parameters:
+            plan: The ReadvPlan to read into.
+            verify: Check that no sector read is still scrambled, see
+                scrambled_sectors(). Sectors are counted across the buffers in order.
+                Use it with ReadFlag.READ_DECRYPT.
+
+        Raises:
+            NoDeviceError: No DVD device or directory is open yet.
+            ReadError: libdvdcss reported a read failure.
+            ScrambledSectorError: With verify, sectors were read still scrambled.
+
+        Returns the total number of sectors read into the buffers. Unlike readv(), this
+        is the total on every platform: on Windows, where libdvdcss reports only the
+        first buffer's count, it is the plan's total once the read succeeded.
+        """
+        if self.handle is None:
+            raise exceptions.NoDeviceError(
+                "No DVD device or directory is open yet, use open() first."
+            )
+
+        read_sectors = self._library.dvdcss_readv(
+            self.handle, plan.iovecs, plan.count, plan.flag_value
+        )
+        if read_sectors < 0:
+            raise exceptions.ReadError(
+                message_with_error("Failed reading sectors", self.error)
+            )
+        if os.name == "nt":
+            read_sectors = plan.sectors
+
+        if verify:
+            scrambled = []
+            first = 0
+            for buffer in plan.buffers:
+                scrambled += [first + index for index in scrambled_sectors(buffer)]
+                first += sizeof(buffer) // constants.SECTOR_SIZE
+            _raise_if_scrambled(scrambled)
+
+        return read_sectors
+
+    def seek_unchecked(self, sector: int, flag: int = 0) -> int:
+        """
+        Seek with no checks at all, for tight loops where seek()'s checks show up.
+
+        The arguments are passed to libdvdcss as-is: the handle must be open, and the
+        sector and flag must be ints (use SeekFlag.SEEK_KEY.value rather than the enum).
+        Nothing is raised on failure and the call is not recorded by Instrumentation.
+
+        Returns libdvdcss's result, the new position or a negative value on failure.
+        """
+        return int(self._library.dvdcss_seek(self.handle, sector, flag))
+
+    def read_unchecked(self, buffer: Array[c_char], sectors: int, flag: int = 0) -> int:
+        """
+        Read into a buffer with no checks at all, for tight loops where read_into()'s
+        checks show up.
+
+        The arguments are passed to libdvdcss as-is: the handle must be open, the buffer
+        must be a ctypes char array of at least `sectors` * 2048 bytes, e.g. from
+        aligned_buffer() or a SectorBufferPool, and the flag must be an int (use
+        ReadFlag.READ_DECRYPT.value rather than the enum). A buffer that is too small
+        is overrun. Nothing is raised on failure, short reads included, and the call is
+        not recorded by Instrumentation.
+
+        Returns libdvdcss's result, the number of sectors read or a negative value on
+        failure.
+        """
+        return int(self._library.dvdcss_read(self.handle, buffer, sectors, flag))
+
+    def iter_sectors(
+        self,
+        start: int,
+        count: int,
+        chunk: int | None = None,
+        flag: ReadFlag_T = ReadFlag.Unset,
+        seek_flag: SeekFlag_T = SeekFlag.Unset,
+        max_chunk: int = 512,
+        buffers: int = 2,
+        verify: bool = False,
+    ) -> Iterator[memoryview]:
+        """
+        Stream a range of sectors in chunks, reusing a small set of buffers.
+
+        Memory use is bounded by `buffers` buffers of `chunk` (or `max_chunk`) sectors
+        however large the range is. Each yielded memoryview is only valid until the
+        generator has been advanced `buffers - 1` more times, after which its buffer
+        is read into again. Copy it (e.g. bytes(view)) if you need to keep it longer.
+
+        Only the first chunk seeks, to `start` with `seek_flag`. Later chunks carry on
+        from where the previous read ended, so a SEEK_KEY is done once for the range
+        rather than once per chunk. Every chunk is read with `flag`. As a title key
+        is only obtained on a seek, a decrypting range should stay within one title.
+
+        Parameters:
+            start: Sector to start reading from.
+            count: Number of sectors to read.
+            chunk: Number of sectors to read at once. When not set, the chunk size
+                is tuned from the latency of each read, up to `max_chunk` sectors.
+            flag: Reading Flag, used for every chunk. See read().
+            seek_flag: Seeking Flag, used for the seek to `start`. See seek().
+            max_chunk: Largest number of sectors to read at once when tuning the
+                chunk size. Ignored if `chunk` is set.
+            buffers: Number of buffers to cycle through, at least 1.
+            verify: Check that no sector read is still scrambled, see
+                scrambled_sectors(). Use it with ReadFlag.READ_DECRYPT.
+
+        Raises:
+            NoDeviceError: No DVD device or directory is open yet.
+            ValueError: Invalid count, chunk, max_chunk, or buffers.
+            SeekError: Failure seeking to the start sector.
+            ReadError: Failure reading sectors, or returned data is less than expected.
+            ScrambledSectorError: With verify, sectors were read still scrambled. The
+                sectors are given as sector numbers rather than indices.
+
+        Yields a memoryview of the sectors read for each chunk, in order.
+        """
+        if self.handle is None:
+            raise exceptions.NoDeviceError(
+                "No DVD device or directory is open yet, use open() first."
+            )
+
+        if not isinstance(count, int) or count < 0:
+            raise ValueError(f"Expected count to be a non-negative int, not {count!r}")
+        if chunk is not None and (not isinstance(chunk, int) or chunk <= 0):
+            raise ValueError(f"Expected chunk to be a positive int, not {chunk!r}")
+        if not isinstance(max_chunk, int) or max_chunk <= 0:
+            raise ValueError(
+                f"Expected max_chunk to be a positive int, not {max_chunk!r}"
+            )
+        if not isinstance(buffers, int) or buffers <= 0:
+            raise ValueError(f"Expected buffers to be a positive int, not {buffers!r}")
+
+        sizer = None if chunk else AdaptiveChunkSize(maximum=max_chunk)
+        chunk_size = chunk or max_chunk
+
+        # Prefer the shared pool's buffers when they are large enough, so a stream's
+        # buffers are recycled across calls as well as within one.
+        pool = self.buffer_pool
+        if pool is not None and pool.sectors < chunk_size:
+            pool = None
+        ring = [
+            pool.acquire()
+            if pool
+            else aligned_buffer(chunk_size * constants.SECTOR_SIZE)
+            for _ in range(buffers)
+        ]
+
+        try:
+            self.seek(start, seek_flag)
+            views = [memoryview(buffer).cast("B") for buffer in ring]
+            remaining = count
+            index = 0
+            while remaining:
+                sectors = min(sizer.value if sizer else chunk_size, remaining)
+                view = views[index][: sectors * constants.SECTOR_SIZE]
+
+                began = time.perf_counter()
+                self.read_into(view, flag)
+                if sizer:
+                    sizer.update(sectors, time.perf_counter() - began)
+                if verify:
+                    position = start + count - remaining
+                    _raise_if_scrambled(
+                        [position + index for index in scrambled_sectors(view)]
+                    )
+
+                yield view
+                remaining -= sectors
+                index = (index + 1) % buffers
+        finally:
+            if pool:
+                for buffer in ring:
+                    pool.release(buffer)
+
+    def copy_range(
+        self,
+        start: int,
+        count: int,
+        dst: BinaryIO | socket.socket,
+        chunk: int = 512,
+        flag: ReadFlag_T = ReadFlag.Unset,
+        seek_flag: SeekFlag_T = SeekFlag.Unset,
+        depth: int = 4,
+        cancel: threading.Event | None = None,
+        progress: Callable[[int], object] | None = None,
+        verify: bool = False,
+        hashes: Iterable[str] | Digests = (),
+    ) -> CopyResult:
+        """
+        Copy a range of sectors to a file or socket, reading and writing concurrently.
+
+        A background thread reads chunks into a fixed set of `depth` buffers while the
+        calling thread writes the filled ones out. ctypes releases the GIL while
+        libdvdcss reads and descrambles, so drive reads overlap with the writes instead
+        of taking turns with them. Memory use is bounded by the `depth` buffers.
+
+        With `hashes`, each written buffer is hashed on a third thread before it goes
+        back to the reader, so archival checksums need no second pass over the disc and
+        hashing overlaps with both reading and writing.
+
+        Seeking and reading is done as in iter_sectors(): one seek to `start` with
+        `seek_flag`, then every chunk is read with `flag`. Do not use this DvdCss from
+        other threads while a copy is running.
+
+        Parameters:
+            start: Sector to start copying from.
+            count: Number of sectors to copy.
+            dst: A binary file object opened for writing, or a connected socket.
+            chunk: Number of sectors to read at once.
+            flag: Reading Flag, used for every chunk. See read().
+            seek_flag: Seeking Flag, used for the seek to `start`. See seek().
+            depth: Number of buffers in flight between the reader and the writer.
+            cancel: An event that stops the copy once set. Any chunk already being
+                read is finished but not written.
+            progress: Called with the total number of sectors copied so far after
+                each chunk is written.
+            verify: Check that no sector read is still scrambled before it's written,
+                see scrambled_sectors(). Use it with ReadFlag.READ_DECRYPT.
+            hashes: Hash algorithms to digest the copied data with, e.g. ["md5",
+                "sha1", "crc32"], see Digests. A Digests may be given instead to carry
+                on hashing data that came before the range.
+
+        Raises:
+            NoDeviceError: No DVD device or directory is open yet.
+            ValueError: Invalid count, chunk, or depth, or an unsupported hash.
+            SeekError: Failure seeking to the start sector.
+            ReadError: Failure reading sectors, or returned data is less than expected.
+            ScrambledSectorError: With verify, sectors were read still scrambled. The
+                sectors are given as sector numbers rather than indices.
+            OSError: Failure writing to the destination.
+
+        Returns a CopyResult with the number of sectors copied, the time taken,
+        whether it was cancelled, and the digests.
+        """
+        if self.handle is None:
+            raise exceptions.NoDeviceError(
+                "No DVD device or directory is open yet, use open() first."
+            )
+
+        if not isinstance(count, int) or count < 0:
+            raise ValueError(f"Expected count to be a non-negative int, not {count!r}")
+        if not isinstance(chunk, int) or chunk <= 0:
+            raise ValueError(f"Expected chunk to be a positive int, not {chunk!r}")
+        if not isinstance(depth, int) or depth <= 0:
+            raise ValueError(f"Expected depth to be a positive int, not {depth!r}")
+
+        digests = hashes if isinstance(hashes, Digests) else Digests(hashes)
+
+        if isinstance(dst, socket.socket):
+            write: Callable[[memoryview], object] = dst.sendall
+        else:
+            write = partial(write_all, dst)
+
+        pool = self.buffer_pool
+        if pool is not None and pool.sectors < chunk:
+            pool = None
+        ring = [
+            pool.acquire() if pool else aligned_buffer(chunk * constants.SECTOR_SIZE)
+            for _ in range(depth)
+        ]
+
+        # Buffers go round in a loop: the reader takes one from `free` and fills it, the
+        # writer takes it from `filled`, writes it, and puts it back in `free`, or with
+        # hashes passes it through `written` to the hasher which does. None in `free`
+        # tells the reader to stop, None in `filled` means that it has stopped, and None
+        # in `written` tells the hasher to stop.
+        free: queue.Queue[memoryview | None] = queue.Queue()
+        filled: queue.Queue[tuple[memoryview, int] | BaseException | None]
+        filled = queue.Queue()
+        written: queue.Queue[tuple[memoryview, int] | None] = queue.Queue()
+        for buffer in ring:
+            free.put(memoryview(buffer).cast("B"))
+
+        def reader() -> None:
+            try:
+                self.seek(start, seek_flag)
+                remaining = count
+                while remaining:
+                    view = free.get()
+                    if view is None or (cancel and cancel.is_set()):
+                        break
+                    sectors = min(chunk, remaining)
+                    data = view[: sectors * constants.SECTOR_SIZE]
+                    self.read_into(data, flag)
+                    if verify:
+                        position = start + count - remaining
+                        _raise_if_scrambled(
+                            [position + index for index in scrambled_sectors(data)]
+                        )
+                    filled.put((view, sectors))
+                    remaining -= sectors
+            except BaseException as e:
+                filled.put(e)
+            finally:
+                filled.put(None)
+
+        hash_error: list[BaseException] = []
+
+        def hasher() -> None:
+            while True:
+                item = written.get()
+                if item is None:
+                    break
+                view, sectors = item
+                if not hash_error:
+                    try:
+                        digests.update(view[: sectors * constants.SECTOR_SIZE])
+                    except BaseException as e:
+                        hash_error.append(e)
+                free.put(view)
+
+        began = time.perf_counter()
+        copied = 0
+        thread = threading.Thread(target=reader, name="pydvdcss-copy-reader")
+        thread.start()
+        hash_thread = None
+        if digests:
+            hash_thread = threading.Thread(target=hasher, name="pydvdcss-copy-hasher")
+            hash_thread.start()
+        try:
+            while True:
+                item = filled.get()
+                if item is None:
+                    break
+                if isinstance(item, BaseException):
+                    raise item
+                if cancel and cancel.is_set():
+                    break
+                view, sectors = item
+                write(view[: sectors * constants.SECTOR_SIZE])
+                copied += sectors
+                if hash_thread:
+                    written.put((view, sectors))
+                else:
+                    free.put(view)
+                if progress:
+                    progress(copied)
+        finally:
+            free.put(None)
+            if hash_thread:
+                written.put(None)
+                hash_thread.join()
+            thread.join()
+            if pool:
+                for buffer in ring:
+                    pool.release(buffer)
+        if hash_error:
+            raise hash_error[0]
+
+        return CopyResult(
+            sectors=copied,
+            seconds=time.perf_counter() - began,
+            cancelled=copied < count,
+            digests=digests.hexdigests(),
+        )
+
+    def prewarm_keys(
+        self, sectors: Iterable[int] | None = None
+    ) -> list[TitleKeyResult]:
+        """
+        Obtain the CSS title key of every title up front, one SEEK_KEY per title.
+
+        By default the title start sectors are taken from the disc's index, see
+        get_index() and DiscIndex.key_sectors: the first sector of VIDEO_TS.VOB, and of
+        each title set's menu VOB (VTS_xx_0.VOB) and title VOBs (VTS_xx_1.VOB). These
+        are the sectors libdvdread obtains keys at.
+
+        libdvdcss keeps every key it obtained for as long as the disc is open, so
+        afterwards seek with SeekFlag.SEEK_MPEG when moving into a different title,
+        or SeekFlag.Unset within one, without the cost of deriving a key mid-rip.
+
+        Parameters:
+            sectors: Sectors to obtain a title key at, instead of taking them from
+                the disc's index.
+
+        Raises:
+            NoDeviceError: No DVD device or directory is open yet.
+            ValueError: Without sectors, the disc has no valid UDF file system.
+            FileNotFoundError: Without sectors, the disc has no VIDEO_TS IFOs.
+
+        Returns a TitleKeyResult for each sector, in sector order, with how long it took
+        and whether the key was found.
+        """
+        if self.handle is None:
+            raise exceptions.NoDeviceError(
+                "No DVD device or directory is open yet, use open() first."
+            )
+
+        if sectors is None:
+            names = self.get_index().key_sectors
+        else:
+            names = {str(sector): sector for sector in sectors}
+
+        results = []
+        for name, sector in sorted(names.items(), key=lambda item: item[1]):
+            began = time.perf_counter()
+            try:
+                self.seek(sector, SeekFlag.SEEK_KEY)
+            except exceptions.SeekError:
+                found, error = False, self.error
+            else:
+                found, error = True, None
+            results.append(
+                TitleKeyResult(
+                    name=name,
+                    sector=sector,
+                    seconds=time.perf_counter() - began,
+                    found=found,
+                    error=error,
+                )
+            )
+
+        return results
+
     def close(self) -> bool:
         """
         Close the DVD by freeing the dvdcss memory and handle of the block device.
@@ -381,6 +1000,11 @@ class DvdCss:
             ret = self._library.dvdcss_close(self.handle)
             if ret == 0:
                 self.handle = None
+                self._index = None
+                self._stream_cb = None
+                if self._source is not None:
+                    self._source.close()
+                    self._source = None
                 return True
             else:
                 raise exceptions.CloseError(
@@ -414,6 +1038,59 @@ class DvdCss:
             return False
         return self._library.dvdcss_is_scrambled(self.handle) == 1
 
+    def get_index(
+        self, cache_dir: str | os.PathLike[str] | None = None, refresh: bool = False
+    ) -> DiscIndex:
+        """
+        Get an index of the open disc's files and titles to the sectors they're at.
+
+        The index is built by walking the disc's UDF file system and parsing its IFOs,
+        then kept until the disc is closed. See DiscIndex for how to use it.
+
+        Parameters:
+            cache_dir: A directory to cache indexes in, keyed by disc fingerprint, so
+                a disc seen before doesn't need its file system walked again.
+            refresh: Build the index again even if one is kept already.
+
+        Raises:
+            NoDeviceError: No DVD device or directory is open yet.
+            ValueError: The disc has no valid UDF file system or IFOs.
+            FileNotFoundError: The disc has no VIDEO_TS directory or IFO.
+
+        Returns the index of the open disc.
+        """
+        if self.handle is None:
+            raise exceptions.NoDeviceError(
+                "No DVD device or directory is open yet, use open() first."
+            )
+
+        if self._index is None or refresh:
+            self._index = DiscIndex.build(self.read_sectors, cache_dir)
+
+        return self._index
+
+    def read_sectors(self, sector: int, count: int) -> bytes:
+        """
+        Seek to and read sectors without descrambling, e.g. of the file system.
+
+        It's a SectorReader, so it can be given to UdfReader, DiscIndex.build(), or
+        disc_fingerprint() to read the open disc. The seek is made without a flag, so
+        no title key is obtained, and it moves the current position like seek() does.
+
+        Parameters:
+            sector: Position in logical blocks (2048*n) to seek to.
+            count: Number of sectors to read.
+
+        Raises:
+            NoDeviceError: No DVD device or directory is open yet.
+            SeekError: Failure seeking to the specific logical block.
+            ReadError: Failure reading sectors, or returned data is less than expected.
+
+        Returns the bytes read.
+        """
+        self.seek(sector)
+        return self.read(count)
+
     @staticmethod
     def set_verbosity(verbosity: int = 0) -> int:
         """
@@ -471,57 +1148,18 @@ class DvdCss:
         return os.environ["DVDCSS_METHOD"]
 
     @staticmethod
-    def _load_library() -> CDLL:
-        """Load the libdvdcss DLL/SO/dylib via ctypes if it can be located.
-
-        Search order: a copy bundled inside the package (shipped in the platform
-        wheels), a copy next to the project root (handy during development), then a
-        system-installed library via ctypes.util.find_library.
-        """
-        package_dir = Path(__file__).parent
-        local_roots = (package_dir, package_dir.parent)
-        suffixes = (".dll", ".so", ".dylib")
-
-        lib_name = next(
-            (
-                str(candidate)
-                for root in local_roots
-                for name in constants.LIBRARY_NAMES
-                for suffix in suffixes
-                if (candidate := (root / name).with_suffix(suffix)).exists()
-            ),
-            None,
+    def _load_library(backend: str | None = None) -> Any:
+        """Get the process-wide libdvdcss library, see library.load_library()."""
+        return load_library(backend)
+
+
+def _raise_if_scrambled(scrambled: list[int]) -> None:
+    if scrambled:
+        shown = ", ".join(map(str, scrambled[:8]))
+        if len(scrambled) > 8:
+            shown += ", ..."
+        raise exceptions.ScrambledSectorError(
+            f"Read {len(scrambled)} sectors still scrambled ({shown}), the title key "
+            f"may be missing",
+            scrambled,
         )
-        if not lib_name:
-            for name in constants.LIBRARY_NAMES:
-                lib_name = find_library(name)
-                if lib_name:
-                    break
-
-        if not lib_name:
-            raise exceptions.LibraryNotFoundError(
-                "Unable to locate the libdvdcss library. "
-                "PyDvdCss cannot install this for you.\n\n" + constants.INSTALL_HELP
-            )
-
-        lib = CDLL(lib_name)
-        dvdcss_t = c_void_p
-
-        lib.dvdcss_open.argtypes = [c_char_p]
-        lib.dvdcss_open.restype = dvdcss_t
-        lib.dvdcss_open_stream.argtypes = [dvdcss_t, POINTER(DvdCssStreamCb)]
-        lib.dvdcss_open_stream.restype = dvdcss_t
-        lib.dvdcss_close.argtypes = [dvdcss_t]
-        lib.dvdcss_close.restype = c_int
-        lib.dvdcss_seek.argtypes = [dvdcss_t, c_int, c_int]
-        lib.dvdcss_seek.restype = c_int
-        lib.dvdcss_read.argtypes = [dvdcss_t, c_char_p, c_int, c_int]
-        lib.dvdcss_read.restype = c_int
-        lib.dvdcss_readv.argtypes = [dvdcss_t, POINTER(Iovec), c_int, c_int]
-        lib.dvdcss_readv.restype = c_int
-        lib.dvdcss_error.argtypes = [dvdcss_t]
-        lib.dvdcss_error.restype = c_char_p
-        lib.dvdcss_is_scrambled.argtypes = [dvdcss_t]
-        lib.dvdcss_is_scrambled.restype = c_int
-
-        return lib
@@ -1,3 +1,6 @@
+from __future__ import annotations
+
+
 class PyDvdCssError(Exception):
     """Base exception for the pydvdcss project."""
 
@@ -28,3 +31,16 @@ class SeekError(PyDvdCssError):
 
 class ReadError(PyDvdCssError):
     """Failed to read at a specific position on the DVD device or directory."""
+
+
+class ScrambledSectorError(ReadError):
+    """Sectors were read still scrambled, e.g. as their title key was not obtained."""
+
+    def __init__(self, message: str, sectors: list[int]) -> None:
+        super().__init__(message)
+        self.sectors = sectors
+        """Index of each scrambled sector from the start of the read, in order."""
+
+    def __reduce__(self) -> tuple[type[ScrambledSectorError], tuple[str, list[int]]]:
+        # Keep the sectors when pickled, e.g. when raised in a worker process.
+        return type(self), (str(self), self.sectors)
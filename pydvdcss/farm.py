@@ -0,0 +1,297 @@
+from __future__ import annotations
+
+import multiprocessing
+import os
+import threading
+import time
+from collections.abc import Iterable, Mapping
+from concurrent.futures import Future, ProcessPoolExecutor, wait
+from contextlib import suppress
+from dataclasses import dataclass, field, replace
+from functools import partial
+from typing import Any, Literal
+
+from pydvdcss import constants
+from pydvdcss.dvdcss import DvdCss
+from pydvdcss.structs import ReadFlag, SeekFlag
+from pydvdcss.utilities import dvdcss_env, init_worker
+
+
+@dataclass(frozen=True)
+class RipJob:
+    """A range of sectors to copy from a target to an output file."""
+
+    target: str
+    """A block device, ISO image file, or VOB/IFO structure directory to read from."""
+    output: str
+    """Path of the file to write the sectors to. It is created or overwritten."""
+    start: int = 0
+    """Sector to start copying from."""
+    count: int | None = None
+    """Number of sectors to copy. Defaults to the rest of an ISO image file."""
+    flag: int = ReadFlag.Unset.value
+    """Reading Flag value, used for every chunk. See DvdCss.read()."""
+    seek_flag: int = SeekFlag.Unset.value
+    """Seeking Flag value, used for the seek to `start`. See DvdCss.seek()."""
+    chunk: int = 512
+    """Number of sectors to read at once."""
+    hashes: tuple[str, ...] = ()
+    """Hash algorithms to digest the copied data with while copying, see Digests."""
+
+
+@dataclass(frozen=True)
+class RipResult:
+    """The outcome of a RipJob."""
+
+    job: RipJob
+    sectors: int
+    """Number of sectors copied."""
+    seconds: float
+    """Time the job took in seconds, including opening the target if needed."""
+    error: str | None = None
+    """The exception that failed the job, if it failed."""
+    digests: Mapping[str, str] = field(default_factory=dict)
+    """Hex digest of the copied data by each of the job's hash algorithms."""
+
+    @property
+    def ok(self) -> bool:
+        """Whether the job copied the whole range."""
+        return self.error is None
+
+
+@dataclass
+class DriveStats:
+    """Running totals of the jobs a RipFarm ran on one target."""
+
+    target: str
+    jobs: int = 0
+    """Number of jobs that finished, successfully or not."""
+    failures: int = 0
+    """Number of jobs that failed."""
+    sectors: int = 0
+    """Number of sectors copied by successful jobs."""
+    seconds: float = 0.0
+    """Time spent running jobs, successfully or not."""
+    errors: list[str] = field(default_factory=list)
+    """The error of each failed job, in order."""
+
+    @property
+    def throughput(self) -> float:
+        """Average bytes copied per second spent running jobs."""
+        if not self.seconds:
+            return 0.0
+        return self.sectors * constants.SECTOR_SIZE / self.seconds
+
+
+class RipFarm:
+    """
+    Run rip jobs across many targets in parallel, each in its own worker process.
+
+    libdvdcss reads its settings (DVDCSS_METHOD, DVDCSS_VERBOSE, DVDCSS_CACHE) from the
+    process environment when a disc is opened, so DvdCss.set_cracking_mode() and
+    DvdCss.set_verbosity() apply to a whole process. Giving each target a worker
+    process of its own lets every drive have its own settings, and lets the drives
+    run in parallel instead of one disc per Python process.
+
+    Jobs for the same target run one at a time in the order they were submitted, and
+    the worker keeps the target open between jobs so keys aren't obtained again. Jobs
+    for different targets run at the same time. Sectors are written straight to each
+    job's output file by the worker, only the results come back to this process.
+
+        with RipFarm(method="disc") as farm:
+            farm.add_drive("/dev/sr1", method="title")
+            results = farm.run([
+                RipJob("/dev/sr0", "disc0.iso", count=2_295_104),
+                RipJob("/dev/sr1", "disc1.iso", count=2_295_104),
+            ])
+            print(farm.stats)
+    """
+
+    def __init__(
+        self,
+        method: Literal["title", "disc", "key"] | None = None,
+        verbosity: int | None = None,
+        cache_dir: str | os.PathLike[str] | None = None,
+    ) -> None:
+        """
+        Parameters:
+            method: DVDCSS_METHOD for every worker, see DvdCss.set_cracking_mode().
+            verbosity: DVDCSS_VERBOSE for every worker, see DvdCss.set_verbosity().
+            cache_dir: DVDCSS_CACHE for every worker, see DvdCss.
+        """
+        self.env = dvdcss_env(method, verbosity, cache_dir)
+        self._workers: dict[str, ProcessPoolExecutor] = {}
+        self._stats: dict[str, DriveStats] = {}
+        self._lock = threading.Lock()
+        self._shutdown = False
+        # Spawn rather than fork so workers never inherit another thread's state, or
+        # an already loaded libdvdcss, from this process.
+        self._context = multiprocessing.get_context("spawn")
+
+    def __enter__(self) -> RipFarm:
+        return self
+
+    def __exit__(self, *_: Any, **__: Any) -> None:
+        self.shutdown()
+
+    def add_drive(
+        self,
+        target: str,
+        method: Literal["title", "disc", "key"] | None = None,
+        verbosity: int | None = None,
+        cache_dir: str | os.PathLike[str] | None = None,
+    ) -> None:
+        """
+        Start a worker process for a target, with its own libdvdcss settings.
+
+        Targets that jobs are submitted for are added automatically with the farm's
+        settings, so this is only needed to override them for a target.
+
+        Parameters:
+            target: A block device, ISO image file, or VOB/IFO structure directory.
+            method: DVDCSS_METHOD for this target, overriding the farm's.
+            verbosity: DVDCSS_VERBOSE for this target, overriding the farm's.
+            cache_dir: DVDCSS_CACHE for this target, overriding the farm's.
+
+        Raises:
+            ValueError: A worker was already started for this target.
+            RuntimeError: The farm was shut down.
+        """
+        with self._lock:
+            self._check_running()
+            if target in self._workers:
+                raise ValueError(f"A worker was already started for '{target}'.")
+            self._start(
+                target, {**self.env, **dvdcss_env(method, verbosity, cache_dir)}
+            )
+
+    def submit(self, job: RipJob) -> Future[RipResult]:
+        """
+        Queue a job on the worker of its target.
+
+        The future does not raise for a failed job, check RipResult.ok instead. It only
+        raises if the worker process itself died, e.g. BrokenProcessPool.
+
+        Raises:
+            RuntimeError: The farm was shut down.
+        """
+        with self._lock:
+            self._check_running()
+            worker = self._workers.get(job.target) or self._start(job.target, self.env)
+            future = worker.submit(_run_job, job)
+        # Outside the lock, as a job that already finished records itself right away.
+        future.add_done_callback(partial(self._record, job))
+        return future
+
+    def run(self, jobs: Iterable[RipJob]) -> list[RipResult]:
+        """Submit all jobs and wait for them to finish. Returns results in job order."""
+        futures = [self.submit(job) for job in jobs]
+        wait(futures)
+        return [future.result() for future in futures]
+
+    @property
+    def stats(self) -> dict[str, DriveStats]:
+        """Running totals for each target, keyed by target."""
+        with self._lock:
+            return {
+                target: replace(stats, errors=list(stats.errors))
+                for target, stats in self._stats.items()
+            }
+
+    def shutdown(self, wait: bool = True) -> None:
+        """
+        Stop all worker processes, closing their targets.
+
+        No more jobs can be submitted afterwards. The stats are kept.
+        """
+        with self._lock:
+            self._shutdown = True
+            workers = list(self._workers.values())
+            self._workers.clear()
+        for worker in workers:
+            worker.shutdown(wait=wait, cancel_futures=not wait)
+
+    def _check_running(self) -> None:
+        # Called with the lock held.
+        if self._shutdown:
+            raise RuntimeError("Cannot schedule new jobs after shutdown.")
+
+    def _start(self, target: str, env: Mapping[str, str]) -> ProcessPoolExecutor:
+        # Called with the lock held. A target's stats carry on if it had a worker.
+        worker = self._workers[target] = ProcessPoolExecutor(
+            max_workers=1,
+            mp_context=self._context,
+            initializer=init_worker,
+            initargs=(env,),
+        )
+        self._stats.setdefault(target, DriveStats(target))
+        return worker
+
+    def _record(self, job: RipJob, future: Future[RipResult]) -> None:
+        if future.cancelled():
+            return
+        exception = future.exception()
+        if exception is not None:
+            # The worker process itself died, e.g. it crashed inside libdvdcss.
+            result = RipResult(job=job, sectors=0, seconds=0.0, error=repr(exception))
+        else:
+            result = future.result()
+        with self._lock:
+            stats = self._stats[job.target]
+            stats.jobs += 1
+            stats.seconds += result.seconds
+            if result.ok:
+                stats.sectors += result.sectors
+            else:
+                stats.failures += 1
+                stats.errors.append(result.error or "")
+
+
+# State of a worker process. Each worker only ever reads from one target.
+_worker_dvdcss: DvdCss | None = None
+
+
+def _run_job(job: RipJob) -> RipResult:
+    global _worker_dvdcss
+
+    began = time.perf_counter()
+    try:
+        count = job.count
+        if count is None:
+            if not os.path.isfile(job.target):
+                raise ValueError("A count is required unless the target is a file.")
+            count = os.path.getsize(job.target) // constants.SECTOR_SIZE - job.start
+
+        if _worker_dvdcss is None or _worker_dvdcss.handle is None:
+            _worker_dvdcss = DvdCss()
+            _worker_dvdcss.open(job.target)
+
+        with open(job.output, "wb") as f:
+            result = _worker_dvdcss.copy_range(
+                job.start,
+                count,
+                f,
+                chunk=job.chunk,
+                flag=ReadFlag(job.flag),
+                seek_flag=SeekFlag(job.seek_flag),
+                hashes=job.hashes,
+            )
+    except Exception as e:
+        # Start afresh for the next job, the handle may be in a bad state.
+        if _worker_dvdcss is not None:
+            with suppress(Exception):
+                _worker_dvdcss.close()
+            _worker_dvdcss = None
+        return RipResult(
+            job=job, sectors=0, seconds=time.perf_counter() - began, error=repr(e)
+        )
+
+    return RipResult(
+        job=job,
+        sectors=result.sectors,
+        seconds=time.perf_counter() - began,
+        digests=result.digests,
+    )
+
+
+__all__ = ("DriveStats", "RipFarm", "RipJob", "RipResult")
@@ -0,0 +1,143 @@
+from __future__ import annotations
+
+import io
+from typing import TYPE_CHECKING, Any
+
+from pydvdcss import constants
+from pydvdcss._types import ReadFlag_T, SeekFlag_T
+from pydvdcss.buffers import aligned_buffer
+from pydvdcss.structs import ReadFlag, SeekFlag
+
+if TYPE_CHECKING:
+    from pydvdcss.dvdcss import DvdCss
+
+
+class DvdCssFile(io.RawIOBase):
+    """
+    A read-only, seekable, unbuffered file object over a range of sectors, e.g. a title.
+
+    Byte offsets are relative to the start of the range and are mapped to sector seeks
+    and reads, decrypting by default, so the title can be handed to anything that takes
+    a file object, e.g. shutil.copyfileobj(), a demuxer, or an HTTP response:
+
+        with DvdCssFile(dvd, start, count) as raw, io.BufferedReader(raw, 1 << 20) as f:
+            shutil.copyfileobj(f, out, 1 << 20)
+
+    readinto() reads whole sectors straight into the caller's buffer, so reads that
+    start on a sector boundary, like those of a BufferedReader after a seek to one, are
+    zero-copy. Only the part of a sector before or after a boundary goes through a
+    one-sector internal buffer.
+
+    The title key is obtained with a SeekFlag.SEEK_KEY seek to the start of the range
+    on the first read, then seeks use `seek_flag`. The DvdCss is not closed with the
+    file and must not be used elsewhere while the file is in use.
+    """
+
+    def __init__(
+        self,
+        dvdcss: DvdCss,
+        start: int,
+        count: int,
+        flag: ReadFlag_T = ReadFlag.READ_DECRYPT,
+        seek_flag: SeekFlag_T = SeekFlag.SEEK_MPEG,
+        key: bool = True,
+    ) -> None:
+        """
+        Parameters:
+            dvdcss: The DvdCss with the disc open.
+            start: First sector of the range, e.g. of a title's VOBs.
+            count: Number of sectors in the range.
+            flag: Reading Flag, used for every read. See DvdCss.read().
+            seek_flag: Seeking Flag, used for every seek. See DvdCss.seek().
+            key: Seek to the start of the range with SeekFlag.SEEK_KEY before the
+                first read, to obtain the title key.
+        """
+        super().__init__()
+        if not isinstance(start, int) or start < 0:
+            raise ValueError(f"Expected start to be a non-negative int, not {start!r}")
+        if not isinstance(count, int) or count < 0:
+            raise ValueError(f"Expected count to be a non-negative int, not {count!r}")
+
+        self.dvdcss = dvdcss
+        self.start = start
+        self.count = count
+        self.flag = ReadFlag(flag) if isinstance(flag, int) else flag
+        self.seek_flag = (
+            SeekFlag(seek_flag) if isinstance(seek_flag, int) else seek_flag
+        )
+        self._key = key
+        self._position = 0
+        self._drive: int | None = None  # The sector the DvdCss is at, if known.
+        self._sector = memoryview(aligned_buffer(constants.SECTOR_SIZE)).cast("B")
+        self._sector_index: int | None = None  # The sector in `_sector`, if any.
+
+    @property
+    def size(self) -> int:
+        """Size of the range in bytes."""
+        return self.count * constants.SECTOR_SIZE
+
+    def readable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return True
+
+    def tell(self) -> int:
+        self._checkClosed()
+        return self._position
+
+    def seek(self, offset: int, whence: int = io.SEEK_SET) -> int:
+        self._checkClosed()
+        if whence == io.SEEK_SET:
+            position = offset
+        elif whence == io.SEEK_CUR:
+            position = self._position + offset
+        elif whence == io.SEEK_END:
+            position = self.size + offset
+        else:
+            raise ValueError(f"Invalid whence ({whence!r}, should be 0, 1 or 2)")
+        if position < 0:
+            raise ValueError(f"Negative seek position {position}")
+        self._position = position
+        return position
+
+    def readinto(self, buffer: Any) -> int:
+        self._checkClosed()
+        view = memoryview(buffer).cast("B")
+        size = min(len(view), self.size - self._position)
+        if size <= 0:
+            return 0
+
+        sector, offset = divmod(self._position, constants.SECTOR_SIZE)
+        if offset or size < constants.SECTOR_SIZE:
+            # Part of a sector, copy it from the internal one-sector buffer.
+            if self._sector_index != sector:
+                self._sector_index = None
+                self._read(sector, self._sector)
+                self._sector_index = sector
+            size = min(size, constants.SECTOR_SIZE - offset)
+            view[:size] = self._sector[offset : offset + size]
+        else:
+            size -= size % constants.SECTOR_SIZE
+            self._read(sector, view[:size])
+
+        self._position += size
+        return size
+
+    def _read(self, sector: int, view: memoryview) -> None:
+        if self._key:
+            self.dvdcss.seek(self.start, SeekFlag.SEEK_KEY)
+            self._drive = self.start
+            self._key = False
+        if self._drive != self.start + sector:
+            self._drive = None
+            self.dvdcss.seek(self.start + sector, self.seek_flag)
+        try:
+            sectors = self.dvdcss.read_into(view, self.flag)
+        except BaseException:
+            self._drive = None
+            raise
+        self._drive = self.start + sector + sectors
+
+
+__all__ = ("DvdCssFile",)
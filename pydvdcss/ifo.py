@@ -0,0 +1,114 @@
+from __future__ import annotations
+
+import struct
+from dataclasses import dataclass
+
+from pydvdcss import constants
+
+
+@dataclass(frozen=True)
+class TitleEntry:
+    """A title as listed in the video manager's title search pointer table."""
+
+    number: int
+    """Title number on the disc, from 1."""
+    angles: int
+    chapters: int
+    title_set: int
+    """Number of the title set (VTS_xx) the title is in."""
+    title_set_title: int
+    """Number of the title within its title set, from 1."""
+
+
+@dataclass(frozen=True)
+class TitleSet:
+    """The parts of a title set's IFO (VTS_xx_0.IFO) needed to locate its titles."""
+
+    vobs_start: int
+    """Sector of the title VOBs (VTS_xx_1.VOB), relative to the start of the IFO."""
+    titles: dict[int, tuple[int, ...]]
+    """Program chain numbers of each title of the title set, in playback order."""
+    program_chains: dict[int, tuple[tuple[int, int], ...]]
+    """First and last sector of each cell of each program chain, in playback order.
+    Sectors are relative to the start of the title VOBs."""
+
+
+def parse_vmg(data: bytes) -> list[TitleEntry]:
+    """
+    Parse the titles from a video manager IFO (VIDEO_TS.IFO).
+
+    Raises:
+        ValueError: The data is not a video manager IFO.
+    """
+    if data[:12] != b"DVDVIDEO-VMG":
+        raise ValueError("Not a video manager IFO, expected a DVDVIDEO-VMG header.")
+
+    table = _u32(data, 0xC4) * constants.SECTOR_SIZE
+    (count,) = struct.unpack_from(">H", data, table)
+    titles = []
+    for number in range(1, count + 1):
+        entry = table + 8 + (number - 1) * 12
+        _, angles, chapters, _, title_set, title_set_title = struct.unpack_from(
+            ">BBHHBB", data, entry
+        )
+        titles.append(
+            TitleEntry(
+                number=number,
+                angles=angles,
+                chapters=chapters,
+                title_set=title_set,
+                title_set_title=title_set_title,
+            )
+        )
+    return titles
+
+
+def parse_vts(data: bytes) -> TitleSet:
+    """
+    Parse the titles and cells from a title set IFO (VTS_xx_0.IFO).
+
+    Raises:
+        ValueError: The data is not a title set IFO.
+    """
+    if data[:12] != b"DVDVIDEO-VTS":
+        raise ValueError("Not a title set IFO, expected a DVDVIDEO-VTS header.")
+
+    vobs_start = _u32(data, 0xC4)
+
+    # Part-of-title search pointers: each title's chapters as (pgcn, pgn) pairs.
+    ptt = _u32(data, 0xC8) * constants.SECTOR_SIZE
+    (count,) = struct.unpack_from(">H", data, ptt)
+    end = _u32(data, ptt + 4) + 1
+    offsets = [_u32(data, ptt + 8 + i * 4) for i in range(count)] + [end]
+    titles = {}
+    for number in range(1, count + 1):
+        chains: dict[int, None] = {}
+        for offset in range(offsets[number - 1], offsets[number] - 3, 4):
+            (chain,) = struct.unpack_from(">H", data, ptt + offset)
+            chains[chain] = None
+        titles[number] = tuple(chains)
+
+    # Program chain information table: each chain's cell playback information.
+    pgcit = _u32(data, 0xCC) * constants.SECTOR_SIZE
+    (count,) = struct.unpack_from(">H", data, pgcit)
+    program_chains = {}
+    for number in range(1, count + 1):
+        pgc = pgcit + _u32(data, pgcit + 8 + (number - 1) * 8 + 4)
+        cells = data[pgc + 3]
+        (playback,) = struct.unpack_from(">H", data, pgc + 0xE8)
+        program_chains[number] = tuple(
+            (
+                _u32(data, pgc + playback + cell * 24 + 8),
+                _u32(data, pgc + playback + cell * 24 + 20),
+            )
+            for cell in range(cells)
+        )
+
+    return TitleSet(vobs_start=vobs_start, titles=titles, program_chains=program_chains)
+
+
+def _u32(data: bytes, offset: int) -> int:
+    return int.from_bytes(data[offset : offset + 4], "big")
+
+
+__all__ = ("TitleEntry", "TitleSet", "parse_vmg", "parse_vts")
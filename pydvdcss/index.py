@@ -0,0 +1,278 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+from collections.abc import Iterable
+from dataclasses import dataclass
+from pathlib import Path
+from typing import BinaryIO
+
+from pydvdcss import constants
+from pydvdcss.ifo import parse_vmg, parse_vts
+from pydvdcss.udf import Extent, SectorReader, UdfReader, VolumeDescriptors
+
+
+@dataclass(frozen=True)
+class Title:
+    """A title of a DVD-Video disc and where its cells are on the disc."""
+
+    number: int
+    """Title number on the disc, from 1."""
+    title_set: int
+    """Number of the title set (VTS_xx) the title is in."""
+    angles: int
+    chapters: int
+    cells: tuple[Extent, ...]
+    """Sectors of the title's cells in playback order, merged where contiguous."""
+
+    @property
+    def sectors(self) -> int:
+        """Total number of sectors in the title's cells."""
+        return sum(cell.count for cell in self.cells)
+
+
+@dataclass(frozen=True)
+class DiscIndex:
+    """
+    An index of a DVD-Video disc's files and titles to the sectors they're at.
+
+    Build one with DiscIndex.build(), DiscIndex.from_image(), or DvdCss.get_index().
+    Lookups are plain dictionary lookups, and the index can be saved to and loaded from
+    a small JSON file so the file system doesn't need to be walked again for a disc.
+    """
+
+    fingerprint: str
+    """Identifies the disc, see disc_fingerprint()."""
+    files: dict[str, tuple[Extent, ...]]
+    """Sector extents of each file, keyed by its upper-case path, e.g.
+    "/VIDEO_TS/VTS_01_1.VOB"."""
+    titles: dict[int, Title]
+    """Each title keyed by its title number."""
+
+    @classmethod
+    def build(
+        cls, read: SectorReader, cache_dir: str | os.PathLike[str] | None = None
+    ) -> DiscIndex:
+        """
+        Build an index by walking the disc's UDF file system and parsing its IFOs.
+
+        Parameters:
+            read: Reads `count` sectors from a logical block address, `read(sector,
+                count)`, returning the bytes read.
+            cache_dir: A directory to cache indexes in, keyed by disc fingerprint. A
+                cached index is loaded instead of building it again.
+
+        Raises:
+            ValueError: The disc has no valid UDF file system or IFOs.
+            FileNotFoundError: The disc has no VIDEO_TS directory or IFO.
+
+        Returns the index of the disc.
+        """
+        volume = VolumeDescriptors.read(read)
+        fingerprint = disc_fingerprint(read, volume)
+
+        cache_path = None
+        if cache_dir is not None:
+            cache_path = Path(cache_dir) / f"{fingerprint}.json"
+            if cache_path.is_file():
+                return cls.load(cache_path)
+
+        udf = UdfReader(read, volume)
+        files = {}
+        directories = ["/"]
+        while directories:
+            directory = directories.pop()
+            for name, file in udf.listdir(directory).items():
+                path = f"{directory.rstrip('/')}/{name}"
+                if file.is_directory:
+                    directories.append(path)
+                else:
+                    files[path] = file.extents
+
+        titles = {}
+        title_sets = {}
+        for entry in parse_vmg(udf.read_file(udf.find("/VIDEO_TS/VIDEO_TS.IFO"))):
+            if entry.title_set not in title_sets:
+                ifo = udf.find(f"/VIDEO_TS/VTS_{entry.title_set:02}_0.IFO")
+                title_set = parse_vts(udf.read_file(ifo))
+                # Cell sectors are relative to the title VOBs. Prefer where the file
+                # system says they are over the IFO's own pointer.
+                vobs = files.get(f"/VIDEO_TS/VTS_{entry.title_set:02}_1.VOB")
+                if vobs:
+                    vobs_start = vobs[0].start
+                else:
+                    vobs_start = (ifo.start or 0) + title_set.vobs_start
+                title_sets[entry.title_set] = (title_set, vobs_start)
+
+            title_set, vobs_start = title_sets[entry.title_set]
+            cells = [
+                Extent(vobs_start + first, last - first + 1)
+                for chain in title_set.titles.get(entry.title_set_title, ())
+                for first, last in title_set.program_chains.get(chain, ())
+                if last >= first
+            ]
+            titles[entry.number] = Title(
+                number=entry.number,
+                title_set=entry.title_set,
+                angles=entry.angles,
+                chapters=entry.chapters,
+                cells=_merge(cells),
+            )
+
+        index = cls(fingerprint=fingerprint, files=files, titles=titles)
+        if cache_path is not None:
+            index.save(cache_path)
+        return index
+
+    @classmethod
+    def from_image(
+        cls,
+        path: str | os.PathLike[str],
+        cache_dir: str | os.PathLike[str] | None = None,
+    ) -> DiscIndex:
+        """Build an index of an ISO image file, reading it directly. See build()."""
+        with open(path, "rb") as f:
+            return cls.build(file_reader(f), cache_dir)
+
+    @classmethod
+    def load(cls, path: str | os.PathLike[str]) -> DiscIndex:
+        """Load an index saved with save()."""
+        data = json.loads(Path(path).read_text(encoding="utf8"))
+        return cls(
+            fingerprint=data["fingerprint"],
+            files={
+                name: tuple(Extent(*extent) for extent in extents)
+                for name, extents in data["files"].items()
+            },
+            titles={
+                int(number): Title(
+                    number=int(number),
+                    title_set=title["title_set"],
+                    angles=title["angles"],
+                    chapters=title["chapters"],
+                    cells=tuple(Extent(*cell) for cell in title["cells"]),
+                )
+                for number, title in data["titles"].items()
+            },
+        )
+
+    def save(self, path: str | os.PathLike[str]) -> None:
+        """Save the index as JSON, to be loaded with load()."""
+        data = {
+            "fingerprint": self.fingerprint,
+            "files": {
+                name: [[extent.start, extent.count] for extent in extents]
+                for name, extents in self.files.items()
+            },
+            "titles": {
+                number: {
+                    "title_set": title.title_set,
+                    "angles": title.angles,
+                    "chapters": title.chapters,
+                    "cells": [[cell.start, cell.count] for cell in title.cells],
+                }
+                for number, title in self.titles.items()
+            },
+        }
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        temp = path.with_suffix(".tmp")
+        temp.write_text(json.dumps(data, separators=(",", ":")), encoding="utf8")
+        temp.replace(path)
+
+    def file(self, path: str) -> tuple[Extent, ...]:
+        """
+        Get the sector extents of a file by path, matched case-insensitively.
+
+        Raises:
+            FileNotFoundError: The file is not on the disc.
+        """
+        extents = self.files.get("/" + path.strip("/").upper())
+        if extents is None:
+            raise FileNotFoundError(path)
+        return extents
+
+    @property
+    def key_sectors(self) -> dict[str, int]:
+        """
+        The sectors to obtain each CSS title key at.
+
+        A title key is used for the video manager menu (VIDEO_TS.VOB), and for each
+        title set's menu (VTS_xx_0.VOB) and titles (VTS_xx_1.VOB through VTS_xx_9.VOB,
+        which share one key). These are the same sectors libdvdread obtains keys at.
+
+        Returns the first sector of each VOB a title key is needed for, keyed by the
+        VOB's file name, in the order they are on the disc.
+        """
+        names = ["VIDEO_TS.VOB"]
+        for title_set in range(1, 100):
+            names += [f"VTS_{title_set:02}_0.VOB", f"VTS_{title_set:02}_1.VOB"]
+
+        sectors = {
+            name: extents[0].start
+            for name in names
+            if (extents := self.files.get(f"/VIDEO_TS/{name}"))
+        }
+        return dict(sorted(sectors.items(), key=lambda item: item[1]))
+
+
+def disc_fingerprint(
+    read: SectorReader, volume: VolumeDescriptors | None = None
+) -> str:
+    """
+    Identify a DVD-Video disc from the sectors that describe it.
+
+    The fingerprint is a hash of sector 16 and the UDF volume descriptors: the anchor,
+    the volume descriptor sequence, which holds the volume's name, set identifier,
+    and recording time, and the file set descriptor. They're all at fixed sectors or
+    pointed to by one, so only 4 reads are needed and no directory is walked, and
+    they're never scrambled, so it works before any keys are obtained.
+
+    Parameters:
+        read: Reads `count` sectors from a logical block address, `read(sector,
+            count)`, returning the bytes read.
+        volume: The disc's volume descriptors, if already read, to save reading them
+            again. See VolumeDescriptors.read().
+
+    Raises:
+        ValueError: The disc has no valid UDF file system.
+
+    Returns a hex digest identifying the disc.
+    """
+    volume = volume or VolumeDescriptors.read(read)
+    digest = hashlib.sha1(usedforsecurity=False)
+    digest.update(read(16, 1))
+    digest.update(volume.anchor)
+    for descriptor in volume.sequence:
+        digest.update(descriptor)
+    digest.update(volume.file_set)
+    return digest.hexdigest()
+
+
+def file_reader(file: BinaryIO) -> SectorReader:
+    """
+    Make a SectorReader that reads from a binary file object, e.g. an ISO image.
+
+    Parameters:
+        file: A binary file object opened for reading, with seek() and read().
+    """
+
+    def read(sector: int, count: int) -> bytes:
+        file.seek(sector * constants.SECTOR_SIZE)
+        return file.read(count * constants.SECTOR_SIZE)
+
+    return read
+
+
+def _merge(extents: Iterable[Extent]) -> tuple[Extent, ...]:
+    merged: list[Extent] = []
+    for extent in extents:
+        if merged and merged[-1].end == extent.start:
+            merged[-1] = Extent(merged[-1].start, merged[-1].count + extent.count)
+        else:
+            merged.append(extent)
+    return tuple(merged)
+
+
+__all__ = ("DiscIndex", "Title", "disc_fingerprint", "file_reader")
@@ -0,0 +1,296 @@
+from __future__ import annotations
+
+import json
+import os
+import re
+import shutil
+import sys
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+from pydvdcss.exceptions import PyDvdCssError
+from pydvdcss.index import disc_fingerprint
+
+if TYPE_CHECKING:
+    from pydvdcss.dvdcss import DvdCss
+
+# libdvdcss names each cached title key file after the key's sector, as 10 hex digits.
+KEY_FILE = re.compile(r"[0-9a-f]{10}")
+
+RECORDS_FILE = "pydvdcss.json"
+"""Where KeyCache keeps its own records, in the root of the cache directory. libdvdcss
+only looks in disc subdirectories, so it ignores the file."""
+
+
+@dataclass(frozen=True)
+class CachedDisc:
+    """A disc's subdirectory of title keys in a libdvdcss key cache."""
+
+    name: str
+    """Subdirectory name, made by libdvdcss from the disc's title, manufacturing
+    date, and serial number."""
+    path: Path
+    keys: int
+    """Number of title keys cached."""
+    size: int
+    """Size of the cached files in bytes."""
+    last_used: float
+    """When the disc was last opened through KeyCache.open(), or its keys last
+    written, as a Unix timestamp."""
+
+    @property
+    def age(self) -> float:
+        """Seconds since the disc was last used."""
+        return max(0.0, time.time() - self.last_used)
+
+
+@dataclass(frozen=True)
+class CacheReport:
+    """Whether KeyCache.open() found a disc's title keys cached, and what it saved."""
+
+    disc: str | None
+    """The disc's subdirectory name, if it could be told which one it is."""
+    hit: bool
+    """Whether title keys were already cached for the disc."""
+    keys_cached: int
+    """Number of title keys cached for the disc when it was opened."""
+    keys_added: int
+    """Number of title keys libdvdcss added to the cache while prewarming."""
+    open_seconds: float
+    """Time dvdcss_open() took in seconds."""
+    key_seconds: float | None
+    """Time obtaining every title key took in seconds, if the keys were prewarmed."""
+    seconds_saved: float | None
+    """Time the cache saved over obtaining the keys without it, in seconds. Only known
+    on a hit for a disc whose keys were prewarmed through KeyCache on a miss before."""
+
+
+class KeyCache:
+    """
+    Manage a libdvdcss title key cache directory (DVDCSS_CACHE).
+
+    libdvdcss stores each disc's title keys in a subdirectory of the cache, and uses
+    them instead of obtaining the keys again, which can skip a multi-minute crack. It
+    never removes anything, so the directory grows by a subdirectory for every disc.
+    This lists the cached discs, evicts them by age, total size, or count, least
+    recently used first, and opens discs with the cache to report hits and misses.
+
+    libdvdcss doesn't record when a disc's keys were last used, so discs opened with
+    open() have their subdirectory's modification time updated for LRU eviction.
+    """
+
+    def __init__(self, directory: str | os.PathLike[str] | None = None) -> None:
+        """
+        Parameters:
+            directory: The cache directory. Defaults to DVDCSS_CACHE if it is set,
+                otherwise the directory libdvdcss uses by default.
+
+        Raises:
+            ValueError: The directory is not given and DVDCSS_CACHE is "off".
+        """
+        if directory is None:
+            directory = os.environ.get("DVDCSS_CACHE") or _default_directory()
+            if directory == "off":
+                raise ValueError("DVDCSS_CACHE is off, give a cache directory instead.")
+        self.directory = Path(directory)
+        self._lock = threading.Lock()
+
+    def discs(self) -> list[CachedDisc]:
+        """List the cached discs, least recently used first."""
+        if not self.directory.is_dir():
+            return []
+        discs = [
+            self._disc(entry.name)
+            for entry in os.scandir(self.directory)
+            if entry.is_dir()
+        ]
+        return sorted(discs, key=lambda disc: disc.last_used)
+
+    @property
+    def size(self) -> int:
+        """Total size of the cached discs in bytes."""
+        return sum(disc.size for disc in self.discs())
+
+    def evict(
+        self,
+        max_size: int | None = None,
+        max_discs: int | None = None,
+        max_age: float | None = None,
+    ) -> list[CachedDisc]:
+        """
+        Remove cached discs, least recently used first, until within the limits.
+
+        Parameters:
+            max_size: Total size in bytes to keep the cached discs within.
+            max_discs: Number of cached discs to keep at most.
+            max_age: Remove discs not used for longer than this many seconds.
+
+        Returns the discs that were removed.
+        """
+        discs = self.discs()
+        size = sum(disc.size for disc in discs)
+        evicted: list[CachedDisc] = []
+        for disc in discs:
+            if not (
+                (max_size is not None and size > max_size)
+                or (max_discs is not None and len(discs) - len(evicted) > max_discs)
+                or (max_age is not None and disc.age > max_age)
+            ):
+                continue
+            self.remove(disc.name)
+            size -= disc.size
+            evicted.append(disc)
+        return evicted
+
+    def remove(self, name: str) -> None:
+        """
+        Remove a cached disc by its subdirectory name.
+
+        Raises:
+            FileNotFoundError: The disc is not cached.
+        """
+        shutil.rmtree(self.directory / Path(name).name)
+        with self._lock:
+            records = self._load_records()
+            records["discs"].pop(name, None)
+            records["fingerprints"] = {
+                fingerprint: disc
+                for fingerprint, disc in records["fingerprints"].items()
+                if disc != name
+            }
+            self._save_records(records)
+
+    def clear(self) -> list[CachedDisc]:
+        """Remove every cached disc. Returns the discs that were removed."""
+        return self.evict(max_discs=0)
+
+    def open(
+        self, dvdcss: DvdCss, target: str | os.PathLike[str], prewarm: bool = True
+    ) -> CacheReport:
+        """
+        Open a disc with this cache directory, and report whether it was a hit.
+
+        The disc's subdirectory is told by the one libdvdcss creates on its first open,
+        and remembered by the disc's fingerprint (see disc_fingerprint()) for later
+        opens, so discs cached before KeyCache was used report a hit without a name.
+
+        Parameters:
+            dvdcss: The DvdCss to open the disc with, see DvdCss.open().
+            target: The disc to open, see DvdCss.open().
+            prewarm: Obtain every title key after opening, see DvdCss.prewarm_keys(),
+                so misses are written to the cache and the time it took is known. The
+                time taken on a miss is recorded to report the time a later hit saves.
+
+        Raises:
+            OpenFailureError: Failure opening the disc or during post-initialization.
+            AlreadyInUseError: The DvdCss already has a disc open.
+            ValueError: With prewarm, the disc has no valid UDF file system.
+            FileNotFoundError: With prewarm, the disc has no VIDEO_TS IFOs.
+
+        Returns a CacheReport of the open.
+        """
+        before = {disc.name: disc for disc in self.discs()}
+        began = time.perf_counter()
+        dvdcss.open(target, cache_dir=self.directory)
+        open_seconds = time.perf_counter() - began
+
+        created = [disc.name for disc in self.discs() if disc.name not in before]
+        try:
+            fingerprint: str | None = disc_fingerprint(dvdcss.read_sectors)
+        except (ValueError, OSError, PyDvdCssError):
+            fingerprint = None
+
+        with self._lock:
+            records = self._load_records()
+            if len(created) == 1:
+                name: str | None = created[0]
+            else:
+                name = records["fingerprints"].get(fingerprint)
+            if name is not None and fingerprint is not None:
+                records["fingerprints"][fingerprint] = name
+            self._save_records(records)
+
+        if name is not None and name in before:
+            keys_cached = before[name].keys
+        elif name is None and not created and dvdcss.is_scrambled:
+            # libdvdcss used a subdirectory that already existed, but it is unknown
+            # which one, so count it as a hit without knowing how many keys it had.
+            keys_cached = -1
+        else:
+            keys_cached = 0
+
+        key_seconds = None
+        if prewarm:
+            key_seconds = sum(result.seconds for result in dvdcss.prewarm_keys())
+
+        keys_added = 0
+        seconds_saved = None
+        if name is not None and (self.directory / name).is_dir():
+            disc = self._disc(name)
+            keys_added = max(0, disc.keys - max(keys_cached, 0))
+            os.utime(disc.path)
+            with self._lock:
+                records = self._load_records()
+                record = records["discs"].get(name, {})
+                if key_seconds is not None and keys_cached == 0 and keys_added:
+                    record["miss_seconds"] = key_seconds
+                elif key_seconds is not None and "miss_seconds" in record:
+                    seconds_saved = max(0.0, record["miss_seconds"] - key_seconds)
+                records["discs"][name] = record
+                self._save_records(records)
+
+        return CacheReport(
+            disc=name,
+            hit=keys_cached != 0,
+            keys_cached=max(keys_cached, 0),
+            keys_added=keys_added,
+            open_seconds=open_seconds,
+            key_seconds=key_seconds,
+            seconds_saved=seconds_saved,
+        )
+
+    def _disc(self, name: str) -> CachedDisc:
+        path = self.directory / name
+        keys = 0
+        size = 0
+        last_used = path.stat().st_mtime
+        for entry in os.scandir(path):
+            if not entry.is_file():
+                continue
+            stat = entry.stat()
+            size += stat.st_size
+            last_used = max(last_used, stat.st_mtime)
+            if KEY_FILE.fullmatch(entry.name):
+                keys += 1
+        return CachedDisc(
+            name=name, path=path, keys=keys, size=size, last_used=last_used
+        )
+
+    def _load_records(self) -> dict[str, Any]:
+        try:
+            records = json.loads((self.directory / RECORDS_FILE).read_text("utf8"))
+        except (OSError, ValueError):
+            records = {}
+        records.setdefault("discs", {})
+        records.setdefault("fingerprints", {})
+        return records
+
+    def _save_records(self, records: dict[str, Any]) -> None:
+        self.directory.mkdir(parents=True, exist_ok=True)
+        path = self.directory / RECORDS_FILE
+        temp = path.with_suffix(".tmp")
+        temp.write_text(json.dumps(records, separators=(",", ":")), encoding="utf8")
+        temp.replace(path)
+
+
+def _default_directory() -> str:
+    # The defaults libdvdcss documents, see the DvdCss docstring.
+    if sys.platform == "win32":
+        return os.path.join(os.environ.get("APPDATA", ""), "dvdcss")
+    return os.path.join(os.path.expanduser("~"), ".dvdcss")
+
+
+__all__ = ("CacheReport", "CachedDisc", "KeyCache")
@@ -0,0 +1,22 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+
+
+@dataclass(frozen=True)
+class TitleKeyResult:
+    """The outcome of obtaining one CSS title key, e.g. by DvdCss.prewarm_keys()."""
+
+    name: str
+    """Name of the VOB the key is for, or the sector as a string if not known."""
+    sector: int
+    """Sector the key was obtained at."""
+    seconds: float
+    """Time it took to obtain the key in seconds."""
+    found: bool
+    """Whether the key was obtained. libdvdcss fails the seek when it wasn't."""
+    error: str | None = None
+    """libdvdcss's error when the key wasn't obtained."""
+
+
+__all__ = ("TitleKeyResult",)
@@ -0,0 +1,265 @@
+from __future__ import annotations
+
+import importlib
+import json
+import os
+import sys
+import threading
+from contextlib import suppress
+from ctypes import (
+    CDLL,
+    POINTER,
+    Structure,
+    addressof,
+    byref,
+    c_char_p,
+    c_int,
+    c_void_p,
+)
+from ctypes.util import find_library
+from pathlib import Path
+from typing import Any
+
+from pydvdcss import constants, exceptions
+from pydvdcss.structs import DvdCssStreamCb, Iovec
+
+LIBRARY_ENV = "PYDVDCSS_LIBRARY"
+"""Environment variable with the path of the libdvdcss library to use, skipping the
+search for it."""
+
+BACKEND_ENV = "PYDVDCSS_BACKEND"
+"""Environment variable with the binding backend to use by default, see BACKENDS."""
+
+BACKENDS = ("ctypes", "cffi")
+"""The binding backends. "ctypes" is the standard library's and always available.
+"cffi" needs the cffi package. Which is cheaper per call depends on the platform and
+Python version, measure them with scripts/benchmark.py --backend."""
+
+_libraries: dict[str, Any] = {}
+_lock = threading.Lock()
+
+
+def load_library(backend: str | None = None) -> Any:
+    """
+    Get the libdvdcss library bound with a backend, loading it on first use.
+
+    The library is located and loaded once per process and backend and shared by every
+    DvdCss, so creating a DvdCss is cheap after the first.
+
+    Either backend gives an object with the same libdvdcss functions taking the same
+    arguments: the handle as an int, buffers and iovec arrays as ctypes arrays, and
+    the stream callbacks as a DvdCssStreamCb. With "ctypes" it is the CDLL itself.
+
+    Search order: the path in the PYDVDCSS_LIBRARY environment variable, a copy bundled
+    inside the package (shipped in the platform wheels), a copy next to the project
+    root (handy during development), then a system-installed library. Finding a system
+    library with ctypes.util.find_library can run ldconfig or a compiler, so the path it
+    resolves to is cached on disk and used by later processes for as long as the file
+    is unchanged.
+
+    Parameters:
+        backend: One of BACKENDS. Defaults to the PYDVDCSS_BACKEND environment
+            variable, or "ctypes".
+
+    Raises:
+        LibraryNotFoundError: The library could not be located or loaded.
+        ValueError: The backend is not one of BACKENDS.
+        ImportError: The cffi backend was asked for, but cffi is not installed.
+    """
+    backend = backend or os.environ.get(BACKEND_ENV) or "ctypes"
+    library = _libraries.get(backend)
+    if library is None:
+        if backend not in BACKENDS:
+            raise ValueError(
+                f"Expected backend to be one of {BACKENDS}, not {backend!r}"
+            )
+        with _lock:
+            library = _libraries.get(backend)
+            if library is None:
+                if "ctypes" not in _libraries:
+                    _libraries["ctypes"] = _configure(_open())
+                if backend == "cffi":
+                    _libraries["cffi"] = _CffiLibrary(_libraries["ctypes"]._name)
+                library = _libraries[backend]
+    return library
+
+
+def _open() -> CDLL:
+    override = os.environ.get(LIBRARY_ENV)
+    if override:
+        try:
+            return CDLL(override)
+        except OSError as e:
+            raise exceptions.LibraryNotFoundError(
+                f"Unable to load the libdvdcss library at {LIBRARY_ENV}={override}: {e}"
+            ) from e
+
+    package_dir = Path(__file__).parent
+    local = next(
+        (
+            candidate
+            for root in (package_dir, package_dir.parent)
+            for name in constants.LIBRARY_NAMES
+            for suffix in (".dll", ".so", ".dylib")
+            if (candidate := (root / name).with_suffix(suffix)).exists()
+        ),
+        None,
+    )
+    if local:
+        return CDLL(str(local))
+
+    cached = _cached_path()
+    if cached:
+        with suppress(OSError):
+            return CDLL(cached)
+
+    for name in constants.LIBRARY_NAMES:
+        found = find_library(name)
+        if found:
+            library = CDLL(found)
+            _cache_path(_loaded_path(library) or found)
+            return library
+
+    raise exceptions.LibraryNotFoundError(
+        "Unable to locate the libdvdcss library. "
+        "PyDvdCss cannot install this for you.\n\n" + constants.INSTALL_HELP
+    )
+
+
+def _configure(library: CDLL) -> CDLL:
+    dvdcss_t = c_void_p
+
+    library.dvdcss_open.argtypes = [c_char_p]
+    library.dvdcss_open.restype = dvdcss_t
+    library.dvdcss_open_stream.argtypes = [dvdcss_t, POINTER(DvdCssStreamCb)]
+    library.dvdcss_open_stream.restype = dvdcss_t
+    library.dvdcss_close.argtypes = [dvdcss_t]
+    library.dvdcss_close.restype = c_int
+    library.dvdcss_seek.argtypes = [dvdcss_t, c_int, c_int]
+    library.dvdcss_seek.restype = c_int
+    library.dvdcss_read.argtypes = [dvdcss_t, c_char_p, c_int, c_int]
+    library.dvdcss_read.restype = c_int
+    library.dvdcss_readv.argtypes = [dvdcss_t, POINTER(Iovec), c_int, c_int]
+    library.dvdcss_readv.restype = c_int
+    library.dvdcss_error.argtypes = [dvdcss_t]
+    library.dvdcss_error.restype = c_char_p
+    library.dvdcss_is_scrambled.argtypes = [dvdcss_t]
+    library.dvdcss_is_scrambled.restype = c_int
+
+    return library
+
+
+# Pointers are declared as intptr_t, so handles are plain ints as with ctypes, and a
+# ctypes object's address can be passed without wrapping it in a cffi pointer.
+_CDEF = """
+intptr_t dvdcss_open(const char *psz_target);
+intptr_t dvdcss_open_stream(intptr_t p_stream, intptr_t p_stream_cb);
+int dvdcss_close(intptr_t dvdcss);
+int dvdcss_seek(intptr_t dvdcss, int i_blocks, int i_flags);
+int dvdcss_read(intptr_t dvdcss, intptr_t p_buffer, int i_blocks, int i_flags);
+int dvdcss_readv(intptr_t dvdcss, intptr_t p_iovec, int i_blocks, int i_flags);
+const char *dvdcss_error(intptr_t dvdcss);
+int dvdcss_is_scrambled(intptr_t dvdcss);
+"""
+
+
+class _CffiLibrary:
+    # libdvdcss bound with cffi in ABI mode, with the same calls as the ctypes CDLL.
+
+    def __init__(self, name: str) -> None:
+        cffi = importlib.import_module("cffi")
+        self._ffi = cffi.FFI()
+        self._ffi.cdef(_CDEF)
+        self._lib = self._ffi.dlopen(name)
+        # These take and return only ints, so they need no conversion at all.
+        self.dvdcss_seek = self._lib.dvdcss_seek
+        self.dvdcss_close = self._lib.dvdcss_close
+        self.dvdcss_is_scrambled = self._lib.dvdcss_is_scrambled
+
+    def dvdcss_open(self, target: bytes) -> int | None:
+        return self._lib.dvdcss_open(target) or None
+
+    def dvdcss_open_stream(self, p_stream: int, p_stream_cb: Any) -> int | None:
+        return self._lib.dvdcss_open_stream(p_stream, addressof(p_stream_cb)) or None
+
+    def dvdcss_read(self, handle: int, buffer: Any, blocks: int, flags: int) -> int:
+        return int(self._lib.dvdcss_read(handle, addressof(buffer), blocks, flags))
+
+    def dvdcss_readv(self, handle: int, iovecs: Any, blocks: int, flags: int) -> int:
+        return int(self._lib.dvdcss_readv(handle, addressof(iovecs), blocks, flags))
+
+    def dvdcss_error(self, handle: int) -> bytes | None:
+        error = self._lib.dvdcss_error(handle)
+        return None if error == self._ffi.NULL else bytes(self._ffi.string(error))
+
+
+def cache_dir() -> Path:
+    """
+    The directory pydvdcss caches files in, `pydvdcss` in your user cache directory.
+
+    That's `%LOCALAPPDATA%` on Windows, `~/Library/Caches` on macOS, and
+    `$XDG_CACHE_HOME` or `~/.cache` elsewhere. It may not exist yet.
+    """
+    if sys.platform == "win32":
+        root = os.environ.get("LOCALAPPDATA") or Path.home() / "AppData" / "Local"
+    elif sys.platform == "darwin":
+        root = Path.home() / "Library" / "Caches"
+    else:
+        root = os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache"
+    return Path(root) / "pydvdcss"
+
+
+def _cache_file() -> Path:
+    return cache_dir() / "library.json"
+
+
+def _cached_path() -> str | None:
+    # The cached path, if it is still there and unchanged since it was cached.
+    try:
+        cached = json.loads(_cache_file().read_text(encoding="utf8"))
+        stat = os.stat(cached["path"])
+    except (OSError, ValueError, KeyError, TypeError):
+        return None
+    if (stat.st_mtime_ns, stat.st_size) != (cached["mtime_ns"], cached["size"]):
+        return None
+    return str(cached["path"])
+
+
+def _cache_path(path: str) -> None:
+    # Only a real file can be checked for changes, not a bare soname.
+    with suppress(OSError):
+        stat = os.stat(path)
+        cache = _cache_file()
+        cache.parent.mkdir(parents=True, exist_ok=True)
+        temp = cache.with_suffix(f".{os.getpid()}.tmp")
+        temp.write_text(
+            json.dumps(
+                {"path": path, "mtime_ns": stat.st_mtime_ns, "size": stat.st_size}
+            ),
+            encoding="utf8",
+        )
+        temp.replace(cache)
+
+
+class _LinkMap(Structure):
+    # The start of glibc and BSD libc's struct link_map.
+    _fields_ = (("l_addr", c_void_p), ("l_name", c_char_p))
+
+
+def _loaded_path(library: CDLL) -> str | None:
+    # On Linux find_library() gives a soname, ask the loader which file it opened.
+    if sys.platform in ("win32", "darwin"):
+        return None
+    try:
+        dlinfo = CDLL(None).dlinfo
+    except (OSError, AttributeError):
+        return None
+    link_map = POINTER(_LinkMap)()
+    rtld_di_linkmap = 2
+    if dlinfo(c_void_p(library._handle), rtld_di_linkmap, byref(link_map)) != 0:
+        return None
+    name = link_map.contents.l_name
+    return os.fsdecode(name) if name else None
+
+
+__all__ = ("BACKENDS", "BACKEND_ENV", "LIBRARY_ENV", "cache_dir", "load_library")
@@ -0,0 +1,272 @@
+from __future__ import annotations
+
+import threading
+import time
+from bisect import bisect_left
+from collections.abc import Callable, Iterable, Mapping
+from dataclasses import dataclass
+from functools import wraps
+from typing import TYPE_CHECKING, Any
+
+from pydvdcss import constants
+from pydvdcss.structs import SeekFlag
+
+if TYPE_CHECKING:
+    from pydvdcss.dvdcss import DvdCss
+
+DEFAULT_BUCKETS = (
+    0.0001,
+    0.0005,
+    0.001,
+    0.005,
+    0.01,
+    0.05,
+    0.1,
+    0.5,
+    1.0,
+    5.0,
+    10.0,
+    30.0,
+    60.0,
+    300.0,
+)
+"""Upper bounds of the latency histogram buckets in seconds. Reads from cache take
+microseconds, while deriving a title key on a seek can take minutes."""
+
+OPERATIONS = ("open", "seek", "seek_key", "read", "read_into", "readv", "close")
+"""The operations recorded. A seek with SeekFlag.SEEK_KEY is recorded as "seek_key",
+as it is where libdvdcss obtains title keys and is far slower than any other seek."""
+
+
+@dataclass(frozen=True)
+class CallEvent:
+    """A DvdCss call recorded by Instrumentation, as given to its hooks."""
+
+    operation: str
+    """The operation, one of OPERATIONS."""
+    seconds: float
+    """Time the call took in seconds."""
+    sectors: int = 0
+    """Number of sectors read, for reads that succeeded."""
+    error: BaseException | None = None
+    """The exception the call raised, if any."""
+
+
+class Histogram:
+    """A latency histogram with fixed bucket upper bounds, as in Prometheus."""
+
+    def __init__(self, buckets: Iterable[float] = DEFAULT_BUCKETS) -> None:
+        self.buckets = tuple(sorted(buckets))
+        self.counts = [0] * (len(self.buckets) + 1)
+        """Number of observations in each bucket, not cumulative. The last is for
+        observations above every bucket."""
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+
+class Instrumentation:
+    """
+    Opt-in counters and latency histograms of DvdCss calls.
+
+    Attach it with DvdCss(instrumentation=...) or attach(). It records the calls,
+    sectors and bytes read, errors by exception class, and a latency histogram of
+    each operation, see OPERATIONS. Each call is also passed to the hooks as a
+    CallEvent, and everything can be exported in the Prometheus text format.
+
+    Attaching wraps the DvdCss instance's methods rather than checking for
+    instrumentation on every call, so a DvdCss without it runs exactly as if this
+    didn't exist. One Instrumentation may be attached to many DvdCss instances, e.g.
+    all the handles of one drive, and is safe to use across threads.
+    """
+
+    def __init__(
+        self,
+        buckets: Iterable[float] = DEFAULT_BUCKETS,
+        hooks: Iterable[Callable[[CallEvent], object]] = (),
+        labels: Mapping[str, str] | None = None,
+    ) -> None:
+        """
+        Parameters:
+            buckets: Upper bounds of the latency histogram buckets in seconds.
+            hooks: Called with a CallEvent after every call, in the calling thread.
+                An exception raised by a hook is raised from the call.
+            labels: Labels added to every exported metric, e.g. {"drive": "sr0"}.
+        """
+        self.buckets = tuple(sorted(buckets))
+        self.hooks = list(hooks)
+        self.labels = dict(labels or {})
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self) -> None:
+        """Reset every counter and histogram to zero."""
+        with self._lock:
+            self.calls = dict.fromkeys(OPERATIONS, 0)
+            """Number of calls of each operation."""
+            self.sectors = dict.fromkeys(OPERATIONS, 0)
+            """Number of sectors read by each operation."""
+            self.errors: dict[tuple[str, str], int] = {}
+            """Number of calls that raised, by operation and exception class name."""
+            self.latency = {
+                operation: Histogram(self.buckets) for operation in OPERATIONS
+            }
+            """Latency histogram of each operation, including failed calls."""
+
+    def attach(self, dvdcss: DvdCss) -> None:
+        """Start recording the calls of a DvdCss."""
+        for name, (operation, sectors) in _METHODS.items():
+            method = getattr(type(dvdcss), name).__get__(dvdcss)
+            setattr(dvdcss, name, self._wrap(method, operation, sectors))
+
+    def detach(self, dvdcss: DvdCss) -> None:
+        """Stop recording the calls of a DvdCss attached with attach()."""
+        for name in _METHODS:
+            dvdcss.__dict__.pop(name, None)
+
+    def record(self, event: CallEvent) -> None:
+        """Record a call and pass it to the hooks."""
+        with self._lock:
+            self.calls[event.operation] += 1
+            self.sectors[event.operation] += event.sectors
+            self.latency[event.operation].observe(event.seconds)
+            if event.error is not None:
+                key = (event.operation, type(event.error).__name__)
+                self.errors[key] = self.errors.get(key, 0) + 1
+        for hook in self.hooks:
+            hook(event)
+
+    def prometheus(self, prefix: str = "pydvdcss") -> str:
+        """Export the counters and histograms in the Prometheus text format."""
+        lines = []
+        with self._lock:
+            for name, kind, text, values in (
+                ("calls_total", "counter", "Number of calls.", self.calls),
+                ("sectors_total", "counter", "Number of sectors read.", self.sectors),
+                (
+                    "bytes_total",
+                    "counter",
+                    "Number of bytes read.",
+                    {
+                        operation: sectors * constants.SECTOR_SIZE
+                        for operation, sectors in self.sectors.items()
+                    },
+                ),
+            ):
+                lines += [
+                    f"# HELP {prefix}_{name} {text}",
+                    f"# TYPE {prefix}_{name} {kind}",
+                ]
+                lines += [
+                    f"{prefix}_{name}{self._labels(operation=operation)} {value}"
+                    for operation, value in values.items()
+                ]
+
+            name = f"{prefix}_errors_total"
+            lines += [
+                f"# HELP {name} Number of calls that raised.",
+                f"# TYPE {name} counter",
+            ]
+            lines += [
+                f"{name}{self._labels(operation=operation, error=error)} {count}"
+                for (operation, error), count in sorted(self.errors.items())
+            ]
+
+            name = f"{prefix}_call_duration_seconds"
+            lines += [f"# HELP {name} Call latency.", f"# TYPE {name} histogram"]
+            for operation, histogram in self.latency.items():
+                cumulative = 0
+                for bound, count in zip(
+                    (*histogram.buckets, "+Inf"), histogram.counts, strict=True
+                ):
+                    cumulative += count
+                    labels = self._labels(operation=operation, le=str(bound))
+                    lines.append(f"{name}_bucket{labels} {cumulative}")
+                labels = self._labels(operation=operation)
+                lines.append(f"{name}_sum{labels} {histogram.sum}")
+                lines.append(f"{name}_count{labels} {histogram.count}")
+
+        return "\n".join(lines) + "\n"
+
+    def _labels(self, **labels: str) -> str:
+        pairs = {**self.labels, **labels}.items()
+        return "{" + ",".join(f'{key}="{_escape(value)}"' for key, value in pairs) + "}"
+
+    def _wrap(
+        self,
+        method: Callable[..., Any],
+        operation: Callable[[tuple[Any, ...], dict[str, Any]], str],
+        sectors: Callable[[tuple[Any, ...], dict[str, Any], Any], int] | None,
+    ) -> Callable[..., Any]:
+        @wraps(method)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            began = time.perf_counter()
+            try:
+                result = method(*args, **kwargs)
+            except Exception as e:
+                seconds = time.perf_counter() - began
+                self.record(CallEvent(operation(args, kwargs), seconds, error=e))
+                raise
+            seconds = time.perf_counter() - began
+            read = sectors(args, kwargs, result) if sectors else 0
+            self.record(CallEvent(operation(args, kwargs), seconds, read))
+            return result
+
+        return wrapper
+
+
+def _fixed(operation: str) -> Callable[[tuple[Any, ...], dict[str, Any]], str]:
+    return lambda args, kwargs: operation
+
+
+def _seek_operation(args: tuple[Any, ...], kwargs: dict[str, Any]) -> str:
+    flag = args[1] if len(args) > 1 else kwargs.get("flag", SeekFlag.Unset)
+    if flag in (SeekFlag.SEEK_KEY, SeekFlag.SEEK_KEY.value):
+        return "seek_key"
+    return "seek"
+
+
+def _read_sectors(args: tuple[Any, ...], kwargs: dict[str, Any], result: Any) -> int:
+    return len(result) // constants.SECTOR_SIZE
+
+
+def _read_into_sectors(
+    args: tuple[Any, ...], kwargs: dict[str, Any], result: Any
+) -> int:
+    return int(result)
+
+
+def _readv_sectors(args: tuple[Any, ...], kwargs: dict[str, Any], result: Any) -> int:
+    # libdvdcss's own count is unreliable on Windows, see DvdCss.readv().
+    return sum(len(buffer) for buffer in args) // constants.SECTOR_SIZE
+
+
+# The DvdCss methods recorded, with how to tell their operation and sectors read.
+# open_source() and the streaming methods are recorded through the methods they call.
+_METHODS: dict[
+    str,
+    tuple[
+        Callable[[tuple[Any, ...], dict[str, Any]], str],
+        Callable[[tuple[Any, ...], dict[str, Any], Any], int] | None,
+    ],
+] = {
+    "open": (_fixed("open"), None),
+    "open_stream": (_fixed("open"), None),
+    "seek": (_seek_operation, None),
+    "read": (_fixed("read"), _read_sectors),
+    "read_into": (_fixed("read_into"), _read_into_sectors),
+    "readv": (_fixed("readv"), _readv_sectors),
+    "read_plan": (_fixed("readv"), _read_into_sectors),
+    "close": (_fixed("close"), None),
+}
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+__all__ = ("CallEvent", "Histogram", "Instrumentation")
@@ -0,0 +1,260 @@
+from __future__ import annotations
+
+import os
+from bisect import bisect_right
+from collections.abc import Iterable, Iterator
+from dataclasses import dataclass
+from typing import TYPE_CHECKING
+
+from pydvdcss._types import ReadFlag_T
+from pydvdcss.index import DiscIndex
+from pydvdcss.structs import ReadFlag, SeekFlag
+from pydvdcss.udf import Extent
+
+if TYPE_CHECKING:
+    from pydvdcss.dvdcss import DvdCss
+
+
+@dataclass(frozen=True)
+class ReadStep:
+    """One read of a ReadPlan, with the seeks needed before it."""
+
+    start: int
+    """First sector to read."""
+    count: int
+    """Number of sectors to read."""
+    seek_flag: SeekFlag | None
+    """Seek to `start` with this flag before reading, or None if the previous step
+    ended at `start` and no seek is needed."""
+    key_sector: int | None = None
+    """Seek here with SeekFlag.SEEK_KEY first to switch to the title key of the VOB
+    the step is in, if it's not the current key and `start` is not its first sector."""
+
+
+@dataclass(frozen=True)
+class ReadPlan:
+    """The seeks and reads of a set of sector ranges, made by ReadPlanner.plan()."""
+
+    ranges: tuple[Extent, ...]
+    """The ranges asked for, sorted and merged where they overlap or touch."""
+    steps: tuple[ReadStep, ...]
+    """The reads, in disc order."""
+    flag: ReadFlag
+    """Reading Flag of every read."""
+
+    @property
+    def seeks(self) -> int:
+        """Number of seeks the plan makes, including title key seeks."""
+        return sum(
+            (step.seek_flag is not None) + (step.key_sector is not None)
+            for step in self.steps
+        )
+
+    @property
+    def key_seeks(self) -> int:
+        """Number of seeks with SeekFlag.SEEK_KEY the plan makes."""
+        return sum(
+            step.key_sector is not None or step.seek_flag == SeekFlag.SEEK_KEY
+            for step in self.steps
+        )
+
+    @property
+    def sectors(self) -> int:
+        """Number of sectors the plan reads."""
+        return sum(step.count for step in self.steps)
+
+    def execute(self, dvdcss: DvdCss) -> Iterator[tuple[int, bytes]]:
+        """
+        Seek and read as planned.
+
+        The DvdCss must be where the plan assumed it is, see ReadPlanner.plan().
+
+        Raises:
+            NoDeviceError: No DVD device or directory is open yet.
+            SeekError: Failure seeking, e.g. the title key could not be obtained.
+            ReadError: Failure reading sectors, or returned data is less than expected.
+
+        Yields the first sector and the data of each step's read.
+        """
+        for step in self.steps:
+            if step.key_sector is not None:
+                dvdcss.seek(step.key_sector, SeekFlag.SEEK_KEY)
+            if step.seek_flag is not None:
+                dvdcss.seek(step.start, step.seek_flag)
+            yield step.start, dvdcss.read(step.count, self.flag)
+
+
+class ReadPlanner:
+    """
+    Plan the fewest and cheapest seeks to read a set of sector ranges.
+
+    The ranges are sorted and merged, then read in disc order in reads of up to
+    `max_read` sectors. No seek is made when a read carries on from where the last one
+    ended. With a DiscIndex, the planner knows which VOBs share a CSS title key and
+    where each starts, so for decrypted reads it picks each seek's flag itself:
+
+    - SeekFlag.SEEK_KEY only when a read enters a VOB with a different title key, at
+      the VOB's first sector. libdvdcss only recognises a key it already has when
+      seeked to where it obtained it, so this never derives a key again. A read that
+      does not start there gets a second seek, without a flag.
+    - No flag for every other seek, as the current title key still applies.
+
+    Reads are split where title keys change, so one read is never decrypted with two
+    keys. Without an index the title boundaries are unknown, so every seek for a
+    decrypted read uses SeekFlag.SEEK_MPEG and libdvdcss checks the key itself.
+    """
+
+    def __init__(self, index: DiscIndex | None = None, max_read: int = 512) -> None:
+        """
+        Parameters:
+            index: The disc's index, see DvdCss.get_index(), for its title boundaries.
+            max_read: Most sectors to read at once.
+        """
+        if not isinstance(max_read, int) or max_read <= 0:
+            raise ValueError(
+                f"Expected max_read to be a positive int, not {max_read!r}"
+            )
+        self.index = index
+        self.max_read = max_read
+        self._starts: list[int] = []
+        self._regions: list[tuple[int, int, int]] = []
+        if index is not None:
+            self._regions = _key_regions(index)
+            self._starts = [start for start, _, _ in self._regions]
+
+    @classmethod
+    def for_disc(
+        cls,
+        dvdcss: DvdCss,
+        max_read: int = 512,
+        cache_dir: str | os.PathLike[str] | None = None,
+    ) -> ReadPlanner:
+        """
+        A planner for the disc open in a DvdCss, using its index if it's DVD-Video.
+
+        Parameters:
+            dvdcss: The DvdCss with the disc open.
+            max_read: Most sectors to read at once.
+            cache_dir: A directory to cache indexes in, see DvdCss.get_index().
+        """
+        try:
+            index = dvdcss.get_index(cache_dir)
+        except (ValueError, FileNotFoundError):
+            index = None
+        return cls(index, max_read)
+
+    def key_sector(self, sector: int) -> int | None:
+        """
+        The sector a sector's title key is obtained at, or None if the sector is not
+        in a VOB, or there's no index to tell.
+        """
+        i = bisect_right(self._starts, sector) - 1
+        if i >= 0 and sector < self._regions[i][1]:
+            return self._regions[i][2]
+        return None
+
+    def plan(
+        self,
+        ranges: Iterable[Extent | tuple[int, int]],
+        flag: ReadFlag_T = ReadFlag.READ_DECRYPT,
+        position: int | None = None,
+        key: int | None = None,
+    ) -> ReadPlan:
+        """
+        Plan the reads of a set of sector ranges.
+
+        Parameters:
+            ranges: The ranges to read as Extents or (start, count) tuples, in any
+                order, and overlapping or not.
+            flag: Reading Flag of every read. Title keys are only planned for with
+                ReadFlag.READ_DECRYPT.
+            position: The sector the DvdCss is at, if known, to skip the first seek
+                when the first read starts there.
+            key: The key sector of the title key the DvdCss has, if known, see
+                key_sector().
+
+        Returns the ReadPlan, run it with ReadPlan.execute().
+        """
+        flag = ReadFlag(flag)
+        decrypt = flag == ReadFlag.READ_DECRYPT
+        merged = _merge_ranges(ranges)
+
+        steps = []
+        for extent in merged:
+            sector = extent.start
+            while sector < extent.end:
+                end = min(extent.end, sector + self.max_read, self._boundary(sector))
+                step_key = self.key_sector(sector) if decrypt else None
+                key_sector = None
+                if step_key is not None and step_key != key:
+                    if sector == step_key:
+                        seek_flag: SeekFlag | None = SeekFlag.SEEK_KEY
+                    else:
+                        key_sector, seek_flag = step_key, SeekFlag.Unset
+                    key = step_key
+                elif sector == position:
+                    seek_flag = None
+                elif decrypt and self.index is None:
+                    seek_flag = SeekFlag.SEEK_MPEG
+                else:
+                    seek_flag = SeekFlag.Unset
+                steps.append(ReadStep(sector, end - sector, seek_flag, key_sector))
+                position = sector = end
+
+        return ReadPlan(ranges=tuple(merged), steps=tuple(steps), flag=flag)
+
+    def _boundary(self, sector: int) -> int:
+        # The first sector after `sector` where the title key may change.
+        i = bisect_right(self._starts, sector) - 1
+        if i >= 0 and sector < self._regions[i][1]:
+            return self._regions[i][1]
+        if i + 1 < len(self._regions):
+            return self._regions[i + 1][0]
+        return sector + self.max_read
+
+
+def _merge_ranges(ranges: Iterable[Extent | tuple[int, int]]) -> list[Extent]:
+    extents = sorted(
+        (
+            extent if isinstance(extent, Extent) else Extent(*extent)
+            for extent in ranges
+        ),
+        key=lambda extent: extent.start,
+    )
+    merged: list[Extent] = []
+    for extent in extents:
+        if extent.count <= 0:
+            continue
+        if merged and extent.start <= merged[-1].end:
+            last = merged[-1]
+            merged[-1] = Extent(last.start, max(last.end, extent.end) - last.start)
+        else:
+            merged.append(extent)
+    return merged
+
+
+def _key_regions(index: DiscIndex) -> list[tuple[int, int, int]]:
+    # Runs of sectors as (start, end, key sector), for every VOB that has a title key.
+    # A title set's title VOBs (VTS_xx_1.VOB to VTS_xx_9.VOB) share the first's key.
+    regions: list[tuple[int, int, int]] = []
+    for name, key_sector in index.key_sectors.items():
+        names = [name]
+        if name.endswith("_1.VOB"):
+            names += [f"{name[:-5]}{part}.VOB" for part in range(2, 10)]
+        regions.extend(
+            (extent.start, extent.end, key_sector)
+            for vob in names
+            for extent in index.files.get(f"/VIDEO_TS/{vob}", ())
+        )
+    regions.sort()
+
+    merged: list[tuple[int, int, int]] = []
+    for start, end, key_sector in regions:
+        if merged and merged[-1][2] == key_sector and merged[-1][1] == start:
+            merged[-1] = (merged[-1][0], end, key_sector)
+        else:
+            merged.append((start, end, key_sector))
+    return merged
+
+
+__all__ = ("ReadPlan", "ReadPlanner", "ReadStep")
@@ -0,0 +1,351 @@
+from __future__ import annotations
+
+import os
+import threading
+import time
+from collections import deque
+from collections.abc import Iterator
+from contextlib import contextmanager, suppress
+from dataclasses import dataclass
+
+from pydvdcss import exceptions
+from pydvdcss._types import ReadFlag_T, SeekFlag_T, WritableBuffer_T
+from pydvdcss.buffers import SectorBufferPool
+from pydvdcss.dvdcss import DvdCss
+from pydvdcss.structs import ReadFlag, SeekFlag
+
+
+@dataclass(frozen=True)
+class DvdCssPoolStats:
+    """A snapshot of a DvdCssPool's counters."""
+
+    opened: int
+    """Number of handles that were opened by the pool."""
+    reused: int
+    """Number of leases that were served by an idle handle."""
+    closed: int
+    """Number of handles closed for being idle too long, unhealthy, or on clear()."""
+    unhealthy: int
+    """Number of handles closed after a libdvdcss error or a failed health check."""
+    idle: int
+    """Number of handles currently open and idle."""
+    in_use: int
+    """Number of handles currently leased."""
+
+
+class DvdCssPool:
+    """
+    A thread-safe pool of open DvdCss handles to one target, leased per request.
+
+    A DvdCss's seek() and read() share the handle's position, so threads sharing one
+    must take turns. The pool opens up to `size` handles to the same ISO image file or
+    VOB/IFO structure directory and leases each to one thread at a time, so reads run
+    in parallel. ctypes releases the GIL while libdvdcss reads and descrambles.
+
+    The first handle obtains every title key with DvdCss.prewarm_keys() before any
+    other handle is opened. libdvdcss saves them in its key cache (DVDCSS_CACHE, or
+    `cache_dir`), so the other handles load them rather than crack them again.
+
+    Handles are opened when first needed. Idle handles are closed after `idle_timeout`
+    seconds, and a handle whose lease failed with a libdvdcss error is closed rather
+    than reused, so a new one is opened in its place.
+
+    Any handle may serve any sector, so decrypted reads seek with SeekFlag.SEEK_MPEG
+    for libdvdcss to switch to the title key of the sector being read.
+
+        pool = DvdCssPool("movie.iso", size=8)
+        data = pool.read(sector, 16, ReadFlag.READ_DECRYPT)
+        with pool.lease() as dvd:
+            ...
+    """
+
+    def __init__(
+        self,
+        target: str | os.PathLike[str],
+        size: int | None = None,
+        cache_dir: str | os.PathLike[str] | None = None,
+        idle_timeout: float | None = 60.0,
+        prewarm: bool = True,
+        buffer_pool: SectorBufferPool | None = None,
+    ) -> None:
+        """
+        Parameters:
+            target: An ISO image file or VOB/IFO structure directory. A block device
+                may be given, but its reads do not run in parallel.
+            size: Most handles to open, defaults to the number of CPUs.
+            cache_dir: Directory of libdvdcss's key cache, shared by every handle.
+                Defaults to the DVDCSS_CACHE environment variable or libdvdcss's
+                default. Title keys are not shared if the key cache is off.
+            idle_timeout: Seconds a handle may stay idle before it's closed. Use None
+                to keep idle handles open until trim() or clear() is called.
+            prewarm: Obtain every title key with the first handle, see
+                DvdCss.prewarm_keys(). Skipped if the disc is not DVD-Video.
+            buffer_pool: A SectorBufferPool shared by every handle's read().
+        """
+        size = size if size is not None else os.cpu_count() or 4
+        if not isinstance(size, int) or size <= 0:
+            raise ValueError(f"Expected size to be a positive int, not {size!r}")
+
+        self.target = os.fspath(target)
+        self.size = size
+        self.cache_dir = cache_dir
+        self.idle_timeout = idle_timeout
+        self.prewarm = prewarm
+        self.buffer_pool = buffer_pool
+
+        self._condition = threading.Condition()
+        self._prime_lock = threading.Lock()
+        self._primed = False
+        self._idle: deque[tuple[DvdCss, float]] = deque()
+        self._open = 0
+        self._leased = 0
+        self._opened = 0
+        self._reused = 0
+        self._closed = 0
+        self._unhealthy = 0
+
+    def acquire(self, timeout: float | None = None) -> DvdCss:
+        """
+        Take an open handle, opening a new one if none are idle and there's room.
+
+        Hand it back with release() once you are finished with it, or use lease().
+
+        Parameters:
+            timeout: Most seconds to wait for a handle when all are in use, or None
+                to wait as long as it takes.
+
+        Raises:
+            TimeoutError: No handle became free within the timeout.
+            OpenFailureError: Failure opening a new handle.
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._condition:
+            self._close_expired(time.monotonic())
+            while True:
+                if self._idle:
+                    dvdcss, _ = self._idle.pop()
+                    self._reused += 1
+                    self._leased += 1
+                    return dvdcss
+                if self._open < self.size:
+                    self._open += 1
+                    break
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    raise TimeoutError(
+                        f"No handle to {self.target} was free within {timeout}s."
+                    )
+                self._condition.wait(remaining)
+
+        try:
+            dvdcss = self._new()
+        except BaseException:
+            with self._condition:
+                self._open -= 1
+                self._condition.notify()
+            raise
+        with self._condition:
+            self._opened += 1
+            self._leased += 1
+        return dvdcss
+
+    def release(self, dvdcss: DvdCss, healthy: bool = True) -> None:
+        """
+        Return a handle taken with acquire() to the pool.
+
+        Parameters:
+            dvdcss: The handle.
+            healthy: Whether it can be reused. An unhealthy handle is closed.
+        """
+        with self._condition:
+            self._leased -= 1
+            if healthy and dvdcss.handle is not None:
+                self._idle.append((dvdcss, time.monotonic()))
+            else:
+                self._unhealthy += 1
+                self._close(dvdcss)
+            self._condition.notify()
+
+    @contextmanager
+    def lease(self, timeout: float | None = None) -> Iterator[DvdCss]:
+        """
+        Acquire a handle for the duration of a with block, then release it.
+
+        The handle is closed rather than reused if the block raises a libdvdcss
+        error, e.g. a SeekError or ReadError.
+        """
+        dvdcss = self.acquire(timeout)
+        healthy = True
+        try:
+            yield dvdcss
+        except exceptions.PyDvdCssError:
+            healthy = False
+            raise
+        finally:
+            self.release(dvdcss, healthy)
+
+    def read(
+        self,
+        sector: int,
+        count: int,
+        flag: ReadFlag_T = ReadFlag.Unset,
+        seek_flag: SeekFlag_T | None = None,
+    ) -> bytes:
+        """
+        Seek to and read sectors on a leased handle, as one atomic operation.
+
+        Parameters:
+            sector: Sector to read from.
+            count: Number of sectors to read.
+            flag: Reading Flag. See DvdCss.read().
+            seek_flag: Seeking Flag. See DvdCss.seek(). Defaults to SeekFlag.SEEK_MPEG
+                when decrypting, so libdvdcss uses the title key of the sector's title
+                whichever title the handle was last in, and SeekFlag.Unset otherwise.
+
+        Raises:
+            TimeoutError, OpenFailureError: See acquire().
+            SeekError: Failure seeking to the sector.
+            ReadError: Failure reading sectors, or returned data is less than expected.
+
+        Returns the sectors read.
+        """
+        with self.lease() as dvdcss:
+            dvdcss.seek(sector, _seek_flag(flag, seek_flag))
+            return dvdcss.read(count, flag)
+
+    def read_into(
+        self,
+        sector: int,
+        buffer: WritableBuffer_T,
+        flag: ReadFlag_T = ReadFlag.Unset,
+        seek_flag: SeekFlag_T | None = None,
+    ) -> int:
+        """
+        Seek to and read sectors into a buffer on a leased handle, as one atomic
+        operation. See read() and DvdCss.read_into().
+
+        Returns the number of sectors read.
+        """
+        with self.lease() as dvdcss:
+            dvdcss.seek(sector, _seek_flag(flag, seek_flag))
+            return dvdcss.read_into(buffer, flag)
+
+    def check(self) -> int:
+        """
+        Check every idle handle can still seek and read, closing those that can't.
+
+        The handles are taken out of the pool while they're checked, but not leased,
+        so they count as neither idle nor in use in stats.
+
+        Returns the number of handles closed.
+        """
+        with self._condition:
+            idle = list(self._idle)
+            self._idle.clear()
+        failed = 0
+        for dvdcss, since in idle:
+            try:
+                dvdcss.seek(0)
+                dvdcss.read(1)
+            except exceptions.PyDvdCssError:
+                failed += 1
+                with self._condition:
+                    self._unhealthy += 1
+                    self._close(dvdcss)
+                    self._condition.notify()
+                continue
+            with self._condition:
+                self._idle.append((dvdcss, since))
+                self._condition.notify()
+        return failed
+
+    def trim(self, idle_timeout: float | None = None) -> int:
+        """
+        Close handles that have been idle for too long.
+
+        Parameters:
+            idle_timeout: Seconds a handle may have been idle for. Defaults to the
+                pool's idle_timeout. Use 0 to close every idle handle.
+
+        Returns the number of handles closed.
+        """
+        with self._condition:
+            before = len(self._idle)
+            self._close_expired(time.monotonic(), idle_timeout)
+            return before - len(self._idle)
+
+    def clear(self) -> int:
+        """Close every idle handle. Returns the number of handles closed."""
+        return self.trim(0)
+
+    def close(self) -> None:
+        """Close every idle handle. Leased handles are closed as they're released."""
+        self.clear()
+
+    def __enter__(self) -> DvdCssPool:
+        return self
+
+    def __exit__(self, *_: object) -> None:
+        self.close()
+
+    @property
+    def stats(self) -> DvdCssPoolStats:
+        """A snapshot of the pool's counters."""
+        with self._condition:
+            return DvdCssPoolStats(
+                opened=self._opened,
+                reused=self._reused,
+                closed=self._closed,
+                unhealthy=self._unhealthy,
+                idle=len(self._idle),
+                in_use=self._leased,
+            )
+
+    def _new(self) -> DvdCss:
+        dvdcss = DvdCss(buffer_pool=self.buffer_pool)
+        if self._primed:
+            dvdcss.open(self.target, self.cache_dir)
+            return dvdcss
+        # Only one handle obtains the keys, the rest wait to load them from the cache.
+        with self._prime_lock:
+            dvdcss.open(self.target, self.cache_dir)
+            if not self._primed:
+                try:
+                    if self.prewarm:
+                        with suppress(ValueError, FileNotFoundError):
+                            dvdcss.prewarm_keys()
+                except BaseException:
+                    dvdcss.close()
+                    raise
+                self._primed = True
+        return dvdcss
+
+    def _close(self, dvdcss: DvdCss) -> None:
+        # Called with the condition held.
+        self._open -= 1
+        self._closed += 1
+        with suppress(exceptions.PyDvdCssError):
+            dvdcss.close()
+
+    def _close_expired(self, now: float, idle_timeout: float | None = None) -> None:
+        if idle_timeout is None:
+            idle_timeout = self.idle_timeout
+        if idle_timeout is None:
+            return
+        # Handles are appended as they're released, so the oldest are on the left.
+        while self._idle and now - self._idle[0][1] >= idle_timeout:
+            dvdcss, _ = self._idle.popleft()
+            self._close(dvdcss)
+
+
+def _seek_flag(flag: ReadFlag_T, seek_flag: SeekFlag_T | None) -> SeekFlag_T:
+    # Handles are leased for any sector, so a decrypted read can't rely on the key of
+    # the title the handle was last in.
+    if seek_flag is not None:
+        return seek_flag
+    if ReadFlag(flag) == ReadFlag.READ_DECRYPT:
+        return SeekFlag.SEEK_MPEG
+    return SeekFlag.Unset
+
+
+__all__ = ("DvdCssPool", "DvdCssPoolStats")
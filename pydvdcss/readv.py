@@ -0,0 +1,119 @@
+from __future__ import annotations
+
+from ctypes import Array, addressof, c_char, sizeof
+
+from pydvdcss import constants
+from pydvdcss._types import ReadFlag_T, WritableBuffer_T
+from pydvdcss.structs import Iovec, ReadFlag
+
+
+class ReadvPlan:
+    """
+    A vectored read over a fixed set of buffers, validated and packed once.
+
+    DvdCss.readv() checks its buffers, builds an iovec array, and converts the flag on
+    every call, which costs more than the read itself for small reads. A plan does all
+    of that once, and DvdCss.read_plan() then passes the same iovec array to libdvdcss
+    on every call.
+
+    To read into a ring of buffer sets without building a plan for each, rebase() the
+    plan onto the next set; only the iovec addresses are updated.
+
+        plan = ReadvPlan(*pool_buffers, flag=ReadFlag.READ_DECRYPT)
+        while ...:
+            dvd.read_plan(plan)
+    """
+
+    def __init__(
+        self, *buffers: WritableBuffer_T, flag: ReadFlag_T = ReadFlag.Unset
+    ) -> None:
+        """
+        Parameters:
+            buffers: One or more buffers to read into, in order. Any writable,
+                C-contiguous buffer-protocol object, e.g. a ctypes char array from
+                aligned_buffer() or a SectorBufferPool, a bytearray, or a memoryview.
+                Each buffer's size in bytes must be a non-zero multiple of a sector.
+            flag: Reading Flag, used for every read. See DvdCss.readv().
+
+        Raises:
+            TypeError: A buffer is read-only or not a buffer-protocol object, or the
+                flag is not a ReadFlag.
+            ValueError: No buffers given, or a buffer is not a non-zero sector multiple
+                or not contiguous.
+        """
+        if not buffers:
+            raise ValueError("At least one buffer is required.")
+        if isinstance(flag, int):
+            flag = ReadFlag(flag)
+        elif not isinstance(flag, ReadFlag):
+            raise TypeError(
+                f"Expected flag to be an int or ReadFlag enum, not {flag!r}"
+            )
+
+        self.flag = flag
+        self.sizes = tuple(_size(buffer) for buffer in buffers)
+        """Size of each buffer in bytes."""
+        self.sectors = sum(self.sizes) // constants.SECTOR_SIZE
+        """Total number of sectors each read fills."""
+        self.iovecs = (Iovec * len(buffers))()
+        """The iovec array passed to libdvdcss."""
+        self.count = len(buffers)
+        """Number of iovec entries."""
+        self.flag_value = flag.value
+        """The flag as passed to libdvdcss."""
+        self.buffers: tuple[Array[c_char], ...] = ()
+        self.rebase(*buffers)
+
+    def rebase(self, *buffers: WritableBuffer_T) -> None:
+        """
+        Point the plan at another set of buffers with the same sizes, e.g. the next
+        slot of a ring of buffers, without building a new iovec array.
+
+        Raises:
+            TypeError: A buffer is read-only or not a buffer-protocol object.
+            ValueError: The number of buffers or their sizes differ from the plan's.
+        """
+        sizes = tuple(_size(buffer) for buffer in buffers)
+        if sizes != self.sizes:
+            raise ValueError(
+                f"Expected buffers of {self.sizes} bytes, got buffers of {sizes} bytes"
+            )
+        arrays = tuple(_array(buffer) for buffer in buffers)
+        for iovec, array in zip(self.iovecs, arrays, strict=True):
+            iovec.iov_base = addressof(array)
+            iovec.iov_len = sizeof(array)
+        # Keep the arrays, and so the buffers they map, alive while they're pointed at.
+        self.buffers = arrays
+
+    def __len__(self) -> int:
+        """Total size of the buffers in bytes."""
+        return self.sectors * constants.SECTOR_SIZE
+
+
+def _size(buffer: WritableBuffer_T) -> int:
+    if isinstance(buffer, Array):
+        size = sizeof(buffer)
+    else:
+        view = memoryview(buffer)
+        if view.readonly:
+            raise TypeError("Expected a writable buffer, but it's read-only.")
+        if not view.c_contiguous:
+            raise ValueError("Expected a C-contiguous buffer.")
+        size = view.nbytes
+    if size == 0 or size % constants.SECTOR_SIZE:
+        raise ValueError(
+            f"Each buffer must be a non-zero multiple of a sector "
+            f"({constants.SECTOR_SIZE} bytes), got one of {size} bytes"
+        )
+    return size
+
+
+def _array(buffer: WritableBuffer_T) -> Array[c_char]:
+    # A ctypes char array over the buffer's memory, to take its address.
+    if isinstance(buffer, Array):
+        return buffer
+    view = memoryview(buffer).cast("B")
+    return (c_char * len(view)).from_buffer(view)
+
+
+__all__ = ("ReadvPlan",)
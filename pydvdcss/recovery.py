@@ -0,0 +1,338 @@
+from __future__ import annotations
+
+import os
+import threading
+import time
+from collections.abc import Callable, Iterator
+from dataclasses import dataclass
+from pathlib import Path
+from typing import TYPE_CHECKING, BinaryIO
+
+from pydvdcss import constants, exceptions
+from pydvdcss._types import ReadFlag_T, SeekFlag_T
+from pydvdcss.buffers import aligned_buffer
+from pydvdcss.structs import ReadFlag, SeekFlag
+from pydvdcss.udf import Extent
+from pydvdcss.utilities import write_all
+
+if TYPE_CHECKING:
+    from pydvdcss.dvdcss import DvdCss
+
+UNTRIED = "?"
+"""Status of sectors not read yet."""
+BAD = "-"
+"""Status of sectors that failed to read, zero-filled in the output."""
+FINISHED = "+"
+"""Status of sectors read successfully."""
+
+
+class SectorMap:
+    """
+    A map of which sectors of a disc were read, failed, or are yet to be tried.
+
+    It is kept as runs of sectors with the same status, so it stays small however
+    large the disc is, and saved in GNU ddrescue's mapfile format (positions and sizes
+    in bytes), so it can be inspected with ddrescuelog or used to resume with ddrescue.
+    """
+
+    def __init__(
+        self, sectors: int, path: str | os.PathLike[str] | None = None
+    ) -> None:
+        """
+        Parameters:
+            sectors: Number of sectors of the disc, all untried to begin with.
+            path: Where save() writes the map to by default.
+        """
+        self.sectors = sectors
+        self.path = Path(path) if path is not None else None
+        self._runs: list[tuple[int, int, str]] = (
+            [(0, sectors, UNTRIED)] if sectors else []
+        )
+
+    @classmethod
+    def load(cls, path: str | os.PathLike[str]) -> SectorMap:
+        """
+        Load a map saved with save(), or a ddrescue mapfile of whole sectors.
+
+        Statuses ddrescue uses for sectors it has yet to trim or scrape are loaded as
+        bad, so they're retried.
+
+        Raises:
+            ValueError: The file is not a valid mapfile.
+        """
+        runs = []
+        status_line = True
+        for line in Path(path).read_text(encoding="utf8").splitlines():
+            fields = line.split()
+            if not fields or fields[0].startswith("#"):
+                continue
+            if status_line:
+                # The first line is the current position, status, and pass.
+                status_line = False
+                continue
+            position, size, status = int(fields[0], 0), int(fields[1], 0), fields[2]
+            if position % constants.SECTOR_SIZE or size % constants.SECTOR_SIZE:
+                raise ValueError(f"The mapfile is not in whole sectors: {line!r}")
+            if status not in (UNTRIED, FINISHED):
+                status = BAD
+            runs.append(
+                (
+                    position // constants.SECTOR_SIZE,
+                    size // constants.SECTOR_SIZE,
+                    status,
+                )
+            )
+
+        sector_map = cls(sum(count for _, count, _ in runs), path)
+        for start, count, status in runs:
+            sector_map.mark(start, count, status)
+        return sector_map
+
+    def save(self, path: str | os.PathLike[str] | None = None) -> None:
+        """
+        Save the map, replacing the file at once so it's never left half-written.
+
+        Parameters:
+            path: Where to save it, defaults to the map's own path.
+        """
+        path = Path(path) if path is not None else self.path
+        if path is None:
+            raise ValueError("The map has no path to save to, give one.")
+        lines = [
+            "# Mapfile. Created by pydvdcss",
+            "# current_pos  current_status  current_pass",
+            f"0x{self.position * constants.SECTOR_SIZE:08X}     {self.status}     1",
+            "#      pos        size  status",
+        ]
+        lines += [
+            f"0x{start * constants.SECTOR_SIZE:08X}  "
+            f"0x{count * constants.SECTOR_SIZE:08X}  {status}"
+            for start, count, status in self._runs
+        ]
+        temp = path.with_name(path.name + ".tmp")
+        with temp.open("w", encoding="utf8") as f:
+            f.write("\n".join(lines) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+        temp.replace(path)
+
+    @property
+    def position(self) -> int:
+        """The first sector not finished, or the end of the disc if all are."""
+        return next(
+            (s for s, _, status in self._runs if status != FINISHED), self.sectors
+        )
+
+    @property
+    def status(self) -> str:
+        """The status of the sectors left, for the mapfile's current status."""
+        statuses = {status for _, _, status in self._runs}
+        if UNTRIED in statuses:
+            return UNTRIED
+        return BAD if BAD in statuses else FINISHED
+
+    def mark(self, start: int, count: int, status: str) -> None:
+        """Set the status of a range of sectors."""
+        if count <= 0:
+            return
+        end = start + count
+        runs = []
+        for run_start, run_count, run_status in self._runs:
+            run_end = run_start + run_count
+            if run_end <= start or run_start >= end:
+                runs.append((run_start, run_count, run_status))
+                continue
+            if run_start < start:
+                runs.append((run_start, start - run_start, run_status))
+            if run_end > end:
+                runs.append((end, run_end - end, run_status))
+        runs.append((start, count, status))
+        runs.sort()
+
+        merged: list[tuple[int, int, str]] = []
+        for run in runs:
+            if merged and merged[-1][2] == run[2] and sum(merged[-1][:2]) == run[0]:
+                merged[-1] = (merged[-1][0], merged[-1][1] + run[1], run[2])
+            else:
+                merged.append(run)
+        self._runs = merged
+        self.sectors = max(self.sectors, end)
+
+    def ranges(self, status: str) -> list[Extent]:
+        """The runs of sectors with a status, in order."""
+        return [Extent(start, count) for start, count, s in self._runs if s == status]
+
+    def count(self, status: str) -> int:
+        """The number of sectors with a status."""
+        return sum(count for _, count, s in self._runs if s == status)
+
+    def __iter__(self) -> Iterator[tuple[Extent, str]]:
+        """Every run of sectors and its status, in order."""
+        return ((Extent(start, count), status) for start, count, status in self._runs)
+
+
+@dataclass(frozen=True)
+class RescueResult:
+    """The outcome of a rescue()."""
+
+    finished: int
+    """Number of sectors read successfully, in total over every rescue of the map."""
+    bad: int
+    """Number of sectors that could not be read, zero-filled in the output."""
+    untried: int
+    """Number of sectors not tried yet, if the rescue was cancelled."""
+    seconds: float
+    """Time this rescue took in seconds."""
+
+    @property
+    def complete(self) -> bool:
+        """Whether every sector was read successfully."""
+        return not self.bad and not self.untried
+
+
+def rescue(
+    dvdcss: DvdCss,
+    output: BinaryIO,
+    sector_map: SectorMap,
+    chunk: int = 512,
+    split_limit: int = 16,
+    retries: int = 2,
+    flag: ReadFlag_T = ReadFlag.Unset,
+    seek_flag: SeekFlag_T = SeekFlag.Unset,
+    save_interval: float = 10.0,
+    cancel: threading.Event | None = None,
+    progress: Callable[[SectorMap], object] | None = None,
+) -> RescueResult:
+    """
+    Read a damaged disc to an image, isolating bad sectors instead of failing, like
+    GNU ddrescue.
+
+    The first pass reads every untried sector in chunks of `chunk` sectors. When a chunk
+    fails it is split in half and each half read again, down to `split_limit`
+    sectors, so the good sectors around damage are kept while a bad area costs only a
+    few failed reads. Pieces that still fail are marked bad. Then up to `retries` more
+    passes read the bad sectors one at a time. Bad sectors are zero-filled in the
+    output, so it always has the disc's layout.
+
+    Progress is kept in the SectorMap, saved to its path (if any) at least every
+    `save_interval` seconds and when done. Rescue again with the same map and output to
+    carry on where it stopped, or to retry the sectors still bad.
+
+    Parameters:
+        dvdcss: The DvdCss with the disc open.
+        output: A seekable binary file object opened for writing, without truncating
+            it when resuming ("r+b"). Sector `n` is written at byte n * 2048.
+        sector_map: The map of sectors to read, see SectorMap. Only untried sectors,
+            then bad ones, are read.
+        chunk: Number of sectors to read at once in the first pass.
+        split_limit: Size in sectors at which a failing piece stops being split in the
+            first pass and is left for the retry passes.
+        retries: Number of passes over the bad sectors, one sector at a time.
+        flag: Reading Flag, used for every read. See DvdCss.read().
+        seek_flag: Seeking Flag, used for every seek. See DvdCss.seek().
+        save_interval: Seconds between saves of the map while rescuing.
+        cancel: An event that stops the rescue once set, after the current read.
+        progress: Called with the map after each read.
+
+    Raises:
+        NoDeviceError: No DVD device or directory is open yet.
+        ValueError: Invalid chunk, split_limit, or retries.
+        OSError: Failure writing to the output or saving the map.
+
+    Returns a RescueResult with the number of sectors finished, bad, and untried.
+    """
+    if dvdcss.handle is None:
+        raise exceptions.NoDeviceError(
+            "No DVD device or directory is open yet, use open() first."
+        )
+    if not isinstance(chunk, int) or chunk <= 0:
+        raise ValueError(f"Expected chunk to be a positive int, not {chunk!r}")
+    if not isinstance(split_limit, int) or split_limit <= 0:
+        raise ValueError(
+            f"Expected split_limit to be a positive int, not {split_limit!r}"
+        )
+    if not isinstance(retries, int) or retries < 0:
+        raise ValueError(f"Expected retries to be a non-negative int, not {retries!r}")
+
+    view = memoryview(aligned_buffer(chunk * constants.SECTOR_SIZE)).cast("B")
+    zeros = memoryview(bytes(min(chunk, split_limit) * constants.SECTOR_SIZE))
+    began = time.perf_counter()
+    saved = began
+    position: int | None = None  # Where the drive is, if known, to skip seeking.
+
+    def read(start: int, count: int) -> bool:
+        nonlocal position, saved
+        try:
+            if position != start:
+                dvdcss.seek(start, seek_flag)
+            dvdcss.read_into(view[: count * constants.SECTOR_SIZE], flag)
+        except (exceptions.ReadError, exceptions.SeekError):
+            position = None
+            ok = False
+        else:
+            position = start + count
+            output.seek(start * constants.SECTOR_SIZE)
+            write_all(output, view[: count * constants.SECTOR_SIZE])
+            sector_map.mark(start, count, FINISHED)
+            ok = True
+
+        if progress:
+            progress(sector_map)
+        if sector_map.path and time.perf_counter() - saved >= save_interval:
+            output.flush()
+            sector_map.save()
+            saved = time.perf_counter()
+        return ok
+
+    def bad(start: int, count: int) -> None:
+        output.seek(start * constants.SECTOR_SIZE)
+        for offset in range(0, count, len(zeros) // constants.SECTOR_SIZE):
+            size = min(count - offset, len(zeros) // constants.SECTOR_SIZE)
+            write_all(output, zeros[: size * constants.SECTOR_SIZE])
+        sector_map.mark(start, count, BAD)
+
+    def split(start: int, count: int) -> None:
+        # Read a failed piece by halves, until the pieces are small enough to give up.
+        if count <= split_limit:
+            bad(start, count)
+            return
+        half = count // 2
+        for piece_start, piece_count in ((start, half), (start + half, count - half)):
+            if cancel and cancel.is_set():
+                return
+            if not read(piece_start, piece_count):
+                split(piece_start, piece_count)
+
+    def passes() -> None:
+        # Returns as soon as the rescue is cancelled, from whichever pass it's in.
+        for extent in sector_map.ranges(UNTRIED):
+            for start in range(extent.start, extent.end, chunk):
+                if cancel and cancel.is_set():
+                    return
+                count = min(chunk, extent.end - start)
+                if not read(start, count):
+                    split(start, count)
+
+        for _ in range(retries):
+            for extent in sector_map.ranges(BAD):
+                for sector in range(extent.start, extent.end):
+                    if cancel and cancel.is_set():
+                        return
+                    read(sector, 1)
+
+    try:
+        passes()
+    finally:
+        output.flush()
+        if sector_map.path:
+            sector_map.save()
+
+    return RescueResult(
+        finished=sector_map.count(FINISHED),
+        bad=sector_map.count(BAD),
+        untried=sector_map.count(UNTRIED),
+        seconds=time.perf_counter() - began,
+    )
+
+
+__all__ = ("BAD", "FINISHED", "UNTRIED", "RescueResult", "SectorMap", "rescue")
@@ -0,0 +1,96 @@
+from __future__ import annotations
+
+import importlib
+from typing import Any
+
+from pydvdcss import constants
+from pydvdcss._types import WritableBuffer_T
+
+_numpy: Any
+try:
+    _numpy = importlib.import_module("numpy")
+except ImportError:
+    _numpy = None
+
+PACK_START = b"\x00\x00\x01\xba"
+"""Every VOB sector starts with an MPEG-2 program stream pack header."""
+
+SCRAMBLING_OFFSET = 0x14
+"""Offset of the PES header flags holding the scrambling control bits, following the
+pack header. libdvdcss checks the same byte when descrambling."""
+
+SCRAMBLING_MASK = 0x30
+"""The PES scrambling control bits, non-zero when the sector is scrambled."""
+
+# bytes.translate() tables mapping each byte to 1 where a condition holds, else 0.
+_SCRAMBLED = bytes(int(bool(value & SCRAMBLING_MASK)) for value in range(256))
+_EQUALS = {
+    value: bytes(int(other == value) for other in range(256))
+    for value in set(PACK_START)
+}
+
+
+def scrambled_sectors(buffer: WritableBuffer_T | bytes) -> list[int]:
+    """
+    Find the sectors in a buffer that are still scrambled.
+
+    A sector is scrambled if it's a VOB sector, starting with a pack header, with the
+    PES scrambling control bits set. After a read with ReadFlag.READ_DECRYPT, these are
+    the sectors libdvdcss could not descramble, e.g. as it had no title key for them,
+    which it otherwise does not report.
+
+    The whole buffer is checked at once rather than sector by sector. With numpy
+    installed the sectors are checked as an array, otherwise the bytes of interest
+    are gathered from every sector with strided memoryview slices and combined as
+    integers. Either way no Python code runs per sector unless it's scrambled, so
+    it keeps up with reading.
+
+    Parameters:
+        buffer: Any C-contiguous buffer-protocol object of whole sectors, e.g. bytes,
+            a bytearray, memoryview, mmap, or ctypes array.
+
+    Raises:
+        ValueError: The buffer is not a multiple of a sector (2048 bytes).
+
+    Returns the index of each scrambled sector in the buffer, in order.
+    """
+    view = memoryview(buffer).cast("B")
+    count, remainder = divmod(view.nbytes, constants.SECTOR_SIZE)
+    if remainder:
+        raise ValueError(
+            f"The buffer must be a multiple of a sector ({constants.SECTOR_SIZE} "
+            f"bytes), got one of {view.nbytes} bytes"
+        )
+    if not count:
+        return []
+
+    if _numpy is not None:
+        sectors = _numpy.frombuffer(view, dtype=_numpy.uint8)
+        sectors = sectors.reshape(count, constants.SECTOR_SIZE)
+        scrambled = (sectors[:, SCRAMBLING_OFFSET] & SCRAMBLING_MASK) != 0
+        if scrambled.any():
+            scrambled &= (sectors[:, : len(PACK_START)] == list(PACK_START)).all(1)
+        return [int(index) for index in _numpy.flatnonzero(scrambled)]
+
+    step = constants.SECTOR_SIZE
+    flags = view[SCRAMBLING_OFFSET::step].tobytes().translate(_SCRAMBLED)
+    if 1 not in flags:
+        return []
+
+    # One byte per sector, 1 where every condition holds, AND-ed as big integers.
+    mask = int.from_bytes(flags, "big")
+    for offset, value in enumerate(PACK_START):
+        mask &= int.from_bytes(
+            view[offset::step].tobytes().translate(_EQUALS[value]), "big"
+        )
+    flags = mask.to_bytes(count, "big")
+
+    indices = []
+    index = flags.find(1)
+    while index != -1:
+        indices.append(index)
+        index = flags.find(1, index + 1)
+    return indices
+
+
+__all__ = ("scrambled_sectors",)
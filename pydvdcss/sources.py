@@ -0,0 +1,243 @@
+from __future__ import annotations
+
+import mmap
+import os
+from abc import ABC, abstractmethod
+from ctypes import c_char
+from typing import Any, BinaryIO
+
+from pydvdcss.structs import (
+    DvdCssStreamCb,
+    Iovec,
+    ReadCallback,
+    ReadvCallback,
+    SeekCallback,
+)
+
+
+class StreamSource(ABC):
+    """
+    A source of disc data for DvdCss.open_source(), e.g. an ISO image file.
+
+    It provides the dvdcss_stream_cb callbacks libdvdcss reads through when opened with
+    open_stream(), and keeps them alive for as long as the source is. The C buffers
+    libdvdcss passes to the callbacks are handed to readinto() as writable memoryviews
+    over the C memory, so a subclass fills them without any intermediate copy.
+
+    Subclass it and implement seek() and readinto(). readv() reads into each buffer
+    in turn by default, override it if the source can do better. An exception raised
+    by a callback is kept in `error` and reported to libdvdcss as a failure.
+    """
+
+    def __init__(self) -> None:
+        self.error: BaseException | None = None
+        """The exception that failed the latest callback, if any."""
+        self.callbacks = DvdCssStreamCb(
+            pf_seek=SeekCallback(self._seek),
+            pf_read=ReadCallback(self._read),
+            pf_readv=ReadvCallback(self._readv),
+        )
+        """The callbacks to pass to DvdCss.open_stream()."""
+
+    def __enter__(self) -> StreamSource:
+        return self
+
+    def __exit__(self, *_: Any, **__: Any) -> None:
+        self.close()
+
+    @abstractmethod
+    def seek(self, position: int) -> None:
+        """Seek to a byte position."""
+
+    @abstractmethod
+    def readinto(self, buffer: memoryview) -> int:
+        """
+        Read from the current position into a buffer, advancing the position.
+
+        Returns the number of bytes read, less than the size of the buffer only at the
+        end of the source.
+        """
+
+    def readv(self, buffers: list[memoryview]) -> int:
+        """
+        Read from the current position into each buffer in turn, as readinto() does.
+
+        Returns the total number of bytes read.
+        """
+        total = 0
+        for buffer in buffers:
+            read = self.readinto(buffer)
+            total += read
+            if read < len(buffer):
+                break
+        return total
+
+    def close(self) -> None:  # noqa: B027
+        """Release the source's resources. DvdCss.close() closes its source."""
+
+    def _seek(self, _: int | None, position: int) -> int:
+        try:
+            self.seek(position)
+        except Exception as e:
+            self.error = e
+            return -1
+        return 0
+
+    def _read(self, _: int | None, address: int | None, size: int) -> int:
+        try:
+            return self.readinto(_view(address, size))
+        except Exception as e:
+            self.error = e
+            return -1
+
+    def _readv(self, _: int | None, address: int | None, count: int) -> int:
+        try:
+            if not count:
+                return 0
+            vectors = (Iovec * count).from_address(address or 0)
+            return self.readv([_view(v.iov_base, v.iov_len) for v in vectors])
+        except Exception as e:
+            self.error = e
+            return -1
+
+
+class FileStreamSource(StreamSource):
+    """
+    A StreamSource that reads from a binary file object, e.g. an ISO image on a network
+    or FUSE mount, or any object with seek() and readinto().
+
+    libdvdcss's buffers are read into directly with readinto(). Vectored reads use
+    os.preadv(), a call per IOV_MAX buffers, when the file has a file descriptor and
+    the platform supports it.
+    """
+
+    def __init__(self, file: BinaryIO | str | os.PathLike[str]) -> None:
+        """
+        Parameters:
+            file: A binary file object opened for reading, or the path of a file to
+                open. A file opened from a path is closed with the source.
+        """
+        super().__init__()
+        if isinstance(file, (str, os.PathLike)):
+            self.file: BinaryIO = open(file, "rb")  # noqa: SIM115
+            self._owned = True
+        else:
+            self.file = file
+            self._owned = False
+        self._position = 0
+
+        self._fd: int | None = None
+        if hasattr(os, "preadv"):
+            try:
+                self._fd = self.file.fileno()
+            except (AttributeError, OSError, ValueError):
+                self._fd = None
+
+    def seek(self, position: int) -> None:
+        self.file.seek(position)
+        self._position = position
+
+    def readinto(self, buffer: memoryview) -> int:
+        total = 0
+        # readinto() may read less than asked before the end, e.g. on a pipe or socket.
+        while total < len(buffer):
+            read = self.file.readinto(buffer[total:])  # type: ignore[attr-defined]
+            if not read:
+                break
+            total += read
+        self._position += total
+        return total
+
+    def readv(self, buffers: list[memoryview]) -> int:
+        if self._fd is None:
+            return super().readv(buffers)
+        total = 0
+        # preadv() fails with EINVAL if given more than IOV_MAX buffers, and may read
+        # short before the end too, so carry on with the rest until the end of file.
+        while buffers:
+            read = os.preadv(self._fd, buffers[:_IOV_MAX], self._position)
+            if not read:
+                break
+            # Keep the file object's own position in step with the read.
+            self.seek(self._position + read)
+            total += read
+            buffers = _skip(buffers, read)
+        return total
+
+    def close(self) -> None:
+        if self._owned:
+            self.file.close()
+
+
+class MmapStreamSource(StreamSource):
+    """
+    A StreamSource that reads from a memory-mapped ISO image file.
+
+    Reads are a single memory copy from the mapping straight into libdvdcss's buffer,
+    with nothing in between and no system call once the pages are cached.
+    """
+
+    def __init__(self, file: BinaryIO | str | os.PathLike[str]) -> None:
+        """
+        Parameters:
+            file: The path of an ISO image file, or a binary file object of one with
+                a file descriptor. The mapping is closed with the source.
+        """
+        super().__init__()
+        if isinstance(file, (str, os.PathLike)):
+            with open(file, "rb") as f:
+                self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        else:
+            self._map = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        self._view = memoryview(self._map)
+        self._position = 0
+
+    @property
+    def size(self) -> int:
+        """Size of the image in bytes."""
+        return len(self._map)
+
+    def seek(self, position: int) -> None:
+        if not 0 <= position <= len(self._map):
+            raise ValueError(f"Cannot seek to {position}, the image is {self.size} B")
+        self._position = position
+
+    def readinto(self, buffer: memoryview) -> int:
+        end = min(self._position + len(buffer), len(self._map))
+        size = end - self._position
+        buffer[:size] = self._view[self._position : end]
+        self._position = end
+        return size
+
+    def close(self) -> None:
+        self._view.release()
+        self._map.close()
+
+
+def _iov_max() -> int:
+    # The most buffers one preadv() call takes, or the POSIX minimum if unknown.
+    try:
+        iov_max = os.sysconf("SC_IOV_MAX")
+    except (AttributeError, OSError, ValueError):
+        iov_max = -1
+    return iov_max if iov_max > 0 else 16
+
+
+_IOV_MAX = _iov_max()
+
+
+def _view(address: int | None, size: int) -> memoryview:
+    # A writable view over C memory, without copying it.
+    return memoryview((c_char * size).from_address(address or 0)).cast("B")
+
+
+def _skip(buffers: list[memoryview], size: int) -> list[memoryview]:
+    # The buffers left after the first `size` bytes have been read into them.
+    for index, buffer in enumerate(buffers):
+        if size < len(buffer):
+            return [buffer[size:], *buffers[index + 1 :]]
+        size -= len(buffer)
+    return []
+
+
+__all__ = ("FileStreamSource", "MmapStreamSource", "StreamSource")
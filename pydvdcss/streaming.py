@@ -0,0 +1,158 @@
+from __future__ import annotations
+
+import hashlib
+import zlib
+from collections.abc import Iterable, Mapping
+from dataclasses import dataclass, field
+from typing import Any
+
+from pydvdcss import constants
+
+
+class AdaptiveChunkSize:
+    """
+    Tune the number of sectors per read from the measured latency of each read.
+
+    The best read size differs a lot between an ISO on an NVMe drive, a USB drive, and
+    an optical drive. Small reads waste time on per-call overhead, while big reads on a
+    slow drive hold a lot of memory and make progress and cancellation sluggish.
+
+    The chunk size starts at `initial` and is doubled while reads finish well within
+    `target_latency`, and halved when they take longer than it. Latency is smoothed
+    over recent reads so a single slow seek or hiccup doesn't shrink the chunk size.
+    It never goes below `minimum` or above `maximum`.
+    """
+
+    def __init__(
+        self,
+        initial: int = 32,
+        minimum: int = 1,
+        maximum: int = 512,
+        target_latency: float = 0.05,
+        smoothing: float = 0.5,
+    ) -> None:
+        """
+        Parameters:
+            initial: Number of sectors to start reading with.
+            minimum: Smallest number of sectors to read at once.
+            maximum: Largest number of sectors to read at once.
+            target_latency: Seconds a single read should take.
+            smoothing: Weight of the latest read in the smoothed latency, from 0 to 1.
+        """
+        if not 0 < minimum <= maximum:
+            raise ValueError(
+                f"Expected 0 < minimum <= maximum, got {minimum!r} and {maximum!r}"
+            )
+        if target_latency <= 0:
+            raise ValueError(
+                f"Expected target_latency to be positive, not {target_latency!r}"
+            )
+        if not 0 < smoothing <= 1:
+            raise ValueError(f"Expected smoothing to be in (0, 1], not {smoothing!r}")
+
+        self.minimum = minimum
+        self.maximum = maximum
+        self.target_latency = target_latency
+        self.smoothing = smoothing
+        self.value = min(max(initial, minimum), maximum)
+        self._latency: float | None = None
+
+    def update(self, sectors: int, seconds: float) -> int:
+        """
+        Record how long a read took and adjust the chunk size accordingly.
+
+        Parameters:
+            sectors: Number of sectors that were read.
+            seconds: Time the read took in seconds.
+
+        Returns the number of sectors to read next.
+        """
+        if sectors <= 0:
+            return self.value
+
+        # Normalise to the current chunk size, the last read of a range may have been
+        # shorter than the chunk size and so would look faster than it is.
+        latency = seconds * self.value / sectors
+        if self._latency is None:
+            self._latency = latency
+        else:
+            self._latency += self.smoothing * (latency - self._latency)
+
+        if self._latency > self.target_latency and self.value > self.minimum:
+            self.value = max(self.value // 2, self.minimum)
+            self._latency /= 2
+        elif self._latency < self.target_latency / 2 and self.value < self.maximum:
+            self.value = min(self.value * 2, self.maximum)
+            self._latency *= 2
+
+        return self.value
+
+
+@dataclass(frozen=True)
+class CopyResult:
+    """The outcome of copying a range of sectors, e.g. by DvdCss.copy_range()."""
+
+    sectors: int
+    """Number of sectors copied to the destination."""
+    seconds: float
+    """Time the copy took in seconds."""
+    cancelled: bool = False
+    """Whether the copy was cancelled before the whole range was copied."""
+    digests: Mapping[str, str] = field(default_factory=dict)
+    """Hex digest of the data copied by each hash algorithm asked for, see Digests."""
+
+    @property
+    def size(self) -> int:
+        """Number of bytes copied to the destination."""
+        return self.sectors * constants.SECTOR_SIZE
+
+    @property
+    def throughput(self) -> float:
+        """Average bytes copied per second."""
+        return self.size / self.seconds if self.seconds > 0 else 0.0
+
+
+class Digests:
+    """
+    Hash the same data with several algorithms at once.
+
+    Algorithms are named as in hashlib, e.g. "md5" and "sha1", plus "crc32" for zlib's
+    CRC-32 as used by archival checksum files. Both hashlib and zlib release the GIL
+    while hashing large buffers, so hashing on another thread runs alongside reads.
+    """
+
+    def __init__(self, algorithms: Iterable[str]) -> None:
+        """
+        Parameters:
+            algorithms: Names of the hash algorithms.
+
+        Raises:
+            ValueError: An algorithm is not supported.
+        """
+        self._crc32: int | None = None
+        self._hashes: dict[str, Any] = {}
+        for name in algorithms:
+            if name.lower() == "crc32":
+                self._crc32 = 0
+            else:
+                self._hashes[name] = hashlib.new(name, usedforsecurity=False)
+
+    def __bool__(self) -> bool:
+        return self._crc32 is not None or bool(self._hashes)
+
+    def update(self, data: bytes | memoryview) -> None:
+        """Hash more data with every algorithm."""
+        for hash_ in self._hashes.values():
+            hash_.update(data)
+        if self._crc32 is not None:
+            self._crc32 = zlib.crc32(data, self._crc32)
+
+    def hexdigests(self) -> dict[str, str]:
+        """The hex digest of the data so far by each algorithm."""
+        digests = {name: hash_.hexdigest() for name, hash_ in self._hashes.items()}
+        if self._crc32 is not None:
+            digests["crc32"] = f"{self._crc32:08x}"
+        return digests
+
+
+__all__ = ("AdaptiveChunkSize", "CopyResult", "Digests")
@@ -37,6 +37,19 @@ def iovecs(*buffers: Array[c_char]) -> Array[Iovec]:
     )
 
 
+SeekCallback = CFUNCTYPE(c_int, c_void_p, c_uint64)
+"""int(p_stream, i_pos) - seek to a byte position, returning 0 on success."""
+
+# buffer must be c_void_p (writable); ctypes would hand the callback a c_char_p as
+# immutable bytes it cannot write into.
+ReadCallback = CFUNCTYPE(c_int, c_void_p, c_void_p, c_int)
+"""int(p_stream, buffer, i_read) - read up to i_read bytes, returning the bytes read."""
+
+ReadvCallback = CFUNCTYPE(c_int, c_void_p, c_void_p, c_int)
+"""int(p_stream, p_iovec, i_blocks) - read into i_blocks Iovecs, returning the bytes
+read."""
+
+
 class DvdCssStreamCb(Structure):
     """
     Creates a struct to match dvdcss_stream_cb.
@@ -46,14 +59,20 @@ class DvdCssStreamCb(Structure):
 
     _fields_ = (
         # custom seek callback - int(p_stream, i_pos)
-        ("pf_seek", CFUNCTYPE(c_int, c_void_p, c_uint64)),
+        ("pf_seek", SeekCallback),
         # custom read callback - int(p_stream, buffer, i_read)
-        # buffer must be c_void_p (writable); ctypes would hand the callback a c_char_p
-        # as immutable bytes it cannot write into.
-        ("pf_read", CFUNCTYPE(c_int, c_void_p, c_void_p, c_int)),
+        ("pf_read", ReadCallback),
         # custom vectored read callback - int(p_stream, p_iovec, i_blocks)
-        ("pf_readv", CFUNCTYPE(c_int, c_void_p, c_void_p, c_int)),
+        ("pf_readv", ReadvCallback),
     )
 
 
-__all__ = ("DvdCssStreamCb", "Iovec", "ReadFlag", "SeekFlag")
+__all__ = (
+    "DvdCssStreamCb",
+    "Iovec",
+    "ReadCallback",
+    "ReadFlag",
+    "ReadvCallback",
+    "SeekCallback",
+    "SeekFlag",
+)
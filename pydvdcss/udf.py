@@ -0,0 +1,292 @@
+from __future__ import annotations
+
+import struct
+from collections.abc import Callable
+from dataclasses import dataclass
+
+from pydvdcss import constants
+
+SectorReader = Callable[[int, int], bytes]
+"""Reads a number of sectors from a logical block address, `read(sector, count)`."""
+
+# ECMA-167 descriptor tag identifiers used by UDF 1.02.
+TAG_ANCHOR = 2
+TAG_PARTITION = 5
+TAG_LOGICAL_VOLUME = 6
+TAG_TERMINATING = 8
+TAG_FILE_SET = 256
+TAG_FILE_IDENTIFIER = 257
+TAG_FILE_ENTRY = 261
+TAG_EXTENDED_FILE_ENTRY = 266
+
+ANCHOR_SECTOR = 256
+
+
+@dataclass(frozen=True)
+class Extent:
+    """A contiguous run of sectors on the disc."""
+
+    start: int
+    """Logical block address of the first sector."""
+    count: int
+    """Number of sectors."""
+
+    @property
+    def end(self) -> int:
+        """Logical block address just past the last sector."""
+        return self.start + self.count
+
+
+@dataclass(frozen=True)
+class UdfFile:
+    """A file or directory in a UDF file system."""
+
+    name: str
+    size: int
+    """Size of the file in bytes."""
+    extents: tuple[Extent, ...]
+    """Where the file's data is on the disc, in order."""
+    is_directory: bool = False
+    embedded: bytes = b""
+    """Data stored in the file entry itself rather than in extents, if any."""
+
+    @property
+    def start(self) -> int | None:
+        """Logical block address of the file's first sector, if it has any data."""
+        return self.extents[0].start if self.extents else None
+
+
+@dataclass(frozen=True)
+class VolumeDescriptors:
+    """
+    The descriptors that locate a UDF file system, all at fixed or pointed-to sectors.
+
+    Reading them takes 3 reads, of the anchor, the volume descriptor sequence, and the
+    file set descriptor, and no directories or file entries.
+    """
+
+    anchor: bytes
+    """The Anchor Volume Descriptor Pointer, at sector 256."""
+    sequence: tuple[bytes, ...]
+    """The Main Volume Descriptor Sequence's descriptors, up to the terminating one,
+    e.g. the Primary, Partition, and Logical Volume Descriptors."""
+    file_set: bytes
+    """The File Set Descriptor the Logical Volume Descriptor points to."""
+    partition_start: int
+    """Logical block address of the partition's first sector."""
+
+    @classmethod
+    def read(cls, read: SectorReader) -> VolumeDescriptors:
+        """
+        Read the descriptors of a disc.
+
+        Parameters:
+            read: Reads `count` sectors from a logical block address, `read(sector,
+                count)`, returning the bytes read.
+
+        Raises:
+            ValueError: The disc does not have a valid UDF file system.
+        """
+        anchor = read(ANCHOR_SECTOR, 1)
+        if _tag(anchor) != TAG_ANCHOR:
+            raise ValueError("No UDF Anchor Volume Descriptor Pointer at sector 256.")
+        vds_length, vds_start = struct.unpack_from("<II", anchor, 16)
+
+        data = read(vds_start, _sectors(vds_length))
+        sequence = []
+        partition_start = None
+        file_set = None
+        for offset in range(0, len(data), constants.SECTOR_SIZE):
+            descriptor = data[offset : offset + constants.SECTOR_SIZE]
+            tag = _tag(descriptor)
+            if tag == TAG_TERMINATING:
+                break
+            sequence.append(descriptor)
+            if tag == TAG_PARTITION:
+                (partition_start,) = struct.unpack_from("<I", descriptor, 188)
+            elif tag == TAG_LOGICAL_VOLUME:
+                # Logical Volume Contents Use holds the File Set Descriptor's long_ad.
+                (file_set,) = struct.unpack_from("<I", descriptor, 252)
+        if partition_start is None or file_set is None:
+            raise ValueError("No UDF Partition or Logical Volume Descriptor found.")
+
+        descriptor = read(partition_start + file_set, 1)
+        if _tag(descriptor) != TAG_FILE_SET:
+            raise ValueError("No UDF File Set Descriptor found.")
+
+        return cls(
+            anchor=anchor,
+            sequence=tuple(sequence),
+            file_set=descriptor,
+            partition_start=partition_start,
+        )
+
+
+class UdfReader:
+    """
+    A minimal, read-only UDF 1.02 file system reader, as used by DVD-Video discs.
+
+    It only reads what's needed to list directories and locate files: the anchor, the
+    partition and logical volume descriptors, the file set descriptor, file entries,
+    and file identifier descriptors. Directory listings are cached.
+
+    Sectors are read through a SectorReader, so it works on an open DvdCss as well as
+    directly on an ISO image file.
+    """
+
+    def __init__(
+        self, read: SectorReader, volume: VolumeDescriptors | None = None
+    ) -> None:
+        """
+        Parameters:
+            read: Reads `count` sectors from a logical block address, `read(sector,
+                count)`, returning the bytes read.
+            volume: The disc's volume descriptors, if already read, see
+                VolumeDescriptors.read().
+
+        Raises:
+            ValueError: The disc does not have a valid UDF file system.
+        """
+        self._read = read
+        self._listings: dict[str, dict[str, UdfFile]] = {}
+
+        self.volume = volume or VolumeDescriptors.read(read)
+        self.partition_start: int = self.volume.partition_start
+        (root,) = struct.unpack_from("<I", self.volume.file_set, 404)
+        self.root = self._file_entry("/", root)
+
+    def listdir(self, path: str = "/") -> dict[str, UdfFile]:
+        """
+        List a directory, e.g. "/VIDEO_TS".
+
+        Raises:
+            FileNotFoundError: The directory does not exist.
+            NotADirectoryError: The path is a file.
+
+        Returns the directory's files and directories keyed by their upper-case name.
+        """
+        key = "/" + "/".join(part.upper() for part in path.split("/") if part)
+        listing = self._listings.get(key)
+        if listing is None:
+            directory = self.root if key == "/" else self.find(key)
+            if not directory.is_directory:
+                raise NotADirectoryError(path)
+            listing = self._listings[key] = self._parse_directory(directory)
+        return listing
+
+    def find(self, path: str) -> UdfFile:
+        """
+        Find a file or directory by path, e.g. "/VIDEO_TS/VIDEO_TS.IFO".
+
+        Names are matched case-insensitively.
+
+        Raises:
+            FileNotFoundError: The file does not exist.
+        """
+        parent, _, name = path.rstrip("/").rpartition("/")
+        if not name:
+            return self.root
+        found = self.listdir(parent or "/").get(name.upper())
+        if found is None:
+            raise FileNotFoundError(path)
+        return found
+
+    def read_file(self, file: UdfFile) -> bytes:
+        """Read the whole contents of a file."""
+        if file.embedded:
+            return file.embedded[: file.size]
+        data = b"".join(
+            self._read(extent.start, extent.count) for extent in file.extents
+        )
+        return data[: file.size]
+
+    def _file_entry(self, name: str, block: int) -> UdfFile:
+        entry = self._read(self.partition_start + block, 1)
+        tag = _tag(entry)
+        if tag == TAG_FILE_ENTRY:
+            ea_length, ad_length = struct.unpack_from("<II", entry, 168)
+            ad_offset = 176 + ea_length
+        elif tag == TAG_EXTENDED_FILE_ENTRY:
+            ea_length, ad_length = struct.unpack_from("<II", entry, 208)
+            ad_offset = 216 + ea_length
+        else:
+            raise ValueError(f"Expected a UDF File Entry at block {block}, got {tag}.")
+
+        file_type = entry[27]
+        (icb_flags,) = struct.unpack_from("<H", entry, 34)
+        (size,) = struct.unpack_from("<Q", entry, 56)
+        descriptors = entry[ad_offset : ad_offset + ad_length]
+
+        extents = []
+        embedded = b""
+        ad_type = icb_flags & 7
+        if ad_type in (0, 1):
+            # short_ad (8 bytes) or long_ad (16 bytes), both start with length, block.
+            ad_size = 8 if ad_type == 0 else 16
+            for offset in range(0, len(descriptors) - ad_size + 1, ad_size):
+                length, position = struct.unpack_from("<II", descriptors, offset)
+                # The top 2 bits are the extent type, only recorded extents hold data.
+                if length == 0 or length >> 30:
+                    continue
+                extents.append(
+                    Extent(self.partition_start + position, _sectors(length))
+                )
+        elif ad_type == 3:
+            # The data is embedded in the file entry, only seen on small directories.
+            embedded = descriptors
+
+        return UdfFile(
+            name=name,
+            size=size,
+            extents=tuple(extents),
+            is_directory=file_type == 4,
+            embedded=embedded,
+        )
+
+    def _parse_directory(self, directory: UdfFile) -> dict[str, UdfFile]:
+        data = self.read_file(directory)
+        files = {}
+        offset = 0
+        while offset + 38 <= len(data):
+            if _tag(data[offset:]) != TAG_FILE_IDENTIFIER:
+                break
+            characteristics = data[offset + 18]
+            name_length = data[offset + 19]
+            (block,) = struct.unpack_from("<I", data, offset + 24)
+            (use_length,) = struct.unpack_from("<H", data, offset + 36)
+            name_offset = offset + 38 + use_length
+            raw_name = data[name_offset : name_offset + name_length]
+            offset += (38 + use_length + name_length + 3) & ~3
+
+            # Skip the parent directory and deleted entries.
+            if characteristics & 0x08 or characteristics & 0x04:
+                continue
+            name = _dstring(raw_name)
+            files[name.upper()] = self._file_entry(name, block)
+        return files
+
+
+def _tag(descriptor: bytes) -> int:
+    return int.from_bytes(descriptor[0:2], "little")
+
+
+def _sectors(length: int) -> int:
+    return -(-length // constants.SECTOR_SIZE)
+
+
+def _dstring(data: bytes) -> str:
+    # OSTA Compressed Unicode: a compression ID followed by 8 or 16 bit characters.
+    if not data:
+        return ""
+    if data[0] == 16:
+        return data[1:].decode("utf-16-be", errors="replace")
+    return data[1:].decode("latin-1")
+
+
+__all__ = (
+    "Extent",
+    "SectorReader",
+    "UdfFile",
+    "UdfReader",
+    "VolumeDescriptors",
+)
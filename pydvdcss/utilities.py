@@ -1,6 +1,12 @@
 from __future__ import annotations
 
-from typing import Any
+import os
+import threading
+from collections.abc import Iterator, Mapping
+from contextlib import contextmanager
+from typing import Any, BinaryIO
+
+_environ_lock = threading.RLock()
 
 
 def message_with_error(message: str | None, error: Any | None) -> str:
@@ -14,3 +20,85 @@ def message_with_error(message: str | None, error: Any | None) -> str:
     Returns a string with message and error seperated with `: ` if error is not blank.
     """
     return ": ".join(part for part in (message, str(error or "")) if part)
+
+
+def write_all(file: BinaryIO, data: memoryview) -> None:
+    """
+    Write all of the data to a file object.
+
+    Unbuffered (raw) file objects may write less than they were given, so this keeps
+    writing the remainder until everything is written.
+
+    Parameters:
+        file: A binary file object opened for writing.
+        data: The data to write.
+    """
+    while data:
+        written = file.write(data)
+        if written is None:
+            raise BlockingIOError("The file is non-blocking and not ready for writing.")
+        data = data[written:]
+
+
+def dvdcss_env(
+    method: str | None = None,
+    verbosity: int | None = None,
+    cache_dir: str | os.PathLike[str] | None = None,
+) -> dict[str, str]:
+    """
+    The environment variables libdvdcss reads its settings from, for the ones given.
+
+    Parameters:
+        method: Sets DVDCSS_METHOD, the cracking method, see DvdCss.set_cracking_mode().
+        verbosity: Sets DVDCSS_VERBOSE, see DvdCss.set_verbosity().
+        cache_dir: Sets DVDCSS_CACHE, the directory to cache title keys in.
+
+    Returns the variables by name, only those whose setting isn't None.
+    """
+    env = {}
+    if method is not None:
+        env["DVDCSS_METHOD"] = method
+    if verbosity is not None:
+        env["DVDCSS_VERBOSE"] = str(verbosity)
+    if cache_dir is not None:
+        env["DVDCSS_CACHE"] = os.fspath(cache_dir)
+    return env
+
+
+def init_worker(env: Mapping[str, str]) -> None:
+    """
+    Set environment variables for good, e.g. as the initializer of worker processes.
+
+    A worker process only opens discs with one set of libdvdcss settings, so unlike
+    environ_override() they're set once when it starts rather than around each open.
+
+    Parameters:
+        env: Environment variables to set, by name, see dvdcss_env().
+    """
+    os.environ.update(env)
+
+
+@contextmanager
+def environ_override(values: Mapping[str, str]) -> Iterator[None]:
+    """
+    Temporarily set environment variables, restoring their previous values after.
+
+    libdvdcss reads its settings (e.g. DVDCSS_CACHE) from the environment when a disc
+    is opened, so setting them just around dvdcss_open() applies them to one open.
+    The environment is process-wide, so overrides are serialised with a lock; code
+    that sets the variables without this helper can still race with it.
+
+    Parameters:
+        values: Environment variables to set, by name.
+    """
+    with _environ_lock:
+        previous = {name: os.environ.get(name) for name in values}
+        os.environ.update(values)
+        try:
+            yield
+        finally:
+            for name, value in previous.items():
+                if value is None:
+                    os.environ.pop(name, None)
+                else:
+                    os.environ[name] = value
@@ -0,0 +1,407 @@
+"""Benchmark pydvdcss's read paths against a synthetic, unscrambled DVD-sized image.
+
+The image is generated locally from a seed, so runs are reproducible on any machine
+with libdvdcss installed. Each benchmark reads the whole image sequentially through one
+read path (``read()``, ``read_into()``, ``read_unchecked()``, ``readv()`` and
+``read_plan()`` with different iovec layouts, and ``open_stream()`` sources) and reports
+sectors per second, time per call, and, from a separate pass under tracemalloc, the
+memory allocated per call. Opening the image and the bare call overhead are measured
+too. ``--backend cffi`` runs them through the cffi binding instead of ctypes.
+
+Each benchmark keeps the best of ``--repeat`` passes, and how far the median pass was
+from it as the run's noise. Results are written as JSON with ``--output`` and compared
+against an earlier run with ``--compare``, which exits non-zero when a benchmark's best
+pass regressed past ``--threshold`` plus the noise of either run:
+
+    uv run scripts/benchmark.py --output bench.json
+    uv run scripts/benchmark.py --compare bench.json
+    uv run --with cffi scripts/benchmark.py --backend cffi --compare bench.json
+
+Reads are served from the page cache after the image is generated, so the numbers are
+pydvdcss and libdvdcss overheads rather than storage speed.
+"""
+
+from __future__ import annotations
+
+import argparse
+import gc
+import json
+import os
+import platform
+import random
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from ctypes import create_string_buffer
+from importlib.metadata import PackageNotFoundError, version
+from pathlib import Path
+from typing import Any
+
+from pydvdcss import (
+    DvdCss,
+    FileStreamSource,
+    MmapStreamSource,
+    ReadvPlan,
+    aligned_buffer,
+)
+from pydvdcss.constants import SECTOR_SIZE
+from pydvdcss.library import BACKEND_ENV, BACKENDS
+
+READ_SIZES = (1, 16, 64, 512)
+"""Sectors per read() and read_into() call."""
+
+READV_LAYOUTS = ((64, 1), (32, 16), (8, 64), (1, 512))
+"""(iovecs, sectors per iovec) of each readv() call."""
+
+STREAM_SIZES = (16, 512)
+"""Sectors per read() call through each open_stream() source."""
+
+
+def generate_image(path: Path, size: int, seed: int) -> None:
+    """Write an image of `size` bytes of seeded pseudo-random data, 1 MiB at a time."""
+    rng = random.Random(seed)
+    block = 1024 * 1024
+    with path.open("wb") as f:
+        for offset in range(0, size, block):
+            f.write(rng.randbytes(min(block, size - offset)))
+
+
+def peak_rss() -> int | None:
+    """Peak resident set size of this process in bytes, if the platform reports it."""
+    try:
+        import resource
+    except ImportError:  # Windows
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux and the BSDs report kilobytes, macOS reports bytes.
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+@contextmanager
+def opened(image: Path, source: str | None = None) -> Iterator[DvdCss]:
+    dvd = DvdCss()
+    try:
+        if source == "file":
+            dvd.open_source(FileStreamSource(image))
+        elif source == "mmap":
+            dvd.open_source(MmapStreamSource(image))
+        else:
+            dvd.open(image)
+        yield dvd
+    finally:
+        dvd.close()
+
+
+def sequential(dvd: DvdCss, total: int, per_call: int, call: Callable[[], Any]) -> int:
+    """Call `call` to read the whole image in order, returning the number of calls."""
+    dvd.seek(0)
+    calls = 0
+    for _ in range(total // per_call):
+        call()
+        calls += 1
+    return calls
+
+
+def timings(times: list[float]) -> dict[str, float]:
+    """The best and median of the passes, and the median's distance from the best."""
+    best = min(times)
+    median = statistics.median(times)
+    return {"seconds": best, "median_seconds": median, "spread": median / best - 1}
+
+
+def measure(
+    image: Path,
+    sectors: int,
+    per_call: int,
+    make_call: Callable[[DvdCss], Callable[[], Any]],
+    repeat: int,
+    source: str | None = None,
+) -> dict[str, Any]:
+    """Time `repeat` sequential passes, then one pass under tracemalloc."""
+    with opened(image, source) as dvd:
+        call = make_call(dvd)
+        times = []
+        calls = 0
+        for _ in range(repeat):
+            gc.collect()
+            began = time.perf_counter()
+            calls = sequential(dvd, sectors, per_call, call)
+            times.append(time.perf_counter() - began)
+
+        gc.collect()
+        tracemalloc.start()
+        try:
+            sequential(dvd, sectors, per_call, call)
+            _, allocated_peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+
+    read = calls * per_call
+    timed = timings(times)
+    best = timed["seconds"]
+    return {
+        "sectors_per_second": read / best,
+        "bytes_per_second": read * SECTOR_SIZE / best,
+        **timed,
+        "calls": calls,
+        "microseconds_per_call": best / calls * 1e6,
+        "allocated_peak_bytes": allocated_peak,
+        "peak_rss_bytes": peak_rss(),
+    }
+
+
+def bench_open(image: Path, repeat: int, opens: int = 50) -> dict[str, Any]:
+    times = []
+    for _ in range(repeat):
+        began = time.perf_counter()
+        for _ in range(opens):
+            with opened(image):
+                pass
+        times.append(time.perf_counter() - began)
+    timed = timings(times)
+    return {
+        **timed,
+        "calls": opens,
+        "microseconds_per_call": timed["seconds"] / opens * 1e6,
+    }
+
+
+def bench_ctypes_overhead(
+    image: Path, repeat: int, calls: int = 100_000
+) -> dict[str, Any]:
+    """Time a trivial libdvdcss call, the floor of every call through the backend."""
+    with opened(image) as dvd:
+        is_scrambled = dvd._library.dvdcss_is_scrambled
+        handle = dvd.handle
+        times = []
+        for _ in range(repeat):
+            began = time.perf_counter()
+            for _ in range(calls):
+                is_scrambled(handle)
+            times.append(time.perf_counter() - began)
+    timed = timings(times)
+    return {
+        **timed,
+        "calls": calls,
+        "microseconds_per_call": timed["seconds"] / calls * 1e6,
+    }
+
+
+def read_call(count: int) -> Callable[[DvdCss], Callable[[], Any]]:
+    return lambda dvd: lambda: dvd.read(count)
+
+
+def read_into_call(count: int) -> Callable[[DvdCss], Callable[[], Any]]:
+    def make(dvd: DvdCss) -> Callable[[], Any]:
+        buffer = aligned_buffer(count * SECTOR_SIZE)
+        return lambda: dvd.read_into(buffer)
+
+    return make
+
+
+def read_unchecked_call(count: int) -> Callable[[DvdCss], Callable[[], Any]]:
+    def make(dvd: DvdCss) -> Callable[[], Any]:
+        buffer = aligned_buffer(count * SECTOR_SIZE)
+        return lambda: dvd.read_unchecked(buffer, count)
+
+    return make
+
+
+def readv_call(iovecs: int, count: int) -> Callable[[DvdCss], Callable[[], Any]]:
+    def make(dvd: DvdCss) -> Callable[[], Any]:
+        buffers = [create_string_buffer(count * SECTOR_SIZE) for _ in range(iovecs)]
+        return lambda: dvd.readv(*buffers)
+
+    return make
+
+
+def read_plan_call(iovecs: int, count: int) -> Callable[[DvdCss], Callable[[], Any]]:
+    def make(dvd: DvdCss) -> Callable[[], Any]:
+        plan = ReadvPlan(*(aligned_buffer(count * SECTOR_SIZE) for _ in range(iovecs)))
+        return lambda: dvd.read_plan(plan)
+
+    return make
+
+
+def run(image: Path, sectors: int, repeat: int) -> dict[str, dict[str, Any]]:
+    results = {
+        "open": bench_open(image, repeat),
+        "ctypes_call": bench_ctypes_overhead(image, repeat),
+    }
+
+    for count in READ_SIZES:
+        results[f"read/{count}"] = measure(
+            image, sectors, count, read_call(count), repeat
+        )
+    for count in READ_SIZES:
+        results[f"read_into/{count}"] = measure(
+            image, sectors, count, read_into_call(count), repeat
+        )
+    for count in READ_SIZES:
+        results[f"read_unchecked/{count}"] = measure(
+            image, sectors, count, read_unchecked_call(count), repeat
+        )
+    for iovecs, count in READV_LAYOUTS:
+        results[f"readv/{iovecs}x{count}"] = measure(
+            image, sectors, iovecs * count, readv_call(iovecs, count), repeat
+        )
+        results[f"read_plan/{iovecs}x{count}"] = measure(
+            image, sectors, iovecs * count, read_plan_call(iovecs, count), repeat
+        )
+
+    iovecs, count = READV_LAYOUTS[1]
+    for source in ("file", "mmap"):
+        for size in STREAM_SIZES:
+            results[f"stream/{source}/read/{size}"] = measure(
+                image, sectors, size, read_call(size), repeat, source
+            )
+        results[f"stream/{source}/readv/{iovecs}x{count}"] = measure(
+            image, sectors, iovecs * count, readv_call(iovecs, count), repeat, source
+        )
+
+    return results
+
+
+def compare(
+    results: dict[str, dict[str, Any]],
+    baseline: dict[str, dict[str, Any]],
+    threshold: float,
+) -> list[str]:
+    """
+    Print each benchmark's change from the baseline, returning the regressed ones.
+
+    The best passes are compared, as the slower ones are slowed by whatever else the
+    machine was doing. A benchmark only regressed if it got slower by more than the
+    threshold plus the spread of either run, as a change within how much a run's own
+    passes differ can't be told apart from noise.
+    """
+    regressed = []
+    for name, result in results.items():
+        before = baseline.get(name)
+        if not before:
+            continue
+        # Throughput is higher-is-better, time per call is lower-is-better.
+        if "sectors_per_second" in result:
+            change = result["sectors_per_second"] / before["sectors_per_second"] - 1
+        else:
+            change = (
+                before["microseconds_per_call"] / result["microseconds_per_call"] - 1
+            )
+        # Results from before the spread was recorded count as noiseless.
+        noise = max(result.get("spread", 0.0), before.get("spread", 0.0))
+        tolerance = threshold + noise
+        flag = ""
+        if change < -tolerance:
+            flag = "  REGRESSED"
+            regressed.append(name)
+        print(f"{name:<28} {change:+8.1%} (within {tolerance:.1%}){flag}")
+    return regressed
+
+
+def report(results: dict[str, dict[str, Any]]) -> None:
+    print(f"{'benchmark':<28} {'MiB/s':>10} {'us/call':>10} {'alloc peak':>12}")
+    for name, result in results.items():
+        throughput = result.get("bytes_per_second")
+        mib = f"{throughput / 2**20:.1f}" if throughput else "-"
+        allocated = result.get("allocated_peak_bytes", "-")
+        print(
+            f"{name:<28} {mib:>10} {result['microseconds_per_call']:>10.2f} "
+            f"{allocated:>12}"
+        )
+    rss = peak_rss()
+    if rss:
+        print(f"peak RSS: {rss / 2**20:.1f} MiB")
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description="Benchmark pydvdcss's read paths.")
+    parser.add_argument(
+        "-s", "--size", type=int, default=1024, help="Image size in MiB (default 1024)."
+    )
+    parser.add_argument("--seed", type=int, default=0, help="Seed of the image data.")
+    parser.add_argument(
+        "-r",
+        "--repeat",
+        type=int,
+        default=7,
+        help="Passes per benchmark, best is kept (default 7).",
+    )
+    parser.add_argument(
+        "-i", "--image", type=Path, help="Image to use, generated if it does not exist."
+    )
+    parser.add_argument("-o", "--output", type=Path, help="Write the results as JSON.")
+    parser.add_argument(
+        "-c", "--compare", type=Path, help="A JSON results file to compare to."
+    )
+    parser.add_argument(
+        "-t",
+        "--threshold",
+        type=float,
+        default=0.1,
+        help=(
+            "Fraction slower than the comparison that counts as a regression, on top "
+            "of the noise of either run (default 0.1)."
+        ),
+    )
+    parser.add_argument(
+        "-b",
+        "--backend",
+        choices=BACKENDS,
+        default="ctypes",
+        help="Binding backend to call libdvdcss with (default ctypes).",
+    )
+    args = parser.parse_args(argv)
+    # Every DvdCss the benchmarks create picks the backend up from the environment.
+    os.environ[BACKEND_ENV] = args.backend
+
+    size = args.size * 1024 * 1024
+    with tempfile.TemporaryDirectory() as temp:
+        image = args.image or Path(temp) / f"synthetic-{args.size}M-{args.seed}.iso"
+        if not image.exists():
+            print(f"Generating {image} ({args.size} MiB, seed {args.seed})")
+            generate_image(image, size, args.seed)
+        sectors = image.stat().st_size // SECTOR_SIZE
+        results = run(image, sectors, args.repeat)
+
+    try:
+        package_version = version("pydvdcss")
+    except PackageNotFoundError:
+        package_version = None
+    output = {
+        "meta": {
+            "pydvdcss": package_version,
+            "python": platform.python_version(),
+            "implementation": platform.python_implementation(),
+            "backend": args.backend,
+            "platform": platform.platform(),
+            "machine": platform.machine(),
+            "cpus": os.cpu_count(),
+            "image_sectors": sectors,
+            "seed": args.seed,
+            "repeat": args.repeat,
+            "time": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        },
+        "results": results,
+    }
+
+    report(results)
+    if args.output:
+        args.output.write_text(json.dumps(output, indent=2), encoding="utf8")
+        print(f"Wrote {args.output}")
+
+    if args.compare:
+        baseline = json.loads(args.compare.read_text(encoding="utf8"))["results"]
+        print(f"\nCompared to {args.compare}:")
+        regressed = compare(results, baseline, args.threshold)
+        if regressed:
+            raise SystemExit(
+                f"{len(regressed)} benchmark(s) regressed: {', '.join(regressed)}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,14 @@
+from __future__ import annotations
+
+import pytest
+
+from pydvdcss.dvdcss import DvdCss
+from tests.fakes import FakeLibrary
+
+
+@pytest.fixture
+def library(monkeypatch: pytest.MonkeyPatch) -> FakeLibrary:
+    """A FakeLibrary every DvdCss made during the test calls instead of libdvdcss."""
+    library = FakeLibrary()
+    monkeypatch.setattr(DvdCss, "_load_library", staticmethod(lambda *_: library))
+    return library
@@ -0,0 +1,106 @@
+"""A fake libdvdcss, to test DvdCss and what's built on it without the library."""
+
+from __future__ import annotations
+
+import ctypes
+import itertools
+import random
+import threading
+from typing import Any
+
+from tests.images import SECTOR
+
+
+def random_image(sectors: int, seed: int = 0) -> bytes:
+    """An image of random sectors, so every sector's data is different."""
+    return random.Random(seed).randbytes(sectors * SECTOR)
+
+
+class FakeLibrary:
+    """
+    Serves an image in memory through the calls DvdCss makes to libdvdcss.
+
+    Every handle opened reads the same image. Seeks and reads are logged by handle, so
+    tests can check what was asked of the library, and reads of the sectors in `bad`
+    fail as a damaged disc would. Nothing is descrambled.
+    """
+
+    def __init__(self, image: bytes = b"") -> None:
+        self.image = image
+        self.bad: set[int] = set()
+        """Sectors that fail to read."""
+        self.fail_open = False
+        self.opened: list[bytes] = []
+        """The target of every open, in order."""
+        self.closed: list[int] = []
+        """Every handle closed, in order."""
+        self.seeks: list[tuple[int, int, int]] = []
+        """Every seek as (handle, sector, flag), in order."""
+        self.reads: list[tuple[int, int, int, int]] = []
+        """Every read as (handle, sector, count, flag), in order."""
+        self._positions: dict[int, int] = {}
+        self._errors: dict[int, bytes] = {}
+        self._handles = itertools.count(1)
+        self._lock = threading.Lock()
+
+    @property
+    def sectors(self) -> int:
+        return len(self.image) // SECTOR
+
+    def dvdcss_open(self, target: bytes) -> int | None:
+        with self._lock:
+            self.opened.append(target)
+            if self.fail_open:
+                return None
+            handle = next(self._handles)
+            self._positions[handle] = 0
+            return handle
+
+    def dvdcss_close(self, handle: int) -> int:
+        with self._lock:
+            self.closed.append(handle)
+            self._positions.pop(handle, None)
+            return 0
+
+    def dvdcss_seek(self, handle: int, sector: int, flag: int) -> int:
+        with self._lock:
+            self.seeks.append((handle, sector, flag))
+            if not 0 <= sector <= self.sectors:
+                self._errors[handle] = b"seek out of range"
+                return -1
+            self._positions[handle] = sector
+            return sector
+
+    def dvdcss_read(self, handle: int, buffer: Any, blocks: int, flags: int) -> int:
+        data = self._read(handle, blocks, flags)
+        if data is None:
+            return -1
+        ctypes.memmove(buffer, data, len(data))
+        return len(data) // SECTOR
+
+    def dvdcss_readv(self, handle: int, iovecs: Any, blocks: int, flags: int) -> int:
+        total = 0
+        for iovec in iovecs[:blocks]:
+            data = self._read(handle, iovec.iov_len // SECTOR, flags)
+            if data is None:
+                return -1
+            ctypes.memmove(iovec.iov_base, data, len(data))
+            total += len(data) // SECTOR
+        return total
+
+    def dvdcss_error(self, handle: int) -> bytes | None:
+        return self._errors.get(handle)
+
+    def dvdcss_is_scrambled(self, handle: int) -> int:
+        return 0
+
+    def _read(self, handle: int, blocks: int, flags: int) -> bytes | None:
+        with self._lock:
+            start = self._positions[handle]
+            self.reads.append((handle, start, blocks, flags))
+            if any(start <= sector < start + blocks for sector in self.bad):
+                self._errors[handle] = b"bad sector"
+                return None
+            data = self.image[start * SECTOR : (start + blocks) * SECTOR]
+            self._positions[handle] = start + len(data) // SECTOR
+            return data
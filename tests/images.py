@@ -0,0 +1,210 @@
+"""Build small UDF 1.02 disc images and DVD-Video IFOs in memory, for tests."""
+
+from __future__ import annotations
+
+import struct
+
+from pydvdcss import constants
+from pydvdcss.udf import (
+    ANCHOR_SECTOR,
+    TAG_ANCHOR,
+    TAG_FILE_ENTRY,
+    TAG_FILE_IDENTIFIER,
+    TAG_FILE_SET,
+    TAG_LOGICAL_VOLUME,
+    TAG_PARTITION,
+    TAG_TERMINATING,
+)
+
+SECTOR = constants.SECTOR_SIZE
+VDS_START = 32
+PARTITION_START = ANCHOR_SECTOR + 1
+
+
+class Reader:
+    """A SectorReader over an image in memory, that keeps a log of its reads."""
+
+    def __init__(self, image: bytes) -> None:
+        self.image = image
+        self.reads: list[tuple[int, int]] = []
+
+    def __call__(self, sector: int, count: int) -> bytes:
+        self.reads.append((sector, count))
+        return self.image[sector * SECTOR : (sector + count) * SECTOR]
+
+
+def build_image(files: dict[str, bytes], volume: str = "TEST_DISC") -> bytes:
+    """
+    Build a UDF image of files keyed by path, e.g. "/VIDEO_TS/VIDEO_TS.IFO".
+
+    Every file's data is one extent, in path order, and the volume name is put in
+    sector 16 so images of different volumes have different fingerprints.
+    """
+    blocks: list[bytes] = []
+
+    def allocate(data: bytes) -> int:
+        block = len(blocks)
+        data = data or bytes(SECTOR)
+        blocks.extend(
+            data[offset : offset + SECTOR].ljust(SECTOR, b"\x00")
+            for offset in range(0, len(data), SECTOR)
+        )
+        return block
+
+    def file_entry(data: bytes, directory: bool) -> int:
+        location = allocate(data)
+        entry = _descriptor(TAG_FILE_ENTRY)
+        entry[27] = 4 if directory else 5
+        struct.pack_into("<H", entry, 34, 0)  # short_ad allocation descriptors
+        struct.pack_into("<Q", entry, 56, len(data))
+        struct.pack_into("<II", entry, 168, 0, 8)
+        struct.pack_into("<II", entry, 176, len(data), location)
+        return allocate(bytes(entry))
+
+    def directory_entry(tree: dict[str, object]) -> int:
+        identifiers = b""
+        for name, node in sorted(tree.items()):
+            is_directory = isinstance(node, dict)
+            if isinstance(node, dict):
+                block = directory_entry(node)
+            else:
+                assert isinstance(node, bytes)
+                block = file_entry(node, directory=False)
+            identifiers += _file_identifier(name, block, is_directory)
+        return file_entry(identifiers, directory=True)
+
+    tree: dict[str, object] = {}
+    for path, data in sorted(files.items()):
+        *parents, name = path.strip("/").split("/")
+        node = tree
+        for parent in parents:
+            child = node.setdefault(parent, {})
+            assert isinstance(child, dict)
+            node = child
+        node[name] = data
+
+    file_set_block = allocate(bytes(SECTOR))
+    root = directory_entry(tree)
+    file_set = _descriptor(TAG_FILE_SET)
+    struct.pack_into("<I", file_set, 404, root)
+    blocks[file_set_block] = bytes(file_set)
+
+    image = bytearray(PARTITION_START * SECTOR)
+    image[16 * SECTOR : 16 * SECTOR + len(volume)] = volume.encode()
+
+    partition = _descriptor(TAG_PARTITION)
+    struct.pack_into("<I", partition, 188, PARTITION_START)
+    logical_volume = _descriptor(TAG_LOGICAL_VOLUME)
+    struct.pack_into("<I", logical_volume, 252, file_set_block)
+    sequence = (partition, logical_volume, _descriptor(TAG_TERMINATING))
+    for i, descriptor in enumerate(sequence):
+        image[(VDS_START + i) * SECTOR : (VDS_START + i + 1) * SECTOR] = descriptor
+
+    anchor = _descriptor(TAG_ANCHOR)
+    struct.pack_into("<II", anchor, 16, 16 * SECTOR, VDS_START)
+    image[ANCHOR_SECTOR * SECTOR : (ANCHOR_SECTOR + 1) * SECTOR] = anchor
+
+    return bytes(image) + b"".join(blocks)
+
+
+def vmg_ifo(titles: list[tuple[int, int, int]]) -> bytes:
+    """A video manager IFO of titles as (title set, title set title, chapters)."""
+    data = bytearray(2 * SECTOR)
+    data[:12] = b"DVDVIDEO-VMG"
+    struct.pack_into(">I", data, 0xC4, 1)
+    struct.pack_into(">HHI", data, SECTOR, len(titles), 0, 8 + 12 * len(titles) - 1)
+    for i, (title_set, title_set_title, chapters) in enumerate(titles):
+        struct.pack_into(
+            ">BBHHBBI",
+            data,
+            SECTOR + 8 + 12 * i,
+            0x3C,
+            1,
+            chapters,
+            0,
+            title_set,
+            title_set_title,
+            0,
+        )
+    return bytes(data)
+
+
+def vts_ifo(
+    titles: list[list[int]], chains: list[list[tuple[int, int]]], vobs_start: int = 4
+) -> bytes:
+    """
+    A title set IFO of titles, as the program chain numbers of each, and program
+    chains, as the (first, last) sectors of each cell.
+    """
+    data = bytearray(4 * SECTOR)
+    data[:12] = b"DVDVIDEO-VTS"
+    struct.pack_into(">III", data, 0xC4, vobs_start, 1, 2)
+
+    table = SECTOR
+    offset = 8 + 4 * len(titles)
+    body = b""
+    for i, title in enumerate(titles):
+        struct.pack_into(">I", data, table + 8 + 4 * i, offset + len(body))
+        body += b"".join(struct.pack(">HH", chain, 1) for chain in title)
+    struct.pack_into(">HHI", data, table, len(titles), 0, offset + len(body) - 1)
+    data[table + offset : table + offset + len(body)] = body
+
+    table = 2 * SECTOR
+    struct.pack_into(">HHI", data, table, len(chains), 0, 0)
+    position = 8 + 8 * len(chains)
+    for i, cells in enumerate(chains):
+        struct.pack_into(">BBBBI", data, table + 8 + 8 * i, 0x81, 0, 0, 0, position)
+        chain = table + position
+        data[chain + 2] = data[chain + 3] = len(cells)
+        struct.pack_into(">H", data, chain + 0xE8, 0xEC)
+        for cell, (first, last) in enumerate(cells):
+            struct.pack_into(">I", data, chain + 0xEC + 24 * cell + 8, first)
+            struct.pack_into(">I", data, chain + 0xEC + 24 * cell + 20, last)
+        position += 0xEC + 24 * len(cells)
+    return bytes(data)
+
+
+def dvd_image(volume: str = "TEST_DISC") -> bytes:
+    """
+    A DVD-Video image with two title sets. VTS_01 has two titles over two title VOBs,
+    VTS_02 one title, and each VOB is made of pack headers.
+    """
+    vob = _pack_sectors
+    return build_image(
+        {
+            "/VIDEO_TS/VIDEO_TS.IFO": vmg_ifo([(1, 1, 3), (1, 2, 1), (2, 1, 2)]),
+            "/VIDEO_TS/VIDEO_TS.VOB": vob(4),
+            "/VIDEO_TS/VTS_01_0.IFO": vts_ifo(
+                [[1], [2, 3]], [[(0, 9)], [(10, 19)], [(20, 29)]]
+            ),
+            "/VIDEO_TS/VTS_01_0.VOB": vob(2),
+            "/VIDEO_TS/VTS_01_1.VOB": vob(20),
+            "/VIDEO_TS/VTS_01_2.VOB": vob(10),
+            "/VIDEO_TS/VTS_02_0.IFO": vts_ifo([[1]], [[(0, 4), (5, 7)]]),
+            "/VIDEO_TS/VTS_02_1.VOB": vob(8),
+        },
+        volume,
+    )
+
+
+def _pack_sectors(count: int) -> bytes:
+    sector = bytearray(SECTOR)
+    sector[:4] = b"\x00\x00\x01\xba"
+    return bytes(sector) * count
+
+
+def _descriptor(tag: int) -> bytearray:
+    descriptor = bytearray(SECTOR)
+    descriptor[0:2] = tag.to_bytes(2, "little")
+    return descriptor
+
+
+def _file_identifier(name: str, block: int, is_directory: bool) -> bytes:
+    encoded = b"\x08" + name.encode("latin-1")
+    identifier = bytearray(38 + len(encoded))
+    identifier[0:2] = TAG_FILE_IDENTIFIER.to_bytes(2, "little")
+    identifier[18] = 0x02 if is_directory else 0
+    identifier[19] = len(encoded)
+    struct.pack_into("<I", identifier, 24, block)
+    identifier[38:] = encoded
+    return bytes(identifier.ljust((len(identifier) + 3) & ~3, b"\x00"))
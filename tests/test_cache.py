@@ -0,0 +1,165 @@
+from __future__ import annotations
+
+import time
+from collections.abc import Callable
+
+import pytest
+
+from pydvdcss import exceptions
+from pydvdcss.cache import SectorCache
+from pydvdcss.dvdcss import DvdCss
+from pydvdcss.structs import ReadFlag, SeekFlag
+from tests.fakes import FakeLibrary, random_image
+from tests.images import SECTOR
+
+
+@pytest.fixture
+def dvd(library: FakeLibrary) -> DvdCss:
+    library.image = random_image(256)
+    dvdcss = DvdCss()
+    dvdcss.open("disc.iso")
+    return dvdcss
+
+
+def wait_for(condition: Callable[[], bool]) -> None:
+    deadline = time.monotonic() + 5
+    while not condition():
+        assert time.monotonic() < deadline, "timed out"
+        time.sleep(0.001)
+
+
+def test_read(dvd: DvdCss, library: FakeLibrary) -> None:
+    with SectorCache(dvd, block=4, readahead=0) as cache:
+        # Spans three blocks.
+        assert cache.read(3, 6) == library.image[3 * SECTOR : 9 * SECTOR]
+        assert cache.read(5, 2) == library.image[5 * SECTOR : 7 * SECTOR]
+
+        stats = cache.stats
+        assert (stats.hits, stats.misses, stats.blocks) == (1, 3, 3)
+        assert stats.size == 12 * SECTOR
+        assert stats.hit_ratio == 0.25
+        # Blocks read one after another need no seek between them.
+        assert [seek[1] for seek in library.seeks] == [0]
+
+
+def test_lru_eviction(dvd: DvdCss, library: FakeLibrary) -> None:
+    with SectorCache(dvd, max_bytes=8 * SECTOR, block=4, readahead=0) as cache:
+        cache.read(0, 1)
+        cache.read(40, 1)
+        cache.read(0, 1)  # Now block 10 is the least recently used.
+        cache.read(80, 1)
+
+        assert cache.stats.evictions == 1
+        assert cache.stats.size == 8 * SECTOR
+        reads = len(library.reads)
+        assert cache.read(0, 1) == library.image[:SECTOR]
+        assert cache.read(80, 1) == library.image[80 * SECTOR : 81 * SECTOR]
+        assert len(library.reads) == reads
+        cache.read(40, 1)
+        assert len(library.reads) == reads + 1
+        assert cache.stats.evictions == 2
+
+
+def test_read_flags_kept_apart(dvd: DvdCss, library: FakeLibrary) -> None:
+    with SectorCache(dvd, block=4, readahead=0) as cache:
+        cache.read(8, 4)
+        cache.read(8, 4, ReadFlag.READ_DECRYPT)
+        cache.read(8, 4)
+        cache.read(8, 4, ReadFlag.READ_DECRYPT)
+
+        assert (cache.stats.hits, cache.stats.misses) == (2, 2)
+        assert [(read[1], read[3]) for read in library.reads] == [
+            (8, ReadFlag.Unset.value),
+            (8, ReadFlag.READ_DECRYPT.value),
+        ]
+        # Decrypted blocks are seeked to with SEEK_MPEG so libdvdcss checks the key.
+        assert [seek[1:] for seek in library.seeks] == [
+            (8, SeekFlag.Unset.value),
+            (8, SeekFlag.SEEK_MPEG.value),
+        ]
+
+
+def test_seek_flag(dvd: DvdCss, library: FakeLibrary) -> None:
+    with SectorCache(dvd, block=4, readahead=0, seek_flag=SeekFlag.SEEK_KEY) as cache:
+        cache.read(8, 1)
+        cache.read(16, 1, ReadFlag.READ_DECRYPT)
+
+    assert [seek[2] for seek in library.seeks] == [SeekFlag.SEEK_KEY.value] * 2
+
+
+def test_readahead(dvd: DvdCss, library: FakeLibrary) -> None:
+    with SectorCache(dvd, block=4, readahead=2, sequential_after=2) as cache:
+        cache.read(0, 4)
+        cache.read(4, 4)
+        assert cache.stats.prefetched == 0
+        cache.read(8, 4)  # The second read in a row carrying on from the last.
+
+        wait_for(lambda: cache.stats.prefetched == 2)
+        assert [read[1:3] for read in library.reads[-2:]] == [(12, 4), (16, 4)]
+        assert cache.read(12, 8) == library.image[12 * SECTOR : 20 * SECTOR]
+
+        stats = cache.stats
+        assert (stats.hits, stats.misses, stats.prefetch_hits) == (2, 3, 2)
+        assert stats.prefetch_wasted == 0
+
+
+def test_no_readahead_on_random_reads(dvd: DvdCss) -> None:
+    with SectorCache(dvd, block=4, readahead=2, sequential_after=1) as cache:
+        for sector in (0, 100, 40, 200, 8):
+            cache.read(sector, 4)
+
+        assert cache._thread is None
+        assert cache.stats.prefetched == 0
+
+
+def test_prefetch_wasted(dvd: DvdCss) -> None:
+    with SectorCache(dvd, block=4, readahead=2, sequential_after=1) as cache:
+        cache.read(0, 4)
+        cache.read(4, 4)
+        wait_for(lambda: cache.stats.prefetched == 2)
+
+        cache.read(12, 1)  # Uses one of the prefetched blocks.
+        cache.read(200, 4)  # Jumps away, so nothing more is read ahead.
+        cache.clear()
+
+        stats = cache.stats
+        assert (stats.prefetched, stats.prefetch_hits) == (2, 1)
+        assert stats.prefetch_wasted == 1
+        assert (stats.blocks, stats.size) == (0, 0)
+
+
+def test_end_of_disc(dvd: DvdCss, library: FakeLibrary) -> None:
+    library.image = library.image[: 100 * SECTOR]
+
+    with SectorCache(
+        dvd, block=32, readahead=4, sequential_after=0, sectors=100
+    ) as cache:
+        cache.read(64, 32)
+        # Only the last block is read ahead, and only up to the end of the disc.
+        wait_for(lambda: cache.stats.prefetched == 1)
+        assert library.reads[-1][1:3] == (96, 4)
+        assert cache.read(96, 4) == library.image[96 * SECTOR :]
+
+        with pytest.raises(exceptions.ReadError):
+            cache.read(98, 4)
+        with pytest.raises(exceptions.ReadError):
+            cache.read(100, 1)
+
+        assert cache.stats.prefetched == 1
+
+
+@pytest.mark.parametrize(
+    "kwargs",
+    [{"block": 0}, {"readahead": -1}, {"max_bytes": SECTOR, "block": 2}],
+)
+def test_invalid_arguments(dvd: DvdCss, kwargs: dict[str, int]) -> None:
+    with pytest.raises(ValueError):
+        SectorCache(dvd, **kwargs)  # type: ignore[arg-type]
+
+
+def test_invalid_reads(dvd: DvdCss) -> None:
+    with SectorCache(dvd) as cache:
+        with pytest.raises(ValueError):
+            cache.read(-1, 1)
+        with pytest.raises(ValueError):
+            cache.read(0, 0)
@@ -0,0 +1,183 @@
+from __future__ import annotations
+
+import hashlib
+import io
+import threading
+import zlib
+
+import pytest
+
+from pydvdcss import exceptions
+from pydvdcss.dvdcss import DvdCss
+from pydvdcss.streaming import Digests
+from pydvdcss.structs import ReadFlag, SeekFlag
+from tests.fakes import FakeLibrary, random_image
+from tests.images import SECTOR
+
+
+@pytest.fixture
+def dvd(library: FakeLibrary) -> DvdCss:
+    library.image = random_image(256)
+    dvdcss = DvdCss()
+    dvdcss.open("disc.iso")
+    return dvdcss
+
+
+def copy_threads() -> list[threading.Thread]:
+    return [t for t in threading.enumerate() if t.name.startswith("pydvdcss-copy")]
+
+
+class FailingWriter(io.BytesIO):
+    def __init__(self, fail_after: int) -> None:
+        super().__init__()
+        self.fail_after = fail_after
+
+    def write(self, data: memoryview) -> int:  # type: ignore[override]
+        if self.tell() >= self.fail_after:
+            raise OSError("disk full")
+        return super().write(data)
+
+
+def test_read_into(dvd: DvdCss, library: FakeLibrary) -> None:
+    buffer = bytearray(8 * SECTOR)
+
+    dvd.seek(10)
+    assert dvd.read_into(memoryview(buffer)[2 * SECTOR :], ReadFlag.READ_DECRYPT) == 6
+
+    assert buffer[2 * SECTOR :] == library.image[10 * SECTOR : 16 * SECTOR]
+    assert buffer[: 2 * SECTOR] == bytes(2 * SECTOR)
+    assert library.reads[-1][1:] == (10, 6, ReadFlag.READ_DECRYPT.value)
+
+
+def test_read_into_invalid(dvd: DvdCss) -> None:
+    with pytest.raises(TypeError):
+        dvd.read_into(bytes(SECTOR))  # type: ignore[arg-type]
+    with pytest.raises(ValueError):
+        dvd.read_into(bytearray(SECTOR + 1))
+    with pytest.raises(ValueError):
+        dvd.read_into(bytearray())
+
+
+def test_read_into_short(dvd: DvdCss) -> None:
+    dvd.seek(250)
+
+    # Only 6 sectors are left before the end of the disc.
+    with pytest.raises(exceptions.ReadError):
+        dvd.read_into(bytearray(8 * SECTOR))
+
+
+def test_iter_sectors(dvd: DvdCss, library: FakeLibrary) -> None:
+    chunks = [
+        bytes(view)
+        for view in dvd.iter_sectors(
+            20, 50, chunk=16, flag=ReadFlag.READ_DECRYPT, seek_flag=SeekFlag.SEEK_KEY
+        )
+    ]
+
+    assert [len(chunk) // SECTOR for chunk in chunks] == [16, 16, 16, 2]
+    assert b"".join(chunks) == library.image[20 * SECTOR : 70 * SECTOR]
+    # Only the first chunk seeks, the rest carry on from the last read.
+    assert [seek[1:] for seek in library.seeks] == [(20, SeekFlag.SEEK_KEY.value)]
+
+
+def test_iter_sectors_reuses_buffers(dvd: DvdCss) -> None:
+    views = list(dvd.iter_sectors(0, 64, chunk=8, buffers=2))
+
+    assert len({id(view.obj) for view in views}) == 2
+
+
+def test_iter_sectors_adaptive(dvd: DvdCss, library: FakeLibrary) -> None:
+    data = b"".join(bytes(view) for view in dvd.iter_sectors(0, 256, max_chunk=64))
+
+    assert data == library.image
+    assert max(count for _, _, count, _ in library.reads) <= 64
+
+
+def test_copy_range(dvd: DvdCss, library: FakeLibrary) -> None:
+    output = io.BytesIO()
+    progress: list[int] = []
+
+    result = dvd.copy_range(10, 100, output, chunk=16, progress=progress.append)
+
+    assert output.getvalue() == library.image[10 * SECTOR : 110 * SECTOR]
+    assert result.sectors == 100
+    assert not result.cancelled
+    assert progress == [16, 32, 48, 64, 80, 96, 100]
+    assert not copy_threads()
+
+
+def test_copy_range_digests(dvd: DvdCss, library: FakeLibrary) -> None:
+    data = library.image[: 200 * SECTOR]
+
+    result = dvd.copy_range(
+        0, 200, io.BytesIO(), chunk=32, hashes=["md5", "sha1", "crc32"]
+    )
+
+    assert result.digests == {
+        "md5": hashlib.md5(data).hexdigest(),
+        "sha1": hashlib.sha1(data).hexdigest(),
+        "crc32": f"{zlib.crc32(data):08x}",
+    }
+
+
+def test_copy_range_carries_on_digests(dvd: DvdCss, library: FakeLibrary) -> None:
+    digests = Digests(["sha256"])
+    digests.update(library.image[: 50 * SECTOR])
+
+    result = dvd.copy_range(50, 50, io.BytesIO(), chunk=16, hashes=digests)
+
+    expected = hashlib.sha256(library.image[: 100 * SECTOR]).hexdigest()
+    assert result.digests == {"sha256": expected}
+
+
+def test_copy_range_cancel(dvd: DvdCss, library: FakeLibrary) -> None:
+    output = io.BytesIO()
+    cancel = threading.Event()
+
+    def progress(copied: int) -> None:
+        if copied >= 48:
+            cancel.set()
+
+    result = dvd.copy_range(0, 256, output, chunk=16, cancel=cancel, progress=progress)
+
+    assert result.cancelled
+    assert result.sectors == 48
+    # Only whole chunks are written, nothing read after the cancel is.
+    assert output.getvalue() == library.image[: 48 * SECTOR]
+    assert not copy_threads()
+
+
+def test_copy_range_read_error(dvd: DvdCss, library: FakeLibrary) -> None:
+    library.bad = {70}
+    output = io.BytesIO()
+
+    with pytest.raises(exceptions.ReadError):
+        dvd.copy_range(0, 100, output, chunk=16, hashes=["md5"])
+
+    assert output.getvalue() == library.image[: 64 * SECTOR]
+    assert not copy_threads()
+
+
+def test_copy_range_write_error(dvd: DvdCss) -> None:
+    with pytest.raises(OSError, match="disk full"):
+        dvd.copy_range(
+            0, 256, FailingWriter(32 * SECTOR), chunk=16, depth=2, hashes=["md5"]
+        )
+
+    assert not copy_threads()
+
+
+def test_copy_range_invalid(dvd: DvdCss) -> None:
+    with pytest.raises(ValueError):
+        dvd.copy_range(0, 10, io.BytesIO(), chunk=0)
+    with pytest.raises(ValueError):
+        dvd.copy_range(0, 10, io.BytesIO(), hashes=["not-a-hash"])
+
+
+def test_not_open(library: FakeLibrary) -> None:
+    dvd = DvdCss()
+
+    with pytest.raises(exceptions.NoDeviceError):
+        dvd.read_into(bytearray(SECTOR))
+    with pytest.raises(exceptions.NoDeviceError):
+        dvd.copy_range(0, 1, io.BytesIO())
@@ -0,0 +1,43 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+import pytest
+
+from pydvdcss.farm import RipFarm, RipJob
+
+
+def test_add_drive_twice() -> None:
+    with RipFarm() as farm:
+        farm.add_drive("/dev/sr0", method="title")
+
+        with pytest.raises(ValueError):
+            farm.add_drive("/dev/sr0", method="disc")
+
+
+def test_failed_job(tmp_path: Path) -> None:
+    farm = RipFarm()
+    # Without a count, a target that isn't a file fails in the worker.
+    job = RipJob(str(tmp_path / "missing"), str(tmp_path / "out.iso"))
+
+    result = farm.submit(job).result()
+    farm.shutdown()
+
+    assert not result.ok
+    assert "count is required" in (result.error or "")
+    stats = farm.stats[job.target]
+    assert (stats.jobs, stats.failures, stats.sectors) == (1, 1, 0)
+    assert stats.errors == [result.error]
+
+
+def test_shutdown(tmp_path: Path) -> None:
+    farm = RipFarm()
+    farm.add_drive("/dev/sr0")
+    farm.shutdown()
+
+    with pytest.raises(RuntimeError):
+        farm.submit(RipJob("/dev/sr0", str(tmp_path / "out.iso"), count=1))
+    with pytest.raises(RuntimeError):
+        farm.add_drive("/dev/sr1")
+    # The stats outlive the workers.
+    assert list(farm.stats) == ["/dev/sr0"]
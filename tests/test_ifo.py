@@ -0,0 +1,45 @@
+from __future__ import annotations
+
+import pytest
+
+from pydvdcss.ifo import TitleEntry, parse_vmg, parse_vts
+from tests.images import vmg_ifo, vts_ifo
+
+
+def test_parse_vmg() -> None:
+    titles = parse_vmg(vmg_ifo([(1, 1, 12), (2, 1, 1), (2, 2, 4)]))
+
+    assert titles == [
+        TitleEntry(number=1, angles=1, chapters=12, title_set=1, title_set_title=1),
+        TitleEntry(number=2, angles=1, chapters=1, title_set=2, title_set_title=1),
+        TitleEntry(number=3, angles=1, chapters=4, title_set=2, title_set_title=2),
+    ]
+
+
+def test_parse_vts() -> None:
+    title_set = parse_vts(
+        vts_ifo([[1], [2, 2, 3]], [[(0, 9)], [(10, 14), (15, 19)], [(20, 29)]], 6)
+    )
+
+    assert title_set.vobs_start == 6
+    # A chain listed for several chapters is only played once.
+    assert title_set.titles == {1: (1,), 2: (2, 3)}
+    assert title_set.program_chains == {
+        1: ((0, 9),),
+        2: ((10, 14), (15, 19)),
+        3: ((20, 29),),
+    }
+
+
+@pytest.mark.parametrize(
+    ("parse", "data"),
+    [
+        (parse_vmg, vts_ifo([[1]], [[(0, 1)]])),
+        (parse_vts, vmg_ifo([(1, 1, 1)])),
+        (parse_vmg, bytes(2048)),
+    ],
+)
+def test_wrong_ifo(parse: object, data: bytes) -> None:
+    assert callable(parse)
+    with pytest.raises(ValueError):
+        parse(data)
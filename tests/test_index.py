@@ -0,0 +1,119 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+import pytest
+
+from pydvdcss.index import DiscIndex, disc_fingerprint
+from pydvdcss.udf import ANCHOR_SECTOR, Extent, UdfReader, VolumeDescriptors
+from tests.images import PARTITION_START, VDS_START, Reader, build_image, dvd_image
+
+
+def test_build() -> None:
+    index = DiscIndex.build(Reader(dvd_image()))
+
+    assert set(index.files) == {
+        "/VIDEO_TS/VIDEO_TS.IFO",
+        "/VIDEO_TS/VIDEO_TS.VOB",
+        "/VIDEO_TS/VTS_01_0.IFO",
+        "/VIDEO_TS/VTS_01_0.VOB",
+        "/VIDEO_TS/VTS_01_1.VOB",
+        "/VIDEO_TS/VTS_01_2.VOB",
+        "/VIDEO_TS/VTS_02_0.IFO",
+        "/VIDEO_TS/VTS_02_1.VOB",
+    }
+    vobs = index.file("/video_ts/vts_01_1.vob")[0]
+    assert vobs.count == 20
+    assert [title.title_set for title in index.titles.values()] == [1, 1, 2]
+    assert index.titles[1].chapters == 3
+    assert index.titles[1].cells == (Extent(vobs.start, 10),)
+    # Consecutive cells are merged into one extent.
+    assert index.titles[2].cells == (Extent(vobs.start + 10, 20),)
+    assert index.titles[3].cells == (index.file("VIDEO_TS/VTS_02_1.VOB")[0],)
+
+
+def test_key_sectors() -> None:
+    index = DiscIndex.build(Reader(dvd_image()))
+
+    sectors = index.key_sectors
+    assert list(sectors) == [
+        "VIDEO_TS.VOB",
+        "VTS_01_0.VOB",
+        "VTS_01_1.VOB",
+        "VTS_02_1.VOB",
+    ]
+    assert sectors["VTS_01_1.VOB"] == index.file("/VIDEO_TS/VTS_01_1.VOB")[0].start
+    assert list(sectors.values()) == sorted(sectors.values())
+
+
+def test_file_not_found() -> None:
+    index = DiscIndex.build(Reader(dvd_image()))
+
+    with pytest.raises(FileNotFoundError):
+        index.file("/VIDEO_TS/VTS_03_1.VOB")
+
+
+def test_save_load(tmp_path: Path) -> None:
+    index = DiscIndex.build(Reader(dvd_image()))
+
+    index.save(tmp_path / "index.json")
+
+    assert DiscIndex.load(tmp_path / "index.json") == index
+
+
+def test_cache_hit_reads_only_fixed_sectors(tmp_path: Path) -> None:
+    image = dvd_image()
+    built = DiscIndex.build(Reader(image), tmp_path)
+
+    reader = Reader(image)
+    cached = DiscIndex.build(reader, tmp_path)
+
+    assert cached == built
+    # Sector 16, the anchor, the volume descriptor sequence, and the file set
+    # descriptor, but no directory or file entry.
+    assert reader.reads == [
+        (ANCHOR_SECTOR, 1),
+        (VDS_START, 16),
+        (PARTITION_START, 1),
+        (16, 1),
+    ]
+
+
+def test_fingerprint() -> None:
+    image = dvd_image()
+    volume = VolumeDescriptors.read(Reader(image))
+
+    fingerprint = disc_fingerprint(Reader(image))
+
+    assert disc_fingerprint(Reader(image), volume) == fingerprint
+    assert disc_fingerprint(Reader(dvd_image("OTHER_DISC"))) != fingerprint
+    assert DiscIndex.build(Reader(image)).fingerprint == fingerprint
+
+
+def test_fingerprint_no_udf() -> None:
+    with pytest.raises(ValueError):
+        disc_fingerprint(Reader(bytes(512 * 2048)))
+
+
+def test_build_without_video_ts() -> None:
+    reader = Reader(build_image({"/DATA/FILE.BIN": b"data"}))
+
+    with pytest.raises(FileNotFoundError):
+        DiscIndex.build(reader)
+
+
+def test_udf_reader() -> None:
+    image = build_image({"/VIDEO_TS/VIDEO_TS.IFO": b"ifo", "/README.TXT": b"x" * 3000})
+    udf = UdfReader(Reader(image))
+
+    assert set(udf.listdir("/")) == {"VIDEO_TS", "README.TXT"}
+    assert udf.listdir("/")["VIDEO_TS"].is_directory
+    assert udf.read_file(udf.find("/video_ts/video_ts.ifo")) == b"ifo"
+    readme = udf.find("/README.TXT")
+    assert readme.size == 3000
+    assert readme.extents[0].count == 2
+    assert udf.read_file(readme) == b"x" * 3000
+    with pytest.raises(FileNotFoundError):
+        udf.find("/VIDEO_TS/VTS_01_0.IFO")
+    with pytest.raises(NotADirectoryError):
+        udf.listdir("/README.TXT")
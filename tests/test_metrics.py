@@ -0,0 +1,73 @@
+from __future__ import annotations
+
+from pydvdcss import exceptions
+from pydvdcss.metrics import OPERATIONS, CallEvent, Histogram, Instrumentation
+
+
+def test_histogram() -> None:
+    histogram = Histogram([1.0, 0.1, 0.01])
+
+    for value in (0.005, 0.01, 0.05, 0.1, 0.5, 2.0, 3.0):
+        histogram.observe(value)
+
+    assert histogram.buckets == (0.01, 0.1, 1.0)
+    # A value on a bucket's upper bound is in that bucket, as bounds are inclusive.
+    assert histogram.counts == [2, 2, 1, 2]
+    assert histogram.count == 7
+    assert histogram.sum == sum((0.005, 0.01, 0.05, 0.1, 0.5, 2.0, 3.0))
+
+
+def test_record() -> None:
+    events: list[CallEvent] = []
+    instrumentation = Instrumentation(hooks=[events.append])
+    error = exceptions.ReadError("bad sector")
+
+    instrumentation.record(CallEvent("read", 0.002, 16))
+    instrumentation.record(CallEvent("read", 0.5, error=error))
+    instrumentation.record(CallEvent("seek_key", 20.0))
+
+    assert events[1].error is error
+    assert instrumentation.calls == {
+        **dict.fromkeys(OPERATIONS, 0),
+        "read": 2,
+        "seek_key": 1,
+    }
+    assert instrumentation.sectors["read"] == 16
+    assert instrumentation.errors == {("read", "ReadError"): 1}
+    assert instrumentation.latency["seek_key"].count == 1
+
+    instrumentation.reset()
+
+    assert instrumentation.calls["read"] == 0
+    assert instrumentation.errors == {}
+
+
+def test_prometheus() -> None:
+    instrumentation = Instrumentation(buckets=[0.01, 1.0], labels={"drive": 'sr"0'})
+    instrumentation.record(CallEvent("read", 0.002, 16))
+    instrumentation.record(CallEvent("read", 0.5, 8))
+    instrumentation.record(CallEvent("seek", 0.001, error=exceptions.SeekError()))
+
+    lines = instrumentation.prometheus("dvd").splitlines()
+
+    assert lines[:2] == [
+        "# HELP dvd_calls_total Number of calls.",
+        "# TYPE dvd_calls_total counter",
+    ]
+    assert 'dvd_calls_total{drive="sr\\"0",operation="read"} 2' in lines
+    assert 'dvd_sectors_total{drive="sr\\"0",operation="read"} 24' in lines
+    assert 'dvd_bytes_total{drive="sr\\"0",operation="read"} 49152' in lines
+    assert (
+        'dvd_errors_total{drive="sr\\"0",operation="seek",error="SeekError"} 1' in lines
+    )
+    assert "# TYPE dvd_call_duration_seconds histogram" in lines
+    # Histogram buckets are cumulative.
+    name = "dvd_call_duration_seconds"
+    labels = 'drive="sr\\"0",operation="read"'
+    assert [line for line in lines if line.startswith(name) and labels in line] == [
+        f'{name}_bucket{{{labels},le="0.01"}} 1',
+        f'{name}_bucket{{{labels},le="1.0"}} 2',
+        f'{name}_bucket{{{labels},le="+Inf"}} 2',
+        f"{name}_sum{{{labels}}} 0.502",
+        f"{name}_count{{{labels}}} 2",
+    ]
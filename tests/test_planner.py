@@ -0,0 +1,111 @@
+from __future__ import annotations
+
+import pytest
+
+from pydvdcss.index import DiscIndex
+from pydvdcss.planner import ReadPlanner, ReadStep
+from pydvdcss.structs import ReadFlag, SeekFlag
+from pydvdcss.udf import Extent
+from tests.images import Reader, dvd_image
+
+
+@pytest.fixture(scope="module")
+def index() -> DiscIndex:
+    return DiscIndex.build(Reader(dvd_image()))
+
+
+def test_merge_ranges() -> None:
+    plan = ReadPlanner().plan(
+        [(50, 10), Extent(0, 10), (5, 10), (15, 5), (70, 0)], ReadFlag.Unset
+    )
+
+    assert plan.ranges == (Extent(0, 20), Extent(50, 10))
+    assert plan.steps == (
+        ReadStep(0, 20, SeekFlag.Unset),
+        ReadStep(50, 10, SeekFlag.Unset),
+    )
+    assert plan.sectors == 30
+    assert plan.seeks == 2
+
+
+def test_max_read() -> None:
+    plan = ReadPlanner(max_read=8).plan([(0, 20)], position=0)
+
+    # Reads carrying on from where the last ended don't seek.
+    assert plan.steps == (
+        ReadStep(0, 8, None),
+        ReadStep(8, 8, None),
+        ReadStep(16, 4, None),
+    )
+    assert plan.seeks == 0
+
+
+def test_no_index_decrypt() -> None:
+    plan = ReadPlanner().plan([(0, 10), (20, 10)])
+
+    assert [step.seek_flag for step in plan.steps] == [SeekFlag.SEEK_MPEG] * 2
+    assert plan.key_seeks == 0
+
+
+def test_title_keys(index: DiscIndex) -> None:
+    planner = ReadPlanner(index)
+    title = index.key_sectors["VTS_01_1.VOB"]
+    part_2 = index.file("/VIDEO_TS/VTS_01_2.VOB")[0]
+
+    plan = planner.plan([(title, 4), (title + 10, 4), (part_2.start + 2, 4)])
+
+    # The title VOBs of a title set share the first's key, so it's obtained once.
+    assert planner.key_sector(part_2.start) == title
+    assert plan.steps == (
+        ReadStep(title, 4, SeekFlag.SEEK_KEY),
+        ReadStep(title + 10, 4, SeekFlag.Unset),
+        ReadStep(part_2.start + 2, 4, SeekFlag.Unset),
+    )
+    assert plan.key_seeks == 1
+
+
+def test_key_seek_away_from_key_sector(index: DiscIndex) -> None:
+    title = index.key_sectors["VTS_02_1.VOB"]
+
+    plan = ReadPlanner(index).plan(
+        [(title + 3, 2)], key=index.key_sectors["VTS_01_1.VOB"]
+    )
+
+    assert plan.steps == (ReadStep(title + 3, 2, SeekFlag.Unset, key_sector=title),)
+    assert plan.seeks == 2
+    assert plan.key_seeks == 1
+
+
+def test_known_key(index: DiscIndex) -> None:
+    title = index.key_sectors["VTS_02_1.VOB"]
+
+    plan = ReadPlanner(index).plan([(title + 3, 2)], position=title + 3, key=title)
+
+    assert plan.steps == (ReadStep(title + 3, 2, None),)
+
+
+def test_split_at_key_change(index: DiscIndex) -> None:
+    menu = index.key_sectors["VTS_01_0.VOB"]
+    title = index.key_sectors["VTS_01_1.VOB"]
+
+    plan = ReadPlanner(index).plan([(menu, title - menu + 4)])
+
+    # One read never spans two title keys.
+    assert plan.steps[0] == ReadStep(menu, 2, SeekFlag.SEEK_KEY)
+    assert plan.steps[-1] == ReadStep(title, 4, SeekFlag.SEEK_KEY)
+    assert plan.sectors == title - menu + 4
+    assert plan.key_seeks == 2
+
+
+def test_no_keys_without_decrypt(index: DiscIndex) -> None:
+    title = index.key_sectors["VTS_01_1.VOB"]
+
+    plan = ReadPlanner(index).plan([(title, 4)], ReadFlag.Unset)
+
+    assert plan.steps == (ReadStep(title, 4, SeekFlag.Unset),)
+    assert plan.key_seeks == 0
+
+
+def test_invalid_max_read() -> None:
+    with pytest.raises(ValueError):
+        ReadPlanner(max_read=0)
@@ -0,0 +1,172 @@
+from __future__ import annotations
+
+import threading
+import time
+
+import pytest
+
+from pydvdcss import exceptions
+from pydvdcss.pool import DvdCssPool
+from pydvdcss.structs import ReadFlag, SeekFlag
+from tests.fakes import FakeLibrary, random_image
+from tests.images import SECTOR
+
+
+@pytest.fixture
+def pool(library: FakeLibrary) -> DvdCssPool:
+    library.image = random_image(64)
+    return DvdCssPool("disc.iso", size=2, idle_timeout=None, prewarm=False)
+
+
+def test_lease_accounting(pool: DvdCssPool, library: FakeLibrary) -> None:
+    first = pool.acquire()
+    second = pool.acquire()
+    assert first is not second
+    assert (pool.stats.opened, pool.stats.in_use, pool.stats.idle) == (2, 2, 0)
+
+    pool.release(first)
+    assert (pool.stats.in_use, pool.stats.idle) == (1, 1)
+    with pool.lease() as dvdcss:
+        assert dvdcss is first
+        assert (pool.stats.in_use, pool.stats.idle) == (2, 0)
+    pool.release(second)
+
+    stats = pool.stats
+    assert (stats.opened, stats.reused, stats.closed) == (2, 1, 0)
+    assert (stats.in_use, stats.idle) == (0, 2)
+    assert library.opened == [b"disc.iso"] * 2
+
+
+def test_timeout(pool: DvdCssPool) -> None:
+    held = [pool.acquire(), pool.acquire()]
+
+    with pytest.raises(TimeoutError):
+        pool.acquire(timeout=0.01)
+    assert pool.stats.in_use == 2
+
+    # A waiting thread gets the handle as soon as it's released.
+    leased: list[object] = []
+    waiter = threading.Thread(target=lambda: leased.append(pool.acquire(timeout=5)))
+    waiter.start()
+    time.sleep(0.01)
+    pool.release(held[0])
+    waiter.join()
+
+    assert leased == [held[0]]
+    assert pool.stats.opened == 2
+
+
+def test_open_failure(pool: DvdCssPool, library: FakeLibrary) -> None:
+    library.fail_open = True
+    with pytest.raises(exceptions.OpenFailureError):
+        pool.acquire()
+
+    # The failed open does not take up a place in the pool.
+    library.fail_open = False
+    pool.acquire()
+    pool.acquire()
+    assert (pool.stats.opened, pool.stats.in_use) == (2, 2)
+
+
+def test_unhealthy(pool: DvdCssPool, library: FakeLibrary) -> None:
+    library.bad = {10}
+    pool.read(0, 1)
+
+    with pytest.raises(exceptions.ReadError):
+        pool.read(8, 4)
+
+    stats = pool.stats
+    assert (stats.unhealthy, stats.closed, stats.idle, stats.in_use) == (1, 1, 0, 0)
+    assert library.closed == [1]
+
+    # A new handle is opened in its place.
+    assert pool.read(20, 2) == library.image[20 * SECTOR : 22 * SECTOR]
+    assert pool.stats.opened == 2
+
+
+def test_check(pool: DvdCssPool, library: FakeLibrary) -> None:
+    handles = [pool.acquire(), pool.acquire()]
+    for dvdcss in handles:
+        pool.release(dvdcss)
+
+    assert pool.check() == 0
+    library.bad = {0}
+    assert pool.check() == 2
+
+    stats = pool.stats
+    assert (stats.unhealthy, stats.closed, stats.idle) == (2, 2, 0)
+
+
+def test_trim(pool: DvdCssPool, library: FakeLibrary) -> None:
+    handles = [pool.acquire(), pool.acquire()]
+    for dvdcss in handles:
+        pool.release(dvdcss)
+
+    # Without an idle_timeout, idle handles stay open until trimmed.
+    assert pool.trim() == 0
+    assert pool.trim(60) == 0
+    assert pool.trim(0) == 2
+
+    stats = pool.stats
+    assert (stats.closed, stats.unhealthy, stats.idle) == (2, 0, 0)
+    assert sorted(library.closed) == [1, 2]
+
+
+def test_idle_timeout(library: FakeLibrary) -> None:
+    library.image = random_image(64)
+    pool = DvdCssPool("disc.iso", size=2, idle_timeout=0.01, prewarm=False)
+    pool.read(0, 1)
+    time.sleep(0.02)
+
+    # The expired handle is closed rather than reused.
+    pool.read(0, 1)
+
+    stats = pool.stats
+    assert (stats.opened, stats.reused, stats.closed, stats.idle) == (2, 0, 1, 1)
+    assert library.closed == [1]
+
+
+def test_seek_flag(pool: DvdCssPool, library: FakeLibrary) -> None:
+    buffer = bytearray(4 * SECTOR)
+
+    assert (
+        pool.read(10, 2, ReadFlag.READ_DECRYPT)
+        == (library.image[10 * SECTOR : 12 * SECTOR])
+    )
+    assert pool.read_into(30, buffer, ReadFlag.READ_DECRYPT) == 4
+    pool.read(10, 2)
+    pool.read(10, 2, ReadFlag.READ_DECRYPT, SeekFlag.SEEK_KEY)
+
+    assert buffer == library.image[30 * SECTOR : 34 * SECTOR]
+    assert [seek[1:] for seek in library.seeks] == [
+        (10, SeekFlag.SEEK_MPEG.value),
+        (30, SeekFlag.SEEK_MPEG.value),
+        (10, SeekFlag.Unset.value),
+        (10, SeekFlag.SEEK_KEY.value),
+    ]
+
+
+def test_parallel_reads(library: FakeLibrary) -> None:
+    library.image = random_image(256)
+    pool = DvdCssPool("disc.iso", size=3, idle_timeout=None, prewarm=False)
+    results: dict[int, bytes] = {}
+
+    def read(sector: int) -> None:
+        results[sector] = pool.read(sector, 8)
+
+    threads = [threading.Thread(target=read, args=(i * 8,)) for i in range(32)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert b"".join(results[i * 8] for i in range(32)) == library.image
+    assert pool.stats.opened <= 3
+    assert pool.stats.in_use == 0
+    pool.close()
+    assert pool.stats.idle == 0
+
+
+def test_invalid_size(library: FakeLibrary) -> None:
+    with pytest.raises(ValueError):
+        DvdCssPool("disc.iso", size=0)
@@ -0,0 +1,105 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+import pytest
+
+from pydvdcss.recovery import BAD, FINISHED, UNTRIED, SectorMap
+from pydvdcss.udf import Extent
+
+
+def test_mark() -> None:
+    sector_map = SectorMap(100)
+
+    sector_map.mark(0, 10, FINISHED)
+    sector_map.mark(10, 10, FINISHED)
+    sector_map.mark(40, 5, BAD)
+    sector_map.mark(42, 1, FINISHED)
+
+    assert list(sector_map) == [
+        (Extent(0, 20), FINISHED),
+        (Extent(20, 20), UNTRIED),
+        (Extent(40, 2), BAD),
+        (Extent(42, 1), FINISHED),
+        (Extent(43, 2), BAD),
+        (Extent(45, 55), UNTRIED),
+    ]
+    assert sector_map.ranges(BAD) == [Extent(40, 2), Extent(43, 2)]
+    assert sector_map.count(FINISHED) == 21
+    assert sector_map.position == 20
+    assert sector_map.status == UNTRIED
+
+
+def test_mark_merges_over_runs() -> None:
+    sector_map = SectorMap(100)
+    sector_map.mark(10, 10, BAD)
+    sector_map.mark(30, 10, BAD)
+
+    sector_map.mark(0, 100, FINISHED)
+
+    assert list(sector_map) == [(Extent(0, 100), FINISHED)]
+    assert sector_map.position == 100
+    assert sector_map.status == FINISHED
+
+
+def test_mark_past_the_end() -> None:
+    sector_map = SectorMap(10)
+
+    sector_map.mark(5, 10, BAD)
+
+    assert sector_map.sectors == 15
+    assert sector_map.ranges(UNTRIED) == [Extent(0, 5)]
+    assert sector_map.status == UNTRIED
+
+
+def test_save_load(tmp_path: Path) -> None:
+    path = tmp_path / "disc.map"
+    sector_map = SectorMap(1000, path)
+    sector_map.mark(0, 500, FINISHED)
+    sector_map.mark(500, 16, BAD)
+    sector_map.mark(516, 484, FINISHED)
+
+    sector_map.save()
+    loaded = SectorMap.load(path)
+
+    assert list(loaded) == list(sector_map)
+    assert loaded.sectors == 1000
+    assert loaded.path == path
+    lines = path.read_text(encoding="utf8").splitlines()
+    assert lines[2].split() == ["0x000FA000", BAD, "1"]
+    assert lines[5].split() == ["0x000FA000", "0x00008000", BAD]
+
+
+def test_load_ddrescue(tmp_path: Path) -> None:
+    path = tmp_path / "disc.map"
+    path.write_text(
+        "# Mapfile. Created by GNU ddrescue\n"
+        "0x00000000     ?     1\n"
+        "0x00000000  0x00001000  +\n"
+        "0x00001000  0x00001000  *\n"
+        "0x00002000  0x00000800  /\n"
+        "0x00002800  0x00000800  ?\n",
+        encoding="utf8",
+    )
+
+    sector_map = SectorMap.load(path)
+
+    # Non-trimmed and non-scraped sectors are retried as bad ones.
+    assert list(sector_map) == [
+        (Extent(0, 2), FINISHED),
+        (Extent(2, 3), BAD),
+        (Extent(5, 1), UNTRIED),
+    ]
+
+
+def test_load_partial_sectors(tmp_path: Path) -> None:
+    path = tmp_path / "disc.map"
+    path.write_text("0x0 ? 1\n0x0 0x200 +\n", encoding="utf8")
+
+    with pytest.raises(ValueError):
+        SectorMap.load(path)
+
+
+def test_save_without_path() -> None:
+    with pytest.raises(ValueError):
+        SectorMap(10).save()
@@ -0,0 +1,53 @@
+from __future__ import annotations
+
+import pytest
+
+from pydvdcss import scrambling
+from pydvdcss.scrambling import scrambled_sectors
+from tests.images import SECTOR
+
+
+@pytest.fixture(params=["numpy", "fallback"])
+def backend(request: pytest.FixtureRequest, monkeypatch: pytest.MonkeyPatch) -> None:
+    if request.param == "numpy":
+        monkeypatch.setattr(scrambling, "_numpy", pytest.importorskip("numpy"))
+    else:
+        monkeypatch.setattr(scrambling, "_numpy", None)
+
+
+def sector(pack: bool = True, scrambled: bool = False) -> bytes:
+    data = bytearray(SECTOR)
+    if pack:
+        data[:4] = scrambling.PACK_START
+    if scrambled:
+        data[scrambling.SCRAMBLING_OFFSET] = 0x10
+    return bytes(data)
+
+
+@pytest.mark.usefixtures("backend")
+def test_scrambled_sectors() -> None:
+    data = (
+        sector()
+        + sector(scrambled=True)
+        + sector(pack=False, scrambled=True)
+        + sector()
+        + sector(scrambled=True)
+    )
+
+    assert scrambled_sectors(data) == [1, 4]
+    assert scrambled_sectors(bytearray(data)) == [1, 4]
+    assert scrambled_sectors(memoryview(data)[SECTOR * 2 :]) == [2]
+
+
+@pytest.mark.usefixtures("backend")
+def test_none_scrambled() -> None:
+    assert scrambled_sectors(b"") == []
+    assert scrambled_sectors(sector() * 64) == []
+    # Not VOB sectors, so the scrambling control bits mean nothing.
+    assert scrambled_sectors(sector(pack=False, scrambled=True) * 8) == []
+
+
+@pytest.mark.usefixtures("backend")
+def test_partial_sector() -> None:
+    with pytest.raises(ValueError):
+        scrambled_sectors(sector() + b"\x00")
@@ -0,0 +1,119 @@
+from __future__ import annotations
+
+import io
+import os
+from pathlib import Path
+
+import pytest
+
+from pydvdcss.sources import FileStreamSource, MmapStreamSource, StreamSource
+
+
+class BytesSource(StreamSource):
+    def __init__(self, data: bytes) -> None:
+        super().__init__()
+        self.data = data
+        self.position = 0
+
+    def seek(self, position: int) -> None:
+        if position > len(self.data):
+            raise ValueError(position)
+        self.position = position
+
+    def readinto(self, buffer: memoryview) -> int:
+        chunk = self.data[self.position : self.position + len(buffer)]
+        buffer[: len(chunk)] = chunk
+        self.position += len(chunk)
+        return len(chunk)
+
+
+def test_abstract() -> None:
+    class Partial(StreamSource):
+        def seek(self, position: int) -> None:
+            pass
+
+    with pytest.raises(TypeError):
+        StreamSource()  # type: ignore[abstract]
+    with pytest.raises(TypeError):
+        Partial()  # type: ignore[abstract]
+
+
+def test_readv() -> None:
+    source = BytesSource(bytes(range(10)))
+    buffers = [memoryview(bytearray(4)) for _ in range(3)]
+
+    source.seek(1)
+
+    # Stops at the end of the source.
+    assert source.readv(buffers) == 9
+    assert [bytes(buffer) for buffer in buffers] == [
+        bytes([1, 2, 3, 4]),
+        bytes([5, 6, 7, 8]),
+        bytes([9, 0, 0, 0]),
+    ]
+
+
+def test_callback_error() -> None:
+    source = BytesSource(bytes(10))
+
+    assert source._seek(None, 20) == -1
+    assert isinstance(source.error, ValueError)
+    assert source._seek(None, 5) == 0
+
+
+@pytest.fixture
+def image(tmp_path: Path) -> Path:
+    path = tmp_path / "disc.iso"
+    path.write_bytes(bytes(range(256)) * 64)
+    return path
+
+
+@pytest.mark.parametrize("source_type", [FileStreamSource, MmapStreamSource])
+def test_file_sources(source_type: type[StreamSource], image: Path) -> None:
+    data = image.read_bytes()
+    buffers = [memoryview(bytearray(1000)) for _ in range(3)]
+
+    with source_type(image) as source:  # type: ignore[call-arg]
+        source.seek(15000)
+        assert source.readv(buffers) == len(data) - 15000
+        source.seek(100)
+        buffer = memoryview(bytearray(50))
+        assert source.readinto(buffer) == 50
+
+    assert b"".join(buffers)[: len(data) - 15000] == data[15000:]
+    assert bytes(buffer) == data[100:150]
+
+
+def test_file_stream_source_without_fd() -> None:
+    source = FileStreamSource(io.BytesIO(b"abcdef"))
+    buffers = [memoryview(bytearray(2)) for _ in range(2)]
+
+    source.seek(1)
+
+    assert source.readv(buffers) == 4
+    assert b"".join(buffers) == b"bcde"
+
+
+@pytest.mark.skipif(not hasattr(os, "preadv"), reason="os.preadv() is not available")
+def test_file_stream_source_iov_max(
+    monkeypatch: pytest.MonkeyPatch, image: Path
+) -> None:
+    calls: list[int] = []
+
+    def preadv(fd: int, buffers: list[memoryview], offset: int) -> int:
+        calls.append(len(buffers))
+        return os_preadv(fd, buffers, offset)
+
+    os_preadv = os.preadv
+    monkeypatch.setattr("pydvdcss.sources._IOV_MAX", 4)
+    monkeypatch.setattr(os, "preadv", preadv)
+    data = image.read_bytes()
+    # More buffers than one preadv() call takes, ending past the end of the file.
+    buffers = [memoryview(bytearray(1000)) for _ in range(17)]
+    source = FileStreamSource(image)
+
+    assert source.readv(buffers) == len(data)
+    assert source.file.tell() == len(data)
+    assert b"".join(buffers)[: len(data)] == data
+    assert max(calls) == 4
+    source.close()
@@ -0,0 +1,68 @@
+from __future__ import annotations
+
+from typing import Any
+
+import pytest
+
+from pydvdcss.streaming import AdaptiveChunkSize
+
+
+def test_grows_on_fast_reads() -> None:
+    chunk = AdaptiveChunkSize(initial=32, maximum=512, target_latency=0.05)
+
+    sizes = [chunk.update(chunk.value, 0.001) for _ in range(6)]
+
+    assert sizes == [64, 128, 256, 512, 512, 512]
+
+
+def test_shrinks_on_slow_reads() -> None:
+    chunk = AdaptiveChunkSize(initial=32, minimum=4, target_latency=0.05)
+
+    sizes = [chunk.update(chunk.value, 1.0) for _ in range(5)]
+
+    assert sizes == [16, 8, 4, 4, 4]
+
+
+def test_steady_within_target() -> None:
+    chunk = AdaptiveChunkSize(initial=32, target_latency=0.05)
+
+    # Between half the target and the target, it's left as is.
+    assert [chunk.update(32, 0.04) for _ in range(4)] == [32] * 4
+
+
+def test_smoothing() -> None:
+    chunk = AdaptiveChunkSize(initial=32, maximum=32, smoothing=0.5)
+    for _ in range(4):
+        chunk.update(32, 0.02)
+
+    # One slow read isn't enough to shrink it, a second one is.
+    assert chunk.update(32, 0.07) == 32
+    assert chunk.update(32, 0.07) == 16
+
+
+def test_short_read_is_normalised() -> None:
+    chunk = AdaptiveChunkSize(initial=32, smoothing=1.0)
+
+    # 8 sectors in 40ms is 160ms for a whole chunk, over the target.
+    assert chunk.update(8, 0.04) == 16
+    assert chunk.update(0, 10.0) == 16
+
+
+def test_initial_is_clamped() -> None:
+    assert AdaptiveChunkSize(initial=1024, maximum=512).value == 512
+    assert AdaptiveChunkSize(initial=0, minimum=2).value == 2
+
+
+@pytest.mark.parametrize(
+    "kwargs",
+    [
+        {"minimum": 0},
+        {"minimum": 64, "maximum": 32},
+        {"target_latency": 0},
+        {"smoothing": 0},
+        {"smoothing": 1.5},
+    ],
+)
+def test_invalid(kwargs: dict[str, Any]) -> None:
+    with pytest.raises(ValueError):
+        AdaptiveChunkSize(**kwargs)